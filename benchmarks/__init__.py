@@ -0,0 +1 @@
+"""Performance benchmarks for the quant_trader hot paths."""
@@ -0,0 +1,282 @@
+"""Time and memory benchmarks of the quant_trader hot paths.
+
+Run the suite and write the results to JSON::
+
+    python -m benchmarks.run run --sizes 1000,100000,1000000 --output current.json
+
+Compare against an earlier run; the exit status is 1 when any case lost
+more than ``--threshold`` of its throughput or grew its peak memory by more
+than ``--memory-threshold``::
+
+    python -m benchmarks.run compare baseline.json current.json --threshold 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_candles, synthetic_klines
+from quant_trader.backtesting.backtester import Backtester
+from quant_trader.backtesting.robustness import MonteCarlo
+from quant_trader.config import Settings
+from quant_trader.data.export import CandleExporter
+from quant_trader.data.market_data_service import MarketDataService, export_to_csv
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+SYMBOL = "BENCH"
+
+
+class Workspace:
+    """Temporary directory handing out isolated :class:`MarketDataService` instances."""
+
+    def __init__(self, root: Path, store: str = "sql") -> None:
+        self.root = root
+        self.store = store
+        self._count = 0
+
+    def service(self) -> MarketDataService:
+        self._count += 1
+        directory = self.root / f"service-{self._count}"
+        directory.mkdir()
+        settings = Settings(
+            binance_api_key="benchmark",
+            binance_api_secret="benchmark",
+            database_url=f"sqlite:///{directory / 'candles.db'}",
+            symbols=(SYMBOL,),
+            candles_interval="1m",
+            cache_dir=directory / "cache",
+            candle_store=self.store,
+        )
+        return MarketDataService(settings)
+
+    def stored(self, size: int) -> MarketDataService:
+        service = self.service()
+        service._persist_candles(SYMBOL, synthetic_candles(size))
+        return service
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark. ``setup`` is untimed; with ``fresh`` it runs before every repetition."""
+
+    name: str
+    setup: Callable[[Workspace, int], Any]
+    run: Callable[[Any], Any]
+    fresh: bool = False
+
+
+@dataclass
+class Measurement:
+    case: str
+    size: int
+    seconds: float
+    throughput: float
+    peak_bytes: int
+
+
+def _export(state) -> None:
+    service, output, size = state
+    export_to_csv(service, output_dir=output, symbols=[SYMBOL], limit=size)
+
+
+def _export_stream(state) -> None:
+    service, output = state
+    CandleExporter(service, output).export([SYMBOL], full=True)
+
+
+CASES: Dict[str, Case] = {
+    case.name: case
+    for case in (
+        Case(
+            "backtester.run",
+            lambda ws, size: (Backtester(MovingAverageCrossStrategy(10, 30)), synthetic_candles(size, symbol=SYMBOL)),
+            lambda state: state[0].run(state[1]),
+        ),
+        Case(
+            "backtester.run_chunks",
+            lambda ws, size: (ws.stored(size), Backtester(MovingAverageCrossStrategy(10, 30))),
+            lambda state: state[1].run_chunks(state[0].iter_candles(SYMBOL)),
+        ),
+        Case(
+            "robustness.block_bootstrap",
+            lambda ws, size: np.random.default_rng(0).normal(0, 0.01, size),
+            lambda returns: MonteCarlo(resamples=100, seed=0).run(returns),
+        ),
+        Case(
+            "strategy.generate",
+            lambda ws, size: (MovingAverageCrossStrategy(10, 30), synthetic_candles(size, symbol=SYMBOL)),
+            lambda state: state[0].generate(state[1]),
+        ),
+        Case(
+            "market_data.klines_to_dataframe",
+            lambda ws, size: (ws.service(), synthetic_klines(size)),
+            lambda state: state[0]._klines_to_dataframe(state[1]),
+        ),
+        Case(
+            "market_data.persist_candles",
+            lambda ws, size: (ws.service(), synthetic_candles(size)),
+            lambda state: state[0]._persist_candles(SYMBOL, state[1]),
+            fresh=True,
+        ),
+        Case(
+            "market_data.load_candles",
+            lambda ws, size: (ws.stored(size), size),
+            lambda state: state[0].load_candles(SYMBOL, limit=state[1]),
+        ),
+        Case(
+            "market_data.export_to_csv",
+            lambda ws, size: (ws.stored(size), ws.root / f"export-{size}", size),
+            _export,
+        ),
+        Case(
+            "export.candle_exporter",
+            lambda ws, size: (ws.stored(size), ws.root / f"stream-export-{size}"),
+            _export_stream,
+        ),
+    )
+}
+
+
+def measure(case: Case, workspace: Workspace, size: int, repeat: int = 3) -> Measurement:
+    """Best wall time of ``repeat`` runs plus the peak traced allocation of one more."""
+
+    state = None
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        if state is None or case.fresh:
+            state = case.setup(workspace, size)
+        gc.collect()
+        started = time.perf_counter()
+        case.run(state)
+        best = min(best, time.perf_counter() - started)
+
+    if case.fresh:
+        state = case.setup(workspace, size)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(case=case.name, size=size, seconds=best, throughput=size / best if best else 0.0, peak_bytes=peak)
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    cases: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    store: str = "sql",
+) -> Dict[str, Any]:
+    selected = [CASES[name] for name in (cases or CASES)]
+    results: List[Measurement] = []
+    with tempfile.TemporaryDirectory(prefix="quant-trader-bench-") as root:
+        workspace = Workspace(Path(root), store=store)
+        for size in sizes:
+            for case in selected:
+                measurement = measure(case, workspace, size, repeat)
+                results.append(measurement)
+                print(
+                    f"{case.name:<34} {size:>9} rows  {measurement.seconds * 1000:>10.2f} ms"
+                    f"  {measurement.throughput:>14,.0f} rows/s  {measurement.peak_bytes / 2**20:>9.1f} MiB",
+                    flush=True,
+                )
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "store": store,
+            "repeat": repeat,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float = 0.2,
+    memory_threshold: float = 0.5,
+) -> List[str]:
+    """Describe every case of ``current`` that regressed against ``baseline``."""
+
+    reference = {(row["case"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = reference.get((row["case"], row["size"]))
+        if before is None:
+            continue
+        label = f"{row['case']} @ {row['size']}"
+        if row["throughput"] < before["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {row['throughput']:,.0f} rows/s vs {before['throughput']:,.0f} baseline"
+            )
+        if before["peak_bytes"] and row["peak_bytes"] > before["peak_bytes"] * (1 + memory_threshold):
+            regressions.append(f"{label}: peak memory {row['peak_bytes']:,} B vs {before['peak_bytes']:,} baseline")
+    return regressions
+
+
+def _sizes(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="quant_trader benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write JSON results")
+    run_parser.add_argument("--sizes", type=_sizes, default=list(DEFAULT_SIZES), help="Comma-separated bar counts")
+    run_parser.add_argument("--cases", type=lambda value: value.split(","), default=None, help="Comma-separated case names")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case")
+    run_parser.add_argument("--store", choices=("sql", "columnar"), default="sql", help="Candle store to benchmark")
+    run_parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"), help="JSON output path")
+
+    compare_parser = commands.add_parser("compare", help="Fail when a case regressed against a baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed fractional throughput loss")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.5, help="Allowed fractional memory growth")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        unknown = set(args.cases or ()) - set(CASES)
+        if unknown:
+            parser.error(f"unknown cases {sorted(unknown)}; choose from {sorted(CASES)}")
+        report = run_benchmarks(args.sizes, cases=args.cases, repeat=args.repeat, store=args.store)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.output}")
+        return 0
+
+    regressions = compare(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.current.read_text()),
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
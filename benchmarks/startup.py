@@ -0,0 +1,114 @@
+"""Import-time budget of the quant_trader entry points.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+and its cumulative import time is compared to :data:`STARTUP_BUDGETS`. The
+heavy dependencies in :data:`FORBIDDEN_IMPORTS` must not be loaded at all,
+since every CLI command pays for them before doing any work::
+
+    python -m benchmarks.startup --check
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds of cumulative import time allowed per module.
+STARTUP_BUDGETS: Dict[str, float] = {
+    "quant_trader": 0.05,
+    "quant_trader.main": 0.15,
+}
+
+# Top-level packages each module must not import.
+FORBIDDEN_IMPORTS: Dict[str, Tuple[str, ...]] = {
+    "quant_trader": ("pandas", "numpy", "sqlalchemy", "requests", "aiohttp"),
+    "quant_trader.main": ("pandas", "numpy", "sqlalchemy", "requests", "aiohttp"),
+    "quant_trader.data.market_data_service": ("requests", "aiohttp"),
+}
+
+
+@dataclass
+class StartupResult:
+    module: str
+    seconds: float
+    imported: List[str]
+
+    def forbidden(self) -> List[str]:
+        return sorted(set(FORBIDDEN_IMPORTS.get(self.module, ())) & set(self.imported))
+
+
+def measure_import(module: str, repeat: int = 3) -> StartupResult:
+    """Best-of-``repeat`` cumulative import time of ``module`` in a fresh interpreter."""
+
+    best: Optional[float] = None
+    imported: List[str] = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=ROOT,
+        )
+        timings = _parse_importtime(completed.stderr)
+        seconds = timings.get(module, 0) / 1e6
+        best = seconds if best is None else min(best, seconds)
+        imported = sorted({name.split(".")[0] for name in timings})
+    return StartupResult(module, best or 0.0, imported)
+
+
+def _parse_importtime(output: str) -> Dict[str, int]:
+    # Lines look like "import time:       360 |      17855 |   asyncio".
+    timings: Dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[1].isdigit():
+            timings[parts[2]] = int(parts[1])
+    return timings
+
+
+def check_startup(budgets: Optional[Dict[str, float]] = None, repeat: int = 3) -> List[str]:
+    """Describe every module over its budget or importing a forbidden package."""
+
+    budgets = STARTUP_BUDGETS if budgets is None else budgets
+    problems: List[str] = []
+    for module in dict.fromkeys([*budgets, *FORBIDDEN_IMPORTS]):
+        result = measure_import(module, repeat=repeat)
+        budget = budgets.get(module)
+        if budget is not None and result.seconds > budget:
+            problems.append(f"{module} imports in {result.seconds * 1000:.0f} ms, over its {budget * 1000:.0f} ms budget")
+        for name in result.forbidden():
+            problems.append(f"{module} imports {name}")
+    return problems
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="quant_trader import-time benchmark")
+    parser.add_argument("modules", nargs="*", help="Modules to time (default: every budgeted module)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when a budget is exceeded")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check_startup(repeat=args.repeat)
+        for line in problems:
+            print(f"OVER BUDGET {line}")
+        if not problems:
+            print("All modules within their startup budget")
+        return 1 if problems else 0
+
+    for module in args.modules or dict.fromkeys([*STARTUP_BUDGETS, *FORBIDDEN_IMPORTS]):
+        result = measure_import(module, repeat=args.repeat)
+        print(f"{module:45} {result.seconds * 1000:8.1f} ms  forbidden: {', '.join(result.forbidden()) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Seeded synthetic OHLCV data for benchmarks."""
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# 2023-01-01T00:00:00Z
+DEFAULT_START_MS = 1_672_531_200_000
+
+
+def synthetic_candles(
+    periods: int,
+    *,
+    seed: int = 0,
+    start_ms: int = DEFAULT_START_MS,
+    interval_ms: int = 60_000,
+    symbol: str | None = None,
+) -> pd.DataFrame:
+    """Geometric random-walk candles shaped like ``MarketDataService._klines_to_dataframe`` output.
+
+    The same ``seed`` always yields the same frame.
+    """
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, periods)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, (2, periods)))
+    open_times = start_ms + interval_ms * np.arange(periods, dtype=np.int64)
+    frame = pd.DataFrame(
+        {
+            "open_time": pd.to_datetime(open_times, unit="ms", utc=True),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread[0]),
+            "low": np.minimum(open_, close) * (1 - spread[1]),
+            "close": close,
+            "volume": rng.lognormal(0, 1, periods),
+            "close_time": pd.to_datetime(open_times + interval_ms - 1, unit="ms", utc=True),
+        }
+    )
+    if symbol is not None:
+        frame["symbol"] = symbol
+    return frame
+
+
+def synthetic_klines(periods: int, **kwargs) -> List[list]:
+    """The candles of :func:`synthetic_candles` as raw ``/api/v3/klines`` rows."""
+
+    frame = synthetic_candles(periods, **kwargs)
+    open_times = (frame["open_time"].astype("int64") // 1_000_000).tolist()
+    close_times = (frame["close_time"].astype("int64") // 1_000_000).tolist()
+    prices = {column: [f"{value:.8f}" for value in frame[column]] for column in ("open", "high", "low", "close", "volume")}
+    quote = [f"{value:.8f}" for value in frame["close"] * frame["volume"]]
+    return [
+        [
+            open_times[idx],
+            prices["open"][idx],
+            prices["high"][idx],
+            prices["low"][idx],
+            prices["close"][idx],
+            prices["volume"][idx],
+            close_times[idx],
+            quote[idx],
+            10,
+            "0.00000000",
+            "0.00000000",
+            "0",
+        ]
+        for idx in range(periods)
+    ]
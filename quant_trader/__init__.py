@@ -1,6 +1,15 @@
-"""Quantitative trading toolkit."""
+"""Quantitative trading toolkit.
 
-from . import backtesting, config, data, engine, execution, strategies, utils
+Subpackages are imported on first access, so ``import quant_trader`` stays cheap.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from quant_trader.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from . import backtesting, config, data, engine, execution, strategies, utils
 
 __all__ = [
     "backtesting",
@@ -11,3 +20,5 @@ __all__ = [
     "strategies",
     "utils",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {name: "" for name in __all__})
@@ -1,31 +1,203 @@
 """Backtesting utilities."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
 
-from quant_trader.strategies.base import Signal, Strategy
+from quant_trader.backtesting.portfolio import bars_per_year
+from quant_trader.strategies.base import (
+    Signal,
+    Strategy,
+    StreamingStrategy,
+    VectorizedStrategy,
+    carry_forward,
+    iter_bars,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from quant_trader.data.market_data_service import MarketDataService
 
 
 @dataclass
 class BacktestResult:
+    """Signals and total return of a backtest.
+
+    ``positions`` and ``bar_returns`` hold the position held on each bar and
+    the return it earned on that same bar, oldest first, for per-bar analysis
+    such as :mod:`quant_trader.backtesting.robustness`.
+    """
+
     signals: List[Signal]
     returns: float
     trades: int
+    positions: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    bar_returns: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    periods_per_year: float = 1.0
+
+
+BACKTEST_MODES = ("auto", "vectorized", "streaming", "per_bar")
 
 
 @dataclass
 class Backtester:
+    """Replays a strategy over historical candles.
+
+    ``mode`` selects how the strategy is evaluated. ``"auto"`` prefers a
+    whole-series pass (:class:`VectorizedStrategy`), then one-bar-at-a-time
+    updates (:class:`StreamingStrategy`), and falls back to calling
+    ``generate`` on every prefix of the history.
+    """
+
     strategy: Strategy
+    mode: str = "auto"
+
+    def __post_init__(self) -> None:
+        if self.mode not in BACKTEST_MODES:
+            raise ValueError(f"mode must be one of {BACKTEST_MODES}, got {self.mode!r}")
 
     def run(self, data: pd.DataFrame) -> BacktestResult:
         data = data.sort_values("open_time").copy()
         data["returns"] = data["close"].pct_change().fillna(0)
+        mode = self._resolve_mode()
+        if mode == "vectorized":
+            result = self._run_vectorized(data)
+        elif mode == "streaming":
+            result = self._run_streaming(data)
+        else:
+            result = self._run_per_bar(data)
+        result.bar_returns = result.positions * data["returns"].to_numpy(dtype=float)
+        result.periods_per_year = bars_per_year(data["open_time"].to_numpy())
+        return result
+
+    def run_chunks(self, chunks: Iterable[pd.DataFrame], *, keep_series: bool = False) -> BacktestResult:
+        """Backtest candles delivered as consecutive, time-ordered chunks.
+
+        Gives the same result as :meth:`run` on the concatenated chunks while
+        holding only one chunk (plus a short tail) in memory, e.g. over
+        :meth:`MarketDataService.iter_candles`. Streaming strategies carry
+        their own state across chunk boundaries. Vectorized and per-bar
+        evaluation need the strategy's ``lookback`` (the rows a signal depends
+        on); the previous chunk's last ``lookback`` rows are prepended to the
+        next chunk so that signals at the boundary see their full history.
+        Per-bar positions and returns are only kept with ``keep_series``, as
+        they cost 16 bytes per bar.
+        """
+
+        mode = self._resolve_mode()
+        lookback: Optional[int] = getattr(self.strategy, "lookback", None)
+        if mode != "streaming" and lookback is None:
+            raise TypeError(f"{type(self.strategy).__name__} needs a lookback to be backtested in chunks")
+        if mode == "streaming":
+            self.strategy.reset()
+
+        signals: List[Signal] = []
+        growth = 1.0
+        position = 0.0
+        previous_close: Optional[float] = None
+        tail: Optional[pd.DataFrame] = None
+        held_positions: List[np.ndarray] = []
+        earned: List[np.ndarray] = []
+        periods_per_year: Optional[float] = None
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if periods_per_year is None and len(chunk) > 1:
+                periods_per_year = bars_per_year(chunk["open_time"].to_numpy())
+            closes = chunk["close"].to_numpy(dtype=float)
+            returns = np.empty(len(closes))
+            returns[0] = closes[0] / previous_close - 1 if previous_close is not None else 0.0
+            returns[1:] = closes[1:] / closes[:-1] - 1
+            previous_close = closes[-1]
+
+            if mode == "streaming":
+                positions = np.empty(len(chunk))
+                for idx, bar in enumerate(iter_bars(chunk)):
+                    signal = self.strategy.update(bar)
+                    if signal:
+                        signals.append(signal)
+                        position = 1.0 if signal.side.upper() == "BUY" else -1.0
+                    positions[idx] = position
+            else:
+                window = chunk if tail is None else pd.concat([tail, chunk], ignore_index=True)
+                overlap = 0 if tail is None else len(tail)
+                if mode == "vectorized":
+                    frame = self.strategy.generate_signals(window).iloc[overlap:]
+                    fired = frame["signal"].to_numpy()
+                    signals.extend(_fired_signals(frame, chunk))
+                else:
+                    fired = np.zeros(len(chunk))
+                    for idx in range(len(chunk)):
+                        end = overlap + idx + 1
+                        signal = self.strategy.generate(window.iloc[max(0, end - lookback) : end])
+                        if signal:
+                            signals.append(signal)
+                            fired[idx] = 1 if signal.side.upper() == "BUY" else -1
+                positions = carry_forward(fired).astype(float)
+                held = np.flatnonzero(fired)
+                positions[: held[0] if len(held) else len(positions)] = position
+                position = positions[-1]
+                tail = window.iloc[-lookback:].copy()
+            bar_returns = positions * returns
+            if keep_series:
+                held_positions.append(positions)
+                earned.append(bar_returns)
+            growth *= float(np.prod(1 + bar_returns))
+
+        if mode == "streaming":
+            self.strategy.reset()
+        return BacktestResult(
+            signals=signals,
+            returns=growth - 1,
+            trades=len(signals),
+            positions=np.concatenate(held_positions or [np.zeros(0)]) if keep_series else None,
+            bar_returns=np.concatenate(earned or [np.zeros(0)]) if keep_series else None,
+            periods_per_year=periods_per_year or 1.0,
+        )
+
+    def run_stored(
+        self,
+        market_data: "MarketDataService",
+        symbol: str,
+        *,
+        interval: Optional[str] = None,
+        start=None,
+        end=None,
+        chunk_size: Optional[int] = None,
+        keep_series: bool = False,
+    ) -> BacktestResult:
+        """Backtest ``symbol``'s stored candles chunk by chunk with :meth:`run_chunks`.
+
+        ``interval`` defaults to the strategy's ``interval`` attribute, then to
+        the configured ``candles_interval``. Longer intervals are served by
+        :meth:`MarketDataService.iter_rollup` from the stored base candles.
+        """
+
+        interval = interval or getattr(self.strategy, "interval", None) or market_data.settings.candles_interval
+        options = {} if chunk_size is None else {"chunk_size": chunk_size}
+        chunks = market_data.iter_rollup(symbol, interval, start=start, end=end, **options)
+        return self.run_chunks((chunk.assign(symbol=symbol.upper()) for chunk in chunks), keep_series=keep_series)
+
+    def _resolve_mode(self) -> str:
+        if self.mode == "vectorized" and not isinstance(self.strategy, VectorizedStrategy):
+            raise TypeError(f"{type(self.strategy).__name__} does not implement generate_signals")
+        if self.mode == "streaming" and not isinstance(self.strategy, StreamingStrategy):
+            raise TypeError(f"{type(self.strategy).__name__} does not implement update")
+        if self.mode != "auto":
+            return self.mode
+        if isinstance(self.strategy, VectorizedStrategy):
+            return "vectorized"
+        if isinstance(self.strategy, StreamingStrategy):
+            return "streaming"
+        return "per_bar"
+
+    def _run_per_bar(self, data: pd.DataFrame) -> BacktestResult:
         signals: List[Signal] = []
         cumulative_return = 1.0
         position = 0
+        positions = np.zeros(len(data))
 
         for idx in range(len(data)):
             window = data.iloc[: idx + 1]
@@ -33,6 +205,52 @@ class Backtester:
             if signal:
                 signals.append(signal)
                 position = 1 if signal.side.upper() == "BUY" else -1
+            positions[idx] = position
             cumulative_return *= 1 + position * data.iloc[idx]["returns"]
 
-        return BacktestResult(signals=signals, returns=cumulative_return - 1, trades=len(signals))
+        return BacktestResult(signals=signals, returns=cumulative_return - 1, trades=len(signals), positions=positions)
+
+    def _run_streaming(self, data: pd.DataFrame) -> BacktestResult:
+        self.strategy.reset()
+        returns = data["returns"].to_numpy(dtype=float)
+        signals: List[Signal] = []
+        cumulative_return = 1.0
+        position = 0
+        positions = np.zeros(len(data))
+
+        for idx, bar in enumerate(iter_bars(data)):
+            signal = self.strategy.update(bar)
+            if signal:
+                signals.append(signal)
+                position = 1 if signal.side.upper() == "BUY" else -1
+            positions[idx] = position
+            cumulative_return *= 1 + position * returns[idx]
+
+        self.strategy.reset()
+        return BacktestResult(signals=signals, returns=cumulative_return - 1, trades=len(signals), positions=positions)
+
+    def _run_vectorized(self, data: pd.DataFrame) -> BacktestResult:
+        frame = self.strategy.generate_signals(data)
+        positions = frame["position"].to_numpy(dtype=float)
+        cumulative_return = float(np.prod(1 + positions * data["returns"].to_numpy(dtype=float)))
+
+        signals = _fired_signals(frame, data)
+        return BacktestResult(signals=signals, returns=cumulative_return - 1, trades=len(signals), positions=positions)
+
+
+def _fired_signals(frame: pd.DataFrame, data: pd.DataFrame) -> List[Signal]:
+    """Signals for the non-zero rows of a ``generate_signals`` frame aligned with ``data``."""
+
+    fired = np.flatnonzero(frame["signal"].to_numpy())
+    symbols = data["symbol"].to_numpy() if "symbol" in data else None
+    open_times = data["open_time"].to_numpy()
+    return [
+        Signal(
+            symbol=symbols[idx] if symbols is not None else "",
+            side="BUY" if frame["signal"].iat[idx] > 0 else "SELL",
+            confidence=float(frame["confidence"].iat[idx]),
+            price=float(frame["price"].iat[idx]),
+            open_time=open_times[idx],
+        )
+        for idx in fired
+    ]
@@ -0,0 +1,188 @@
+"""Parallel parameter sweeps for the moving average crossover strategy."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import multiprocessing as mp
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.indicators import sma
+from quant_trader.strategies.base import carry_forward
+from quant_trader.strategies.moving_average import crossover_from_means
+
+logger = logging.getLogger(__name__)
+
+# Rolling means cached per worker; each entry holds one float64 per bar.
+_MEAN_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class SweepParams:
+    short_window: int
+    long_window: int
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    short_window: int
+    long_window: int
+    returns: float
+    trades: int
+
+
+def parameter_grid(short_windows: Iterable[int], long_windows: Iterable[int]) -> List[SweepParams]:
+    """Cartesian product of the window lengths, skipping pairs with ``short >= long``.
+
+    ``min_confidence`` is not swept: it only labels the signals and never
+    changes which bars trade, so every value would rank identically.
+    """
+
+    return [
+        SweepParams(short, long)
+        for short, long in itertools.product(sorted(set(short_windows)), sorted(set(long_windows)))
+        if short < long
+    ]
+
+
+class _SharedCandles:
+    """Close and return columns placed in a shared memory block for workers."""
+
+    def __init__(self, closes: np.ndarray, returns: np.ndarray) -> None:
+        self.length = len(closes)
+        self.block = shared_memory.SharedMemory(create=True, size=max(1, 2 * self.length * 8))
+        view = np.ndarray((2, self.length), dtype=np.float64, buffer=self.block.buf)
+        view[0] = closes
+        view[1] = returns
+
+    @property
+    def handle(self) -> Tuple[str, int]:
+        return self.block.name, self.length
+
+    def close(self) -> None:
+        self.block.close()
+        self.block.unlink()
+
+
+# Worker-side state, populated by ``_init_worker``.
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_closes: Optional[np.ndarray] = None
+_worker_returns: Optional[np.ndarray] = None
+
+
+def _init_worker(handle: Tuple[str, int]) -> None:
+    global _worker_block, _worker_closes, _worker_returns
+    name, length = handle
+    _worker_block = shared_memory.SharedMemory(name=name)
+    view = np.ndarray((2, length), dtype=np.float64, buffer=_worker_block.buf)
+    _worker_closes, _worker_returns = view[0], view[1]
+    _cached_mean.cache_clear()
+
+
+def _set_local(closes: np.ndarray, returns: np.ndarray) -> None:
+    global _worker_closes, _worker_returns
+    _worker_closes, _worker_returns = closes, returns
+    _cached_mean.cache_clear()
+
+
+@lru_cache(maxsize=_MEAN_CACHE_SIZE)
+def _cached_mean(window: int) -> np.ndarray:
+    return sma(_worker_closes, window)
+
+
+def _evaluate(params: SweepParams) -> SweepResult:
+    signals = crossover_from_means(_cached_mean(params.short_window), _cached_mean(params.long_window))
+    positions = carry_forward(signals)
+    cumulative_return = float(np.prod(1 + positions * _worker_returns))
+    return SweepResult(
+        short_window=params.short_window,
+        long_window=params.long_window,
+        returns=cumulative_return - 1,
+        trades=int(np.count_nonzero(signals)),
+    )
+
+
+def _ordered(grid: Sequence[SweepParams]) -> List[SweepParams]:
+    # Grouping by window keeps each worker's rolling mean cache warm.
+    return sorted(grid, key=lambda p: (p.long_window, p.short_window))
+
+
+def iter_sweep(
+    data: pd.DataFrame,
+    grid: Sequence[SweepParams],
+    *,
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[SweepResult]:
+    """Evaluate ``grid`` over ``data`` and yield results as they complete.
+
+    Candles are copied once into shared memory and every worker maps the same
+    block, so tasks only carry the parameter tuple. Results come back in
+    completion order. ``processes=1`` evaluates in the calling process.
+    """
+
+    ordered = data.sort_values("open_time")
+    closes = ordered["close"].to_numpy(dtype=np.float64)
+    returns = np.zeros_like(closes)
+    returns[1:] = closes[1:] / closes[:-1] - 1
+    returns[np.isnan(returns)] = 0.0
+    tasks = _ordered(grid)
+    processes = processes or mp.cpu_count()
+
+    if processes <= 1 or len(tasks) <= 1:
+        _set_local(closes, returns)
+        try:
+            yield from map(_evaluate, tasks)
+        finally:
+            _set_local(None, None)
+        return
+
+    shared = _SharedCandles(closes, returns)
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (processes * 8))
+    try:
+        with mp.Pool(processes, initializer=_init_worker, initargs=(shared.handle,)) as pool:
+            yield from pool.imap_unordered(_evaluate, tasks, chunksize=chunksize)
+    finally:
+        shared.close()
+
+
+def run_sweep(
+    data: pd.DataFrame,
+    grid: Sequence[SweepParams],
+    *,
+    processes: Optional[int] = None,
+    top: Optional[int] = None,
+    on_result: Optional[Callable[[SweepResult], None]] = None,
+) -> pd.DataFrame:
+    """Run a parameter sweep and return results ranked by total return.
+
+    When ``top`` is given only the best ``top`` rows are retained while the
+    sweep streams in, keeping memory flat for very large grids.
+    """
+
+    kept: List[Tuple[float, int, SweepResult]] = []
+    for counter, result in enumerate(iter_sweep(data, grid, processes=processes)):
+        if on_result is not None:
+            on_result(result)
+        entry = (result.returns, -counter, result)
+        if top is None:
+            kept.append(entry)
+        elif len(kept) < top:
+            heapq.heappush(kept, entry)
+        else:
+            heapq.heappushpop(kept, entry)
+        if (counter + 1) % 1000 == 0:
+            logger.info("Evaluated %s/%s parameter sets", counter + 1, len(grid))
+
+    rows = [asdict(result) for _, _, result in sorted(kept, key=lambda e: (e[0], e[1]), reverse=True)]
+    columns = [*SweepResult.__dataclass_fields__]
+    table = pd.DataFrame(rows, columns=columns)
+    table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+    return table
@@ -0,0 +1,213 @@
+"""Vectorized multi-symbol portfolio backtests."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.indicators import rolling_std
+from quant_trader.strategies.base import PanelStrategy, Strategy, VectorizedStrategy
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from quant_trader.data.market_data_service import MarketDataService
+
+SIZING_METHODS = ("equal", "volatility")
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class Panel:
+    """Closes of several symbols aligned on one ascending time index.
+
+    ``close`` has shape ``(bars, symbols)``. It is NaN before a symbol's first
+    candle, and later gaps repeat the previous close.
+    """
+
+    times: np.ndarray
+    symbols: Tuple[str, ...]
+    close: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> "Panel":
+        symbols = tuple(frames)
+        stamps = {
+            symbol: pd.to_datetime(frame["open_time"], utc=True).dt.tz_localize(None).to_numpy("datetime64[ns]")
+            for symbol, frame in frames.items()
+        }
+        times = np.unique(np.concatenate(list(stamps.values()))) if stamps else np.array([], "datetime64[ns]")
+        close = np.full((len(times), len(symbols)), np.nan)
+        for column, symbol in enumerate(symbols):
+            close[np.searchsorted(times, stamps[symbol]), column] = frames[symbol]["close"].to_numpy(dtype=float)
+        return cls(times=times, symbols=symbols, close=_fill_forward(close))
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Close-to-close returns, zero for the first bar and before listing."""
+
+        returns = np.zeros_like(self.close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = self.close[1:] / self.close[:-1] - 1
+        returns[~np.isfinite(returns)] = 0.0
+        return returns
+
+
+def load_panel(
+    market_data: "MarketDataService",
+    symbols: Optional[Iterable[str]] = None,
+    *,
+    limit: Optional[int] = 1000,
+    start=None,
+    end=None,
+) -> Panel:
+    """Load stored candles for ``symbols`` (default: all configured) into a :class:`Panel`."""
+
+    return Panel.from_frames(market_data.load_candles_many(symbols, limit, start=start, end=end))
+
+
+def max_drawdown(equity: np.ndarray) -> np.ndarray:
+    """Largest peak-to-trough loss (a negative fraction) along the first axis."""
+
+    return (equity / np.maximum.accumulate(equity, axis=0) - 1).min(axis=0)
+
+
+def sharpe_ratio(returns: np.ndarray, periods_per_year: float) -> np.ndarray:
+    """Annualised Sharpe ratio of per-bar ``returns`` along the first axis (zero risk-free rate)."""
+
+    std = returns.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = returns.mean(axis=0) / std * np.sqrt(periods_per_year)
+    return np.where(std > 0, ratio, 0.0)
+
+
+@dataclass
+class PortfolioResult:
+    """Per-bar weights, profit and turnover of a portfolio backtest, shaped ``(bars, symbols)``."""
+
+    times: np.ndarray
+    symbols: Tuple[str, ...]
+    weights: np.ndarray
+    returns: np.ndarray
+    turnover: np.ndarray
+    periods_per_year: float
+
+    @property
+    def portfolio_returns(self) -> np.ndarray:
+        return self.returns.sum(axis=1)
+
+    @property
+    def equity(self) -> pd.Series:
+        return pd.Series(np.cumprod(1 + self.portfolio_returns), index=self.times, name="equity")
+
+    @property
+    def symbol_equity(self) -> pd.DataFrame:
+        return pd.DataFrame(np.cumprod(1 + self.returns, axis=0), index=self.times, columns=list(self.symbols))
+
+    @property
+    def drawdown(self) -> pd.Series:
+        equity = self.equity
+        return (equity / equity.cummax() - 1).rename("drawdown")
+
+    def summary(self) -> pd.DataFrame:
+        """Total return, max drawdown, Sharpe and turnover per symbol plus a ``portfolio`` row."""
+
+        returns = np.column_stack([self.returns, self.portfolio_returns])
+        equity = np.cumprod(1 + returns, axis=0)
+        turnover = np.append(self.turnover.sum(axis=0), self.turnover.sum())
+        empty = len(returns) == 0
+        return pd.DataFrame(
+            {
+                "total_return": np.zeros(returns.shape[1]) if empty else equity[-1] - 1,
+                "max_drawdown": np.zeros(returns.shape[1]) if empty else max_drawdown(equity),
+                "sharpe": np.zeros(returns.shape[1]) if empty else sharpe_ratio(returns, self.periods_per_year),
+                "turnover": turnover,
+            },
+            index=pd.Index([*self.symbols, "portfolio"], name="symbol"),
+        )
+
+
+@dataclass
+class PortfolioBacktester:
+    """Runs one strategy over every symbol of a :class:`Panel` at once.
+
+    Positions decided at a bar's close earn the next bar's return. Every
+    change in weight pays ``fee_rate + slippage`` on the traded fraction of
+    equity. With ``sizing="equal"`` each symbol gets ``leverage / symbols``
+    of equity. With ``"volatility"``, weights are proportional to the inverse
+    rolling volatility of listed symbols and sum to ``leverage``.
+    """
+
+    strategy: Strategy
+    fee_rate: float = 0.001
+    slippage: float = 0.0005
+    sizing: str = "equal"
+    leverage: float = 1.0
+    volatility_window: int = 20
+    periods_per_year: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.sizing not in SIZING_METHODS:
+            raise ValueError(f"sizing must be one of {SIZING_METHODS}, got {self.sizing!r}")
+
+    def run(self, panel: Panel) -> PortfolioResult:
+        positions = self._positions(panel).astype(float)
+        positions[np.isnan(panel.close)] = 0.0
+        returns = panel.returns
+        weights = self._size(positions, returns, listed=~np.isnan(panel.close))
+
+        held = np.zeros_like(weights)
+        held[1:] = weights[:-1]
+        traded = np.abs(np.diff(weights, axis=0, prepend=np.zeros((1, weights.shape[1]))))
+        pnl = held * returns - traded * (self.fee_rate + self.slippage)
+        return PortfolioResult(
+            times=panel.times,
+            symbols=panel.symbols,
+            weights=weights,
+            returns=pnl,
+            turnover=traded,
+            periods_per_year=self.periods_per_year or bars_per_year(panel.times),
+        )
+
+    def _positions(self, panel: Panel) -> np.ndarray:
+        if isinstance(self.strategy, PanelStrategy):
+            return np.asarray(self.strategy.generate_positions(panel.close))
+        if not isinstance(self.strategy, VectorizedStrategy):
+            raise TypeError(f"{type(self.strategy).__name__} implements neither generate_positions nor generate_signals")
+        positions = np.zeros(panel.close.shape)
+        for column, symbol in enumerate(panel.symbols):
+            listed = ~np.isnan(panel.close[:, column])
+            frame = pd.DataFrame(
+                {"open_time": panel.times[listed], "close": panel.close[listed, column], "symbol": symbol}
+            )
+            if len(frame):
+                positions[listed, column] = self.strategy.generate_signals(frame)["position"].to_numpy(dtype=float)
+        return positions
+
+    def _size(self, positions: np.ndarray, returns: np.ndarray, listed: np.ndarray) -> np.ndarray:
+        if self.sizing == "equal":
+            return positions * (self.leverage / max(positions.shape[1], 1))
+        volatility = rolling_std(returns, self.volatility_window)
+        with np.errstate(divide="ignore"):
+            inverse = np.where(listed & (volatility > 0), 1.0 / volatility, 0.0)
+        total = inverse.sum(axis=1, keepdims=True)
+        scale = np.divide(inverse, total, out=np.zeros_like(inverse), where=total > 0)
+        return positions * scale * self.leverage
+
+
+def _fill_forward(values: np.ndarray) -> np.ndarray:
+    rows = np.where(~np.isnan(values), np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(values, np.maximum(rows, 0), axis=0)
+    filled[rows < 0] = np.nan
+    return filled
+
+
+def bars_per_year(times: np.ndarray) -> float:
+    """Bars per year implied by the median spacing of ascending ``times``; 1 when it cannot be told."""
+
+    if len(times) < 2:
+        return 1.0
+    step = np.median(np.diff(times).astype("timedelta64[ns]").astype(np.int64)) / 1e9
+    return SECONDS_PER_YEAR / step if step > 0 else 1.0
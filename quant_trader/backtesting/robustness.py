@@ -0,0 +1,212 @@
+"""Monte Carlo robustness checks of backtest results.
+
+A single backtest return says little about how much of it was luck. The
+resamplers here rebuild thousands of alternative histories from a
+backtest's per-bar returns and report the distribution of total return,
+maximum drawdown and Sharpe ratio over them.
+
+Resamples are drawn as index matrices, one row per resample, and evaluated
+with whole-matrix NumPy operations, ``chunk_size`` resamples at a time to
+bound memory and stay cache friendly. Chunks can be spread over a process
+pool; each chunk has its own seed derived from ``seed``, so results do not
+depend on the number of processes.
+
+Positions and returns are aligned as in :class:`BacktestResult`:
+``positions[i]`` is the position that earned ``bar_returns[i]``.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing as mp
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.backtesting.portfolio import max_drawdown, sharpe_ratio
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from quant_trader.backtesting.backtester import BacktestResult
+
+logger = logging.getLogger(__name__)
+
+RESAMPLE_METHODS = ("block", "trades")
+
+METRICS = ("total_return", "max_drawdown", "sharpe")
+
+
+@dataclass
+class RobustnessResult:
+    """Metric distributions over the resamples, plus the metrics of the original series."""
+
+    method: str
+    total_return: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe: np.ndarray
+    observed: Dict[str, float]
+
+    @property
+    def resamples(self) -> int:
+        return len(self.total_return)
+
+    def distributions(self) -> pd.DataFrame:
+        return pd.DataFrame({name: getattr(self, name) for name in METRICS})
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> pd.DataFrame:
+        """Observed value, mean, spread and quantiles of each metric.
+
+        ``percentile`` is the share of resamples at or below the observed
+        value; a backtest that beats nearly all of its own resamples got
+        lucky with the order of its returns.
+        """
+
+        rows = {}
+        for name in METRICS:
+            values = getattr(self, name)
+            row = {"observed": self.observed[name], "mean": values.mean(), "std": values.std()}
+            for quantile, value in zip(quantiles, np.quantile(values, quantiles)):
+                row[f"q{quantile * 100:g}"] = value
+            row["percentile"] = float(np.mean(values <= self.observed[name]))
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis("metric")
+
+
+def trade_returns(bar_returns: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Compounded return of each trade: each run of bars holding the same non-zero position.
+
+    ``positions[i]`` must be the position held while ``bar_returns[i]`` was
+    earned. :class:`~quant_trader.backtesting.backtester.Backtester` records
+    them that way; the weights of a
+    :class:`~quant_trader.backtesting.portfolio.PortfolioResult` earn the
+    next bar's return, so shift them one bar later before passing them here.
+    """
+
+    bar_returns = np.asarray(bar_returns, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    held = positions != 0
+    starts = np.flatnonzero(held & np.r_[True, positions[1:] != positions[:-1]])
+    if not len(starts):
+        return np.zeros(0)
+    # Flat bars earn nothing, so folding them into the preceding trade leaves its return unchanged.
+    growth = np.where(held, 1 + bar_returns, 1.0)[starts[0]:]
+    return np.multiply.reduceat(growth, starts - starts[0]) - 1
+
+
+def _metrics(samples: np.ndarray, periods_per_year: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total return, max drawdown and Sharpe of each column of ``samples``; consumes ``samples``."""
+
+    sharpe = sharpe_ratio(samples, periods_per_year)
+    equity = np.cumprod(np.add(samples, 1, out=samples), axis=0, out=samples)
+    return equity[-1] - 1, max_drawdown(equity), sharpe
+
+
+def _block_indices(rng: np.random.Generator, length: int, block_size: int, count: int) -> np.ndarray:
+    # Circular block bootstrap: any bar may start a block and blocks wrap
+    # around the end, which the caller provides by extending the series.
+    blocks = math.ceil(length / block_size)
+    starts = rng.integers(0, length, size=(count, blocks, 1))
+    return (starts + np.arange(block_size)).reshape(count, blocks * block_size)[:, :length]
+
+
+def _trade_indices(rng: np.random.Generator, trades: int, count: int, replace: bool) -> np.ndarray:
+    if replace:
+        return rng.integers(0, trades, size=(count, trades))
+    return rng.permuted(np.broadcast_to(np.arange(trades), (count, trades)), axis=1)
+
+
+def _resample_chunk(task: Tuple) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    method, values, periods_per_year, option, seed, count = task
+    rng = np.random.default_rng(seed)
+    if method == "block":
+        indices = _block_indices(rng, len(values), option, count)
+        values = np.concatenate([values, values[: option - 1]])
+    else:
+        indices = _trade_indices(rng, len(values), count, option)
+    # One resample per row keeps each path contiguous; the metrics run down the columns of the transpose.
+    return _metrics(values[indices].T, periods_per_year)
+
+
+@dataclass
+class MonteCarlo:
+    """Resamples a backtest's returns to show how much of its result is luck.
+
+    ``method="block"`` draws whole blocks of ``block_size`` consecutive
+    bars (circular block bootstrap), keeping the short-range dependence of
+    the returns; ``block_size`` defaults to the square root of the number of
+    bars. ``method="trades"`` resamples whole trades: with ``replace`` it
+    bootstraps the trade outcomes, without it only shuffles their order,
+    which leaves total return and Sharpe unchanged and varies the drawdown.
+    Trade Sharpe ratios are annualised by the number of trades per year.
+
+    ``processes`` greater than one spreads chunks over a process pool.
+    """
+
+    resamples: int = 10_000
+    method: str = "block"
+    block_size: Optional[int] = None
+    replace: bool = True
+    chunk_size: int = 200
+    processes: int = 1
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.method not in RESAMPLE_METHODS:
+            raise ValueError(f"method must be one of {RESAMPLE_METHODS}, got {self.method!r}")
+        if self.resamples < 1 or self.chunk_size < 1:
+            raise ValueError("resamples and chunk_size must be positive")
+
+    def run(
+        self,
+        bar_returns: np.ndarray,
+        positions: Optional[np.ndarray] = None,
+        *,
+        periods_per_year: float = 1.0,
+    ) -> RobustnessResult:
+        """Resample per-bar strategy returns; ``positions`` is needed for ``method="trades"``.
+
+        ``positions`` follows the alignment of :func:`trade_returns`.
+        """
+
+        bar_returns = np.asarray(bar_returns, dtype=float)
+        if not len(bar_returns):
+            raise ValueError("Cannot resample an empty return series")
+        if self.method == "block":
+            values = bar_returns
+            option = self.block_size or max(1, round(math.sqrt(len(values))))
+        else:
+            if positions is None:
+                raise ValueError("Trade resampling needs the per-bar positions")
+            values = trade_returns(bar_returns, positions)
+            if not len(values):
+                raise ValueError("The backtest made no trades to resample")
+            periods_per_year = periods_per_year * len(values) / len(bar_returns)
+            option = self.replace
+
+        observed = _metrics(values[:, None].copy(), periods_per_year)
+        counts = [min(self.chunk_size, self.resamples - done) for done in range(0, self.resamples, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(counts))
+        tasks = [(self.method, values, periods_per_year, option, seed, count) for seed, count in zip(seeds, counts)]
+        if self.processes > 1 and len(tasks) > 1:
+            with mp.Pool(min(self.processes, len(tasks))) as pool:
+                parts: List[Tuple[np.ndarray, ...]] = pool.map(_resample_chunk, tasks)
+        else:
+            parts = [_resample_chunk(task) for task in tasks]
+        logger.info("Evaluated %d %s resamples of %d values", self.resamples, self.method, len(values))
+
+        total_return, drawdown, sharpe = (np.concatenate(column) for column in zip(*parts))
+        return RobustnessResult(
+            method=self.method,
+            total_return=total_return,
+            max_drawdown=drawdown,
+            sharpe=sharpe,
+            observed={name: float(value[0]) for name, value in zip(METRICS, observed)},
+        )
+
+    def run_backtest(self, result: "BacktestResult") -> RobustnessResult:
+        """Resample the per-bar series recorded on a :class:`BacktestResult`."""
+
+        if result.bar_returns is None:
+            raise ValueError("The backtest result carries no per-bar returns")
+        return self.run(result.bar_returns, result.positions, periods_per_year=result.periods_per_year)
@@ -6,8 +6,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
-
 
 @dataclass
 class Settings:
@@ -17,27 +15,52 @@ class Settings:
     binance_api_secret: str
     base_url: str = "https://api.binance.com"
     testnet_url: str = "https://testnet.binance.vision"
+    stream_url: str = "wss://stream.binance.com:9443"
+    testnet_stream_url: str = "wss://testnet.binance.vision"
     use_testnet: bool = False
     database_url: str = "sqlite:///quant_trader.db"
     symbols: tuple[str, ...] = ("BTCUSDT", "ETHUSDT")
     candles_interval: str = "1h"
+    rollup_intervals: tuple[str, ...] = ()
     cache_dir: Path = Path(".cache")
+    candle_store: str = "sql"
+    request_weight_limit: int = 1200
+    request_timeout: float = 10.0
+    request_max_retries: int = 5
+    http_pool_size: int = 100
+    candle_cache_size: int = 1000
+    candle_cache_symbols: int = 512
+    exchange_info_ttl: float = 3600.0
+    metrics_enabled: bool = False
+    metrics_port: int = 0
+    metrics_snapshot_path: Optional[Path] = None
+    metrics_snapshot_interval: float = 60.0
 
     @property
     def active_base_url(self) -> str:
         return self.testnet_url if self.use_testnet else self.base_url
 
+    @property
+    def active_stream_url(self) -> str:
+        return self.testnet_stream_url if self.use_testnet else self.stream_url
+
 
-def load_settings(env_file: Optional[Path | str] = None) -> Settings:
-    """Load settings from environment variables and optional .env file."""
+def load_settings(env_file: Optional[Path | str] = None, *, require_credentials: bool = True) -> Settings:
+    """Load settings from environment variables and optional .env file.
+
+    Commands that never sign a request pass ``require_credentials=False``;
+    the API key and secret are then empty when not configured.
+    """
 
     env_path = Path(env_file) if env_file else Path(".env")
     if env_path.exists():
+        from dotenv import load_dotenv
+
         load_dotenv(env_path)
 
     api_key = os.getenv("BINANCE_API_KEY", "")
     api_secret = os.getenv("BINANCE_API_SECRET", "")
-    if not api_key or not api_secret:
+    if require_credentials and (not api_key or not api_secret):
         raise ValueError(
             "BINANCE_API_KEY and BINANCE_API_SECRET must be provided via environment variables or .env file"
         )
@@ -53,9 +76,26 @@ def load_settings(env_file: Optional[Path | str] = None) -> Settings:
         binance_api_secret=api_secret,
         base_url=os.getenv("BINANCE_BASE_URL", "https://api.binance.com"),
         testnet_url=os.getenv("BINANCE_TESTNET_URL", "https://testnet.binance.vision"),
+        stream_url=os.getenv("BINANCE_STREAM_URL", "wss://stream.binance.com:9443"),
+        testnet_stream_url=os.getenv("BINANCE_TESTNET_STREAM_URL", "wss://testnet.binance.vision"),
         use_testnet=os.getenv("BINANCE_USE_TESTNET", "false").lower() in {"1", "true", "yes"},
         database_url=os.getenv("DATABASE_URL", "sqlite:///quant_trader.db"),
         symbols=symbols,
         candles_interval=os.getenv("CANDLES_INTERVAL", "1h"),
+        rollup_intervals=tuple(
+            interval.strip() for interval in os.getenv("ROLLUP_INTERVALS", "").split(",") if interval.strip()
+        ),
         cache_dir=Path(os.getenv("CACHE_DIR", ".cache")),
+        candle_store=os.getenv("CANDLE_STORE", "sql").lower(),
+        request_weight_limit=int(os.getenv("BINANCE_WEIGHT_LIMIT", "1200")),
+        request_timeout=float(os.getenv("BINANCE_REQUEST_TIMEOUT", "10")),
+        request_max_retries=int(os.getenv("BINANCE_MAX_RETRIES", "5")),
+        http_pool_size=int(os.getenv("HTTP_POOL_SIZE", "100")),
+        candle_cache_size=int(os.getenv("CANDLE_CACHE_SIZE", "1000")),
+        candle_cache_symbols=int(os.getenv("CANDLE_CACHE_SYMBOLS", "512")),
+        exchange_info_ttl=float(os.getenv("EXCHANGE_INFO_TTL", "3600")),
+        metrics_enabled=os.getenv("METRICS_ENABLED", "false").lower() in {"1", "true", "yes"},
+        metrics_port=int(os.getenv("METRICS_PORT", "0")),
+        metrics_snapshot_path=Path(os.environ["METRICS_SNAPSHOT"]) if os.getenv("METRICS_SNAPSHOT") else None,
+        metrics_snapshot_interval=float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "60")),
     )
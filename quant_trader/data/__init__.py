@@ -1,6 +1,33 @@
-"""Data layer exports."""
+"""Data layer exports, imported on first access."""
+from __future__ import annotations
 
-from .binance_client import BinanceClient
-from .market_data_service import MarketDataService, export_to_csv
+from typing import TYPE_CHECKING
 
-__all__ = ["BinanceClient", "MarketDataService", "export_to_csv"]
+from quant_trader.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .async_binance_client import AsyncBinanceClient
+    from .binance_client import BinanceClient
+    from .export import CandleExporter, ExportResult
+    from .market_data_service import MarketDataService, export_to_csv
+
+__all__ = [
+    "AsyncBinanceClient",
+    "BinanceClient",
+    "CandleExporter",
+    "ExportResult",
+    "MarketDataService",
+    "export_to_csv",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AsyncBinanceClient": "async_binance_client",
+        "BinanceClient": "binance_client",
+        "CandleExporter": "export",
+        "ExportResult": "export",
+        "MarketDataService": "market_data_service",
+        "export_to_csv": "market_data_service",
+    },
+)
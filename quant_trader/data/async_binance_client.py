@@ -0,0 +1,177 @@
+"""asyncio Binance REST client sharing the blocking client's signing and scheduling."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+
+from quant_trader.config import Settings
+from quant_trader.data.binance_client import klines_params, order_params, record_request, sign_params
+from quant_trader.data.kline_decoder import load_json
+from quant_trader.data.rate_limit import TIMESTAMP_OUTSIDE_WINDOW, RequestScheduler, SchedulerStats
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBinanceClient:
+    """Non-blocking counterpart of :class:`BinanceClient`.
+
+    Requests share one ``aiohttp`` session whose connector holds at most
+    ``Settings.http_pool_size`` keep-alive connections, so hundreds of
+    concurrent calls reuse a bounded set of sockets. Pass the blocking
+    client's ``scheduler`` to draw both clients from one weight budget.
+    The session is created lazily inside the running event loop.
+    """
+
+    def __init__(self, settings: Settings, scheduler: Optional[RequestScheduler] = None) -> None:
+        self.settings = settings
+        self.scheduler = scheduler or RequestScheduler(
+            settings.request_weight_limit, max_retries=settings.request_max_retries
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def stats(self) -> SchedulerStats:
+        return self.scheduler.stats
+
+    @property
+    def base_url(self) -> str:
+        return self.settings.active_base_url
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.settings.http_pool_size, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-MBX-APIKEY": self.settings.binance_api_key},
+                timeout=aiohttp.ClientTimeout(total=self.settings.request_timeout),
+            )
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        signed: bool = False,
+    ) -> Any:
+        url = f"{self.base_url}{path}"
+        if signed and not self.scheduler.time_synced:
+            await self.sync_time()
+
+        attempt = 0
+        resynced = False
+        while True:
+            request_params: Dict[str, Any] = dict(params or {})
+            if signed:
+                request_params = sign_params(self.settings.binance_api_secret, request_params, self.scheduler.timestamp())
+            request_params = {key: str(value) for key, value in request_params.items()}
+
+            delay = self.scheduler.reserve(path)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                async with self.session.request(method, url, params=request_params) as response:
+                    self.scheduler.observe(response.headers)
+                    body = await response.read()
+                    payload = load_json(body) if body else None
+                    status = response.status
+                    headers = response.headers
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                record_request(self.scheduler, method, path, "error", time.perf_counter() - started)
+                attempt += 1
+                delay = self.scheduler.retry_delay(method, attempt, None, {})
+                if delay is None:
+                    raise
+                logger.warning("%s %s failed (%s); retry %s in %.2fs", method, path, exc, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            record_request(self.scheduler, method, path, status, time.perf_counter() - started)
+            if status < 400:
+                return payload
+            code = payload.get("code") if isinstance(payload, dict) else None
+            if signed and not resynced and code == TIMESTAMP_OUTSIDE_WINDOW:
+                resynced = True
+                await self.sync_time()
+                continue
+            attempt += 1
+            delay = self.scheduler.retry_delay(method, attempt, status, headers)
+            if delay is None:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=status, message=str(payload), headers=headers
+                )
+            logger.warning("%s %s returned %s; retry %s in %.2fs", method, path, status, attempt, delay)
+            await asyncio.sleep(delay)
+
+    async def sync_time(self) -> int:
+        sent = time.time() * 1000
+        server_time = (await self._request("GET", "/api/v3/time"))["serverTime"]
+        self.scheduler.record_server_time(server_time, sent, time.time() * 1000)
+        return self.scheduler.time_offset_ms
+
+    async def ping(self) -> Dict[str, Any]:
+        return await self._request("GET", "/api/v3/ping")
+
+    async def get_exchange_info(self) -> Dict[str, Any]:
+        return await self._request("GET", "/api/v3/exchangeInfo")
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500,
+    ) -> list[list]:
+        params = klines_params(symbol, interval, start_time=start_time, end_time=end_time, limit=limit)
+        return await self._request("GET", "/api/v3/klines", params=params)
+
+    async def get_account(self) -> Dict[str, Any]:
+        return await self._request("GET", "/api/v3/account", signed=True)
+
+    async def create_order(
+        self,
+        *,
+        symbol: str,
+        side: str,
+        type_: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        params = order_params(
+            symbol=symbol,
+            side=side,
+            type_=type_,
+            quantity=quantity,
+            price=price,
+            time_in_force=time_in_force,
+            client_order_id=client_order_id,
+        )
+        return await self._request("POST", "/api/v3/order", params=params, signed=True)
+
+    async def get_order(self, symbol: str, *, client_order_id: str) -> Dict[str, Any]:
+        """Look up an order by the ``newClientOrderId`` it was sent with."""
+
+        params = {"symbol": symbol.upper(), "origClientOrderId": client_order_id}
+        return await self._request("GET", "/api/v3/order", params=params, signed=True)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncBinanceClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -3,36 +3,129 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import logging
 import time
+from decimal import Decimal
 from typing import Any, Dict, Mapping, MutableMapping, Optional
 
 import requests
 
 from quant_trader.config import Settings
+from quant_trader.data.kline_decoder import load_json
+from quant_trader.data.rate_limit import TIMESTAMP_OUTSIDE_WINDOW, RequestScheduler, SchedulerStats, request_weight
+from quant_trader.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def sign_params(secret: str, params: Mapping[str, Any], timestamp: int) -> Dict[str, Any]:
+    """Return ``params`` plus ``timestamp`` and HMAC-SHA256 ``signature``.
+
+    The result is ordered exactly as it was signed so the query string the
+    HTTP library builds matches the signed payload.
+    """
+
+    signed: Dict[str, Any] = dict(params)
+    signed["timestamp"] = timestamp
+    signed = {key: signed[key] for key in sorted(signed)}
+    query_string = "&".join(f"{key}={value}" for key, value in signed.items())
+    signed["signature"] = hmac.new(secret.encode(), query_string.encode(), hashlib.sha256).hexdigest()
+    return signed
+
+
+def klines_params(
+    symbol: str,
+    interval: str,
+    *,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
+    if start_time:
+        params["startTime"] = start_time
+    if end_time:
+        params["endTime"] = end_time
+    return params
+
+
+def format_decimal(value: float) -> str:
+    """Plain decimal notation; Binance rejects exponents such as ``1e-05``."""
+
+    text = format(Decimal(str(value)), "f")
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def order_params(
+    *,
+    symbol: str,
+    side: str,
+    type_: str,
+    quantity: float,
+    price: Optional[float] = None,
+    time_in_force: Optional[str] = None,
+    client_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "symbol": symbol.upper(),
+        "side": side.upper(),
+        "type": type_.upper(),
+        "quantity": format_decimal(quantity),
+    }
+    if price is not None:
+        params["price"] = format_decimal(price)
+    if time_in_force is not None:
+        params["timeInForce"] = time_in_force
+    if client_order_id is not None:
+        params["newClientOrderId"] = client_order_id
+    return params
+
+
+def record_request(scheduler: RequestScheduler, method: str, path: str, status: Any, seconds: float) -> None:
+    """Record latency, status and weight of one HTTP attempt in the shared metrics registry."""
+
+    if not metrics.enabled:
+        return
+    metrics.observe("http_request_seconds", seconds, method=method, endpoint=path)
+    metrics.inc("http_requests_total", method=method, endpoint=path, status=status)
+    metrics.inc("http_request_weight_total", request_weight(path), endpoint=path)
+    metrics.set_gauge("binance_used_weight", scheduler.stats.used_weight)
+    metrics.set_gauge("http_throttle_seconds", scheduler.stats.throttle_seconds)
+
+
+def _error_code(response: requests.Response) -> Optional[int]:
+    try:
+        return int(response.json().get("code"))
+    except (ValueError, TypeError, AttributeError):
+        return None
 
 
 class BinanceClient:
-    """Thin wrapper around Binance REST endpoints."""
+    """Thin wrapper around Binance REST endpoints.
 
-    def __init__(self, settings: Settings) -> None:
+    Every request goes through a :class:`RequestScheduler`, which keeps the
+    client within the account's request weight, retries throttled or
+    transient failures and corrects signed timestamps for clock skew.
+    """
+
+    def __init__(self, settings: Settings, scheduler: Optional[RequestScheduler] = None) -> None:
         self.settings = settings
+        self.scheduler = scheduler or RequestScheduler(
+            settings.request_weight_limit, max_retries=settings.request_max_retries
+        )
         self.session = requests.Session()
         self.session.headers.update({"X-MBX-APIKEY": self.settings.binance_api_key})
 
+    @property
+    def stats(self) -> SchedulerStats:
+        return self.scheduler.stats
+
     @property
     def base_url(self) -> str:
         return self.settings.active_base_url
 
     def _sign_params(self, params: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
-        params["timestamp"] = int(time.time() * 1000)
-        query_string = "&".join(f"{key}={params[key]}" for key in sorted(params))
-        signature = hmac.new(
-            self.settings.binance_api_secret.encode(),
-            query_string.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        params["signature"] = signature
-        return params
+        return sign_params(self.settings.binance_api_secret, params, self.scheduler.timestamp())
 
     def _request(
         self,
@@ -43,13 +136,57 @@ class BinanceClient:
         signed: bool = False,
     ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
-        request_params: MutableMapping[str, Any] = dict(params or {})
-        if signed:
-            request_params = self._sign_params(request_params)
-
-        response = self.session.request(method, url, params=request_params, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        if signed and not self.scheduler.time_synced:
+            self.sync_time()
+
+        attempt = 0
+        resynced = False
+        while True:
+            request_params: MutableMapping[str, Any] = dict(params or {})
+            if signed:
+                request_params = self._sign_params(request_params)
+
+            self.scheduler.acquire(path)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, url, params=request_params, timeout=self.settings.request_timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                record_request(self.scheduler, method, path, "error", time.perf_counter() - started)
+                attempt += 1
+                delay = self.scheduler.retry_delay(method, attempt, None, {})
+                if delay is None:
+                    raise
+                logger.warning("%s %s failed (%s); retry %s in %.2fs", method, path, exc, attempt, delay)
+                self.scheduler.wait(delay)
+                continue
+
+            self.scheduler.observe(response.headers)
+            record_request(self.scheduler, method, path, response.status_code, time.perf_counter() - started)
+            if response.status_code >= 400:
+                if signed and not resynced and _error_code(response) == TIMESTAMP_OUTSIDE_WINDOW:
+                    resynced = True
+                    self.sync_time()
+                    continue
+                attempt += 1
+                delay = self.scheduler.retry_delay(method, attempt, response.status_code, response.headers)
+                if delay is not None:
+                    logger.warning(
+                        "%s %s returned %s; retry %s in %.2fs", method, path, response.status_code, attempt, delay
+                    )
+                    self.scheduler.wait(delay)
+                    continue
+            response.raise_for_status()
+            return load_json(response.content)
+
+    def sync_time(self) -> int:
+        """Measure the offset between the local and server clocks; returns it in ms."""
+
+        sent = time.time() * 1000
+        server_time = self._request("GET", "/api/v3/time")["serverTime"]
+        self.scheduler.record_server_time(server_time, sent, time.time() * 1000)
+        return self.scheduler.time_offset_ms
 
     def ping(self) -> Dict[str, Any]:
         return self._request("GET", "/api/v3/ping")
@@ -66,11 +203,7 @@ class BinanceClient:
         end_time: Optional[int] = None,
         limit: int = 500,
     ) -> list[Dict[str, Any]]:
-        params: Dict[str, Any] = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
-        if start_time:
-            params["startTime"] = start_time
-        if end_time:
-            params["endTime"] = end_time
+        params = klines_params(symbol, interval, start_time=start_time, end_time=end_time, limit=limit)
         return self._request("GET", "/api/v3/klines", params=params)
 
     def get_account(self) -> Dict[str, Any]:
@@ -85,20 +218,25 @@ class BinanceClient:
         quantity: float,
         price: Optional[float] = None,
         time_in_force: Optional[str] = None,
+        client_order_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        params: Dict[str, Any] = {
-            "symbol": symbol.upper(),
-            "side": side.upper(),
-            "type": type_.upper(),
-            "quantity": quantity,
-        }
-        if price is not None:
-            params["price"] = price
-        if time_in_force is not None:
-            params["timeInForce"] = time_in_force
-
+        params = order_params(
+            symbol=symbol,
+            side=side,
+            type_=type_,
+            quantity=quantity,
+            price=price,
+            time_in_force=time_in_force,
+            client_order_id=client_order_id,
+        )
         return self._request("POST", "/api/v3/order", params=params, signed=True)
 
+    def get_order(self, symbol: str, *, client_order_id: str) -> Dict[str, Any]:
+        """Look up an order by the ``newClientOrderId`` it was sent with."""
+
+        params = {"symbol": symbol.upper(), "origClientOrderId": client_order_id}
+        return self._request("GET", "/api/v3/order", params=params, signed=True)
+
     def close(self) -> None:
         self.session.close()
 
@@ -0,0 +1,214 @@
+"""Per-symbol in-memory windows over the most recent candles."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.data.columnar_store import COLUMN_DTYPES, to_epoch_ms
+
+_TIME_COLUMNS = ("open_time", "close_time")
+
+
+class CandleWindow:
+    """Fixed-capacity, ascending window of candles backed by preallocated arrays.
+
+    Each column is allocated at twice ``capacity``. Rows are appended at the
+    end and, once the buffer is full, the newest ``capacity - 1`` rows are
+    moved back to the front. The newest ``n`` rows are therefore always
+    contiguous and can be handed out as views. Appends cost amortised O(1).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(2 * capacity, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()
+        }
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return int(self._columns["open_time"][self._end - 1]) if len(self) else None
+
+    @property
+    def first_open_time(self) -> Optional[int]:
+        return int(self._columns["open_time"][self._start]) if len(self) else None
+
+    def append(self, rows: Dict[str, np.ndarray]) -> None:
+        """Append ascending rows that are newer than :attr:`last_open_time`."""
+
+        count = len(rows["open_time"])
+        if count >= self.capacity:
+            for name, column in self._columns.items():
+                column[: self.capacity] = rows[name][-self.capacity :]
+            self._start, self._end = 0, self.capacity
+            return
+        if self._end + count > len(self._columns["open_time"]):
+            keep = min(len(self), self.capacity - count)
+            for column in self._columns.values():
+                column[:keep] = column[self._end - keep : self._end]
+            self._start, self._end = 0, keep
+        for name, column in self._columns.items():
+            column[self._end : self._end + count] = rows[name]
+        self._end += count
+        self._start = max(self._start, self._end - self.capacity)
+
+    def overwrite(self, rows: Dict[str, np.ndarray]) -> bool:
+        """Overwrite the cached rows with the same ``open_time`` as ascending ``rows``.
+
+        Returns ``False``, changing nothing, when any of ``rows`` is not in the window.
+        """
+
+        times = self._columns["open_time"][self._start : self._end]
+        positions = np.searchsorted(times, rows["open_time"])
+        if not len(times) or positions[-1] >= len(times) or (times[positions] != rows["open_time"]).any():
+            return False
+        for name, column in self._columns.items():
+            column[self._start + positions] = rows[name]
+        return True
+
+    def latest(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """Newest ``limit`` rows, ascending, as views onto the window's buffers.
+
+        The views stay valid until the next update of this window.
+        """
+
+        start = self._start if limit is None else max(self._start, self._end - limit)
+        data = {}
+        for name, column in self._columns.items():
+            view = column[start : self._end]
+            data[name] = view.view("datetime64[ms]") if name in _TIME_COLUMNS else view
+        return pd.DataFrame(data, copy=False)
+
+
+class CandleCache:
+    """Bounded set of :class:`CandleWindow` objects with least-recently-used eviction.
+
+    A symbol is only cached once it has been seeded from the store, so a
+    window is always an exact suffix of the stored history. Later persisted
+    candles are appended to it and re-fetched ones overwrite their cached
+    version in place. Writes that reach before the window's first candle, or
+    fill a gap inside it, invalidate the window instead of leaving a hole.
+    """
+
+    def __init__(self, capacity: int = 1000, max_symbols: int = 512) -> None:
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._windows: "OrderedDict[str, CandleWindow]" = OrderedDict()
+        self._complete: Dict[str, bool] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._windows
+
+    def version(self, symbol: str) -> int:
+        """Number of updates seen for ``symbol``; pass it to :meth:`seed`."""
+
+        return self._versions.get(symbol.upper(), 0)
+
+    def get(self, symbol: str, limit: int) -> Optional[pd.DataFrame]:
+        """Return the newest ``limit`` candles if the cache can serve them, else ``None``."""
+
+        key = symbol.upper()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or (len(window) < limit and not self._complete[key]) or limit > self.capacity:
+                self.misses += 1
+                return None
+            self._windows.move_to_end(key)
+            self.hits += 1
+            return window.latest(limit)
+
+    def seed(self, symbol: str, candles: pd.DataFrame, *, complete: bool, version: Optional[int] = None) -> bool:
+        """Replace the window of ``symbol`` with ``candles``.
+
+        ``complete`` marks that ``candles`` holds the entire stored history,
+        so shorter windows may still answer larger requests. When ``version``
+        is given and an update arrived since it was read, ``candles`` may be
+        stale and the seed is dropped. Returns whether the window was stored.
+        """
+
+        key = symbol.upper()
+        window = CandleWindow(self.capacity)
+        rows = _rows(candles)
+        if len(rows["open_time"]):
+            window.append(rows)
+        with self._lock:
+            if version is not None and self._versions.get(key, 0) != version:
+                return False
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            self._complete[key] = complete and len(window) == len(rows["open_time"])
+            while len(self._windows) > self.max_symbols:
+                evicted, _ = self._windows.popitem(last=False)
+                self._complete.pop(evicted, None)
+        return True
+
+    def update(self, symbol: str, candles: pd.DataFrame) -> None:
+        """Apply freshly persisted ``candles`` to the window of ``symbol``, if cached."""
+
+        key = symbol.upper()
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            window = self._windows.get(key)
+            if window is None or candles.empty:
+                return
+            rows = _rows(candles)
+            open_times = rows["open_time"]
+            first, last = window.first_open_time, window.last_open_time
+            if last is not None:
+                overlap = int(np.searchsorted(open_times, last, side="right"))
+                if open_times[0] < first or (
+                    overlap and not window.overwrite({name: values[:overlap] for name, values in rows.items()})
+                ):
+                    # Rows the window cannot hold in place: rebuild from the store on next read.
+                    self._windows.pop(key)
+                    self._complete.pop(key, None)
+                    return
+                rows = {name: values[overlap:] for name, values in rows.items()}
+            if len(rows["open_time"]):
+                before = len(window)
+                window.append(rows)
+                if len(window) < before + len(rows["open_time"]):
+                    self._complete[key] = False
+
+    def evict(self, symbol: str) -> None:
+        with self._lock:
+            self._windows.pop(symbol.upper(), None)
+            self._complete.pop(symbol.upper(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+            self._complete.clear()
+
+
+def _rows(candles: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Ascending, de-duplicated columns of ``candles`` in the window's dtypes."""
+
+    open_times = to_epoch_ms(candles["open_time"])
+    order = np.argsort(open_times, kind="stable")
+    sorted_times = open_times[order]
+    unique = np.ones(len(order), dtype=bool)
+    unique[:-1] = sorted_times[1:] != sorted_times[:-1]
+    order = order[unique]
+    rows = {}
+    for name, dtype in COLUMN_DTYPES.items():
+        if name in _TIME_COLUMNS:
+            values = to_epoch_ms(candles[name])
+        else:
+            values = candles[name].to_numpy(dtype=dtype)
+        rows[name] = values[order]
+    return rows
@@ -0,0 +1,232 @@
+"""Columnar candle files with memory-mapped reads, appended to in time order."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column name -> on-disk dtype. Times are stored as epoch milliseconds.
+COLUMN_DTYPES: Dict[str, np.dtype] = {
+    "open_time": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+    "close_time": np.dtype("<i8"),
+}
+
+_TIME_COLUMNS = ("open_time", "close_time")
+
+
+def to_epoch_ms(values: pd.Series) -> np.ndarray:
+    """Convert a datetime-like series (naive values are taken as UTC) to epoch milliseconds."""
+
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype=np.int64)
+    stamps = pd.to_datetime(values, utc=True).dt.tz_localize(None)
+    return stamps.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+
+class ColumnarCandleStore:
+    """Stores candles as one raw little-endian file per column.
+
+    Layout is ``<root>/<SYMBOL>/<interval>/<column>.bin``. Rows are kept in
+    ascending ``open_time`` order and new candles are appended, so a read is
+    a binary search on the memory-mapped ``open_time`` column followed by
+    slicing every column, without copying or decoding anything. Candles that
+    are already stored are overwritten in place; missing candles older than
+    the stored tail (a backfill of earlier history) are merged in by
+    rewriting the series, one column file at a time.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _directory(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper() / interval
+
+    def _length(self, directory: Path) -> int:
+        # open_time is written last, so its size bounds the fully written rows.
+        path = directory / "open_time.bin"
+        return path.stat().st_size // COLUMN_DTYPES["open_time"].itemsize if path.exists() else 0
+
+    def _map(self, directory: Path, column: str, length: int) -> np.ndarray:
+        return np.memmap(directory / f"{column}.bin", dtype=COLUMN_DTYPES[column], mode="r", shape=(length,))
+
+    def row_count(self, symbol: str, interval: str) -> int:
+        return self._length(self._directory(symbol, interval))
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        directory = self._directory(symbol, interval)
+        length = self._length(directory)
+        if not length:
+            return None
+        return int(self._map(directory, "open_time", length)[-1])
+
+    def append(self, symbol: str, interval: str, candles: pd.DataFrame) -> int:
+        """Store candles and return the number of new rows.
+
+        A candle whose ``open_time`` is already stored replaces it in place,
+        which lets a still-forming or corrected bar be refreshed. Older
+        candles that are missing trigger a rewrite of the series with them
+        merged in.
+        """
+
+        if candles.empty:
+            return 0
+        columns = {name: candles[name] for name in COLUMN_DTYPES}
+        open_times = to_epoch_ms(columns["open_time"])
+        order = np.argsort(open_times, kind="stable")
+        open_times = open_times[order]
+        keep = np.ones(len(open_times), dtype=bool)
+        keep[:-1] = open_times[1:] != open_times[:-1]
+
+        def incoming(name: str) -> np.ndarray:
+            if name == "open_time":
+                return open_times
+            if name in _TIME_COLUMNS:
+                return to_epoch_ms(columns[name])[order]
+            return columns[name].to_numpy(dtype=COLUMN_DTYPES[name])[order]
+
+        directory = self._directory(symbol, interval)
+        with self._lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            length = self._length(directory)
+            last = int(self._map(directory, "open_time", length)[-1]) if length else None
+            if last is not None:
+                known = keep & (open_times <= last)
+                if known.any():
+                    stored = self._map(directory, "open_time", length)
+                    positions = np.searchsorted(stored, open_times[known])
+                    if not (stored[positions] == open_times[known]).all():
+                        return self._merge(directory, length, {name: incoming(name)[keep] for name in COLUMN_DTYPES})
+                    replaced = {name: incoming(name)[known] for name in COLUMN_DTYPES}
+                    self._overwrite(directory, length, positions, replaced)
+                keep &= open_times > last
+            rows = np.flatnonzero(keep)
+            if not len(rows):
+                return 0
+
+            # Value columns first and open_time last: a crash mid-append leaves
+            # open_time.bin as the shorter file, hiding the partial row.
+            for name in [*(c for c in COLUMN_DTYPES if c != "open_time"), "open_time"]:
+                values = incoming(name)[rows]
+                self._write(directory / f"{name}.bin", length, np.ascontiguousarray(values, dtype=COLUMN_DTYPES[name]))
+        logger.debug("Appended %s candles to %s", len(rows), directory)
+        return len(rows)
+
+    def _overwrite(self, directory: Path, length: int, positions: np.ndarray, candles: Dict[str, np.ndarray]) -> None:
+        """Replace the stored rows at ``positions``, whose ``open_time`` already matches, in place."""
+
+        for name in COLUMN_DTYPES:
+            if name == "open_time":
+                continue
+            column = np.memmap(directory / f"{name}.bin", dtype=COLUMN_DTYPES[name], mode="r+", shape=(length,))
+            column[positions] = candles[name]
+            column.flush()
+
+    def _merge(self, directory: Path, length: int, candles: Dict[str, np.ndarray]) -> int:
+        """Rewrite the series with ``candles`` merged in by ``open_time``; incoming values win."""
+
+        stored = {name: np.array(self._map(directory, name, length)) for name in COLUMN_DTYPES}
+        times = np.concatenate([stored["open_time"], candles["open_time"]])
+        # Stable sort puts each incoming row after the stored row it replaces.
+        sort = np.argsort(times, kind="stable")
+        ordered = times[sort]
+        rows = sort[np.r_[ordered[1:] != ordered[:-1], True]]
+        for name in [*(c for c in COLUMN_DTYPES if c != "open_time"), "open_time"]:
+            values = np.concatenate([stored[name], candles[name]])[rows]
+            temporary = directory / f"{name}.bin.tmp"
+            temporary.write_bytes(np.ascontiguousarray(values, dtype=COLUMN_DTYPES[name]).tobytes())
+            os.replace(temporary, directory / f"{name}.bin")
+        logger.info("Merged %s missing candles into %s", len(rows) - length, directory)
+        return len(rows) - length
+
+    @staticmethod
+    def _write(path: Path, row_offset: int, values: np.ndarray) -> None:
+        with open(path, "r+b" if path.exists() else "wb") as handle:
+            handle.seek(row_offset * values.itemsize)
+            handle.write(values.tobytes())
+            # Drop leftovers of an interrupted append without ever shrinking below mapped rows.
+            handle.truncate()
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> pd.DataFrame:
+        """Return candles with ``start <= open_time <= end`` (epoch ms).
+
+        Rows are in ascending ``open_time`` order unless ``descending`` is set.
+        With ``limit`` only the newest ``limit`` rows of the range are returned.
+        Columns are views onto the memory-mapped files; ``open_time`` and
+        ``close_time`` are exposed as naive UTC ``datetime64[ms]`` values.
+        """
+
+        directory = self._directory(symbol, interval)
+        length = self._length(directory)
+        if not length:
+            return _empty_frame()
+        lo, hi = self._bounds(directory, length, start, end)
+        if limit is not None:
+            lo = min(max(lo, hi - limit), hi)
+        return self._frame(directory, length, lo, hi, descending)
+
+    def iter_chunks(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        chunk_size: int = 50_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the candles of ``start <= open_time <= end`` in ascending chunks of ``chunk_size`` rows.
+
+        Chunks are views like :meth:`read`, so only the pages being read are
+        resident, however long the range.
+        """
+
+        directory = self._directory(symbol, interval)
+        length = self._length(directory)
+        if not length:
+            return
+        lo, hi = self._bounds(directory, length, start, end)
+        for offset in range(lo, hi, chunk_size):
+            yield self._frame(directory, length, offset, min(offset + chunk_size, hi), False)
+
+    def _bounds(self, directory: Path, length: int, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+        open_times = self._map(directory, "open_time", length)
+        lo = int(np.searchsorted(open_times, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(open_times, end, side="right")) if end is not None else length
+        return min(lo, hi), hi
+
+    def _frame(self, directory: Path, length: int, lo: int, hi: int, descending: bool) -> pd.DataFrame:
+        data = {}
+        for name in COLUMN_DTYPES:
+            column = self._map(directory, name, length)
+            view = column[lo:hi][::-1] if descending else column[lo:hi]
+            data[name] = view.view("datetime64[ms]") if name in _TIME_COLUMNS else view
+        return pd.DataFrame(data, copy=False)
+
+
+def _empty_frame() -> pd.DataFrame:
+    return pd.DataFrame({name: np.empty(0, dtype=_frame_dtype(name)) for name in COLUMN_DTYPES})
+
+
+def _frame_dtype(name: str) -> str:
+    return "datetime64[ms]" if name in _TIME_COLUMNS else "float64"
@@ -0,0 +1,320 @@
+"""Cached ``/api/v3/exchangeInfo`` with a per-symbol trading filter index."""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from quant_trader.config import Settings
+from quant_trader.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_ZERO = Decimal(0)
+
+# Symbol fields kept in the on-disk copy; the rest of the payload is dropped.
+_PERSISTED_FIELDS = ("symbol", "status", "baseAsset", "quoteAsset", "filters")
+
+
+class OrderRejected(ValueError):
+    """An order that would fail the exchange's symbol filters, caught before sending."""
+
+    def __init__(self, symbol: str, reason: str) -> None:
+        super().__init__(f"{symbol}: {reason}")
+        self.symbol = symbol
+        self.reason = reason
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value)) if value not in (None, "") else _ZERO
+
+
+def _common_step(steps: Sequence[Decimal]) -> Decimal:
+    """Smallest step that is a multiple of every non-zero step in ``steps``."""
+
+    steps = [step for step in steps if step > 0]
+    if not steps:
+        return _ZERO
+    scale = Decimal(10) ** max(0, *(-step.as_tuple().exponent for step in steps))
+    return Decimal(math.lcm(*(int(step * scale) for step in steps))) / scale
+
+
+def _to_multiple(value: Decimal, step: Decimal, rounding: str) -> Decimal:
+    if step <= 0:
+        return value
+    return (value / step).to_integral_value(rounding) * step
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    """The LOT_SIZE, MARKET_LOT_SIZE, PRICE_FILTER and (MIN_)NOTIONAL rules of one symbol.
+
+    Values are exact decimals as the exchange publishes them; a zero bound or
+    step means the exchange does not enforce it.
+    """
+
+    symbol: str
+    status: str = "TRADING"
+    tick_size: Decimal = _ZERO
+    min_price: Decimal = _ZERO
+    max_price: Decimal = _ZERO
+    step_size: Decimal = _ZERO
+    min_qty: Decimal = _ZERO
+    max_qty: Decimal = _ZERO
+    market_step_size: Decimal = _ZERO
+    market_min_qty: Decimal = _ZERO
+    market_max_qty: Decimal = _ZERO
+    min_notional: Decimal = _ZERO
+    max_notional: Decimal = _ZERO
+    min_notional_market: bool = True
+    max_notional_market: bool = False
+
+    @classmethod
+    def from_payload(cls, entry: Mapping[str, Any]) -> "SymbolFilters":
+        values: Dict[str, Any] = {"symbol": entry["symbol"], "status": entry.get("status", "TRADING")}
+        for item in entry.get("filters", ()):
+            kind = item.get("filterType")
+            if kind == "PRICE_FILTER":
+                values.update(
+                    tick_size=_decimal(item.get("tickSize")),
+                    min_price=_decimal(item.get("minPrice")),
+                    max_price=_decimal(item.get("maxPrice")),
+                )
+            elif kind == "LOT_SIZE":
+                values.update(
+                    step_size=_decimal(item.get("stepSize")),
+                    min_qty=_decimal(item.get("minQty")),
+                    max_qty=_decimal(item.get("maxQty")),
+                )
+            elif kind == "MARKET_LOT_SIZE":
+                values.update(
+                    market_step_size=_decimal(item.get("stepSize")),
+                    market_min_qty=_decimal(item.get("minQty")),
+                    market_max_qty=_decimal(item.get("maxQty")),
+                )
+            elif kind == "MIN_NOTIONAL":
+                values.update(
+                    min_notional=_decimal(item.get("minNotional")),
+                    min_notional_market=bool(item.get("applyToMarket", True)),
+                )
+            elif kind == "NOTIONAL":
+                values.update(
+                    min_notional=_decimal(item.get("minNotional")),
+                    max_notional=_decimal(item.get("maxNotional")),
+                    min_notional_market=bool(item.get("applyMinToMarket", True)),
+                    max_notional_market=bool(item.get("applyMaxToMarket", False)),
+                )
+        return cls(**values)
+
+    def _lot(self, market: bool) -> Tuple[Tuple[Decimal, ...], Decimal, Decimal]:
+        if not market:
+            return (self.step_size,), self.min_qty, self.max_qty
+        # Market orders must pass both filters. MARKET_LOT_SIZE usually
+        # publishes a zero step and minimum, which leaves LOT_SIZE's in force.
+        max_qty = min((bound for bound in (self.max_qty, self.market_max_qty) if bound > 0), default=_ZERO)
+        return (self.step_size, self.market_step_size), max(self.min_qty, self.market_min_qty), max_qty
+
+    def round_quantity(self, quantity: float, *, market: bool = False) -> float:
+        """Round ``quantity`` down to the lot step(s), never ordering more than asked."""
+
+        steps, _, _ = self._lot(market)
+        return float(_to_multiple(_decimal(quantity), _common_step(steps), ROUND_FLOOR))
+
+    def round_price(self, price: float, side: str) -> float:
+        """Round a limit price to the tick, down for buys and up for sells."""
+
+        rounding = ROUND_FLOOR if side.upper() == "BUY" else ROUND_CEILING
+        return float(_to_multiple(_decimal(price), self.tick_size, rounding))
+
+    def check(self, quantity: float, price: Optional[float] = None, *, market: bool = False) -> None:
+        """Raise :class:`OrderRejected` unless the order satisfies every filter.
+
+        For market orders ``price`` is only the reference used for the
+        notional checks; without one those checks are skipped.
+        """
+
+        if self.status != "TRADING":
+            raise OrderRejected(self.symbol, f"symbol status is {self.status}")
+        steps, min_qty, max_qty = self._lot(market)
+        amount = _decimal(quantity)
+        if amount <= 0 or amount < min_qty:
+            raise OrderRejected(self.symbol, f"quantity {quantity} is below the minimum {min_qty}")
+        if max_qty > 0 and amount > max_qty:
+            raise OrderRejected(self.symbol, f"quantity {quantity} is above the maximum {max_qty}")
+        for step in steps:
+            if step > 0 and amount % step != 0:
+                raise OrderRejected(self.symbol, f"quantity {quantity} is not a multiple of the step {step}")
+        if price is None:
+            return
+        level = _decimal(price)
+        if not market:
+            if self.min_price > 0 and level < self.min_price:
+                raise OrderRejected(self.symbol, f"price {price} is below the minimum {self.min_price}")
+            if self.max_price > 0 and level > self.max_price:
+                raise OrderRejected(self.symbol, f"price {price} is above the maximum {self.max_price}")
+            if self.tick_size > 0 and level % self.tick_size != 0:
+                raise OrderRejected(self.symbol, f"price {price} is not a multiple of the tick {self.tick_size}")
+        notional = amount * level
+        if self.min_notional > 0 and (self.min_notional_market or not market) and notional < self.min_notional:
+            raise OrderRejected(self.symbol, f"notional {notional} is below the minimum {self.min_notional}")
+        if self.max_notional > 0 and (self.max_notional_market or not market) and notional > self.max_notional:
+            raise OrderRejected(self.symbol, f"notional {notional} is above the maximum {self.max_notional}")
+
+
+class ExchangeInfoCache:
+    """``exchangeInfo`` persisted to disk and indexed by symbol.
+
+    The payload is written to ``path`` with its fetch time, so restarts within
+    ``ttl`` seconds reuse it without a request. Lookups are dict reads of a
+    prebuilt :class:`SymbolFilters` index. With :meth:`start` a daemon thread
+    refreshes the payload as it goes stale; otherwise a lookup refreshes a
+    stale payload inline. A failed refresh keeps serving the previous copy
+    and is not retried for ``retry_interval`` seconds, by either path.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Mapping[str, Any]],
+        path: Optional[Path] = None,
+        ttl: float = 3600.0,
+        *,
+        retry_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fetch = fetch
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self.fetched_at: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self._index: Dict[str, SymbolFilters] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_client(cls, client: Any, settings: Settings) -> "ExchangeInfoCache":
+        return cls(client.get_exchange_info, settings.cache_dir / "exchange_info.json", settings.exchange_info_ttl)
+
+    @property
+    def stale(self) -> bool:
+        return self.fetched_at is None or self.clock() - self.fetched_at >= self.ttl
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Filters of ``symbol``, or ``None`` when the exchange does not list it."""
+
+        if self.fetched_at is None:
+            self.load()
+        elif self.stale and self._thread is None and not self._backing_off():
+            self._refresh_quietly()
+        return self._index.get(symbol.upper())
+
+    def prepare_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: Optional[float] = None,
+        *,
+        market_price: Optional[float] = None,
+    ) -> Tuple[float, Optional[float]]:
+        """Round ``quantity`` (and a limit ``price``) to the symbol's filters and validate them.
+
+        Orders without ``price`` are treated as market orders, with
+        ``market_price`` as the reference for the notional checks.
+        """
+
+        filters = self.get(symbol)
+        if filters is None:
+            raise OrderRejected(symbol.upper(), "symbol is not listed in exchangeInfo")
+        market = price is None
+        quantity = filters.round_quantity(quantity, market=market)
+        if not market:
+            price = filters.round_price(price, side)
+        filters.check(quantity, market_price if market else price, market=market)
+        return quantity, price
+
+    def load(self) -> None:
+        """Use the on-disk copy when it is fresh enough, otherwise fetch."""
+
+        with self._lock:
+            if self.fetched_at is not None:
+                return
+            if self.path is not None and self.path.exists():
+                try:
+                    stored = json.loads(self.path.read_text())
+                    self._install(stored["symbols"], float(stored["fetched_at"]))
+                except (OSError, ValueError, KeyError, TypeError) as exc:
+                    logger.warning("Ignoring unreadable exchange info cache %s: %s", self.path, exc)
+        if self.stale:
+            if self.fetched_at is None:
+                self.refresh()
+            else:
+                self._refresh_quietly()
+
+    def refresh(self) -> None:
+        """Fetch ``exchangeInfo``, rebuild the index and persist it."""
+
+        payload = self.fetch()
+        fetched_at = self.clock()
+        symbols = [{field: entry[field] for field in _PERSISTED_FIELDS if field in entry} for entry in payload["symbols"]]
+        with self._lock:
+            self._install(symbols, fetched_at)
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+                temporary.write_text(json.dumps({"fetched_at": fetched_at, "symbols": symbols}))
+                os.replace(temporary, self.path)
+        metrics.inc("exchange_info_refresh_total", result="ok")
+        logger.info("Loaded exchange info for %d symbols", len(symbols))
+
+    def _install(self, symbols: list, fetched_at: float) -> None:
+        self._index = {entry["symbol"]: SymbolFilters.from_payload(entry) for entry in symbols}
+        self.fetched_at = fetched_at
+
+    def _refresh_quietly(self) -> bool:
+        try:
+            self.refresh()
+        except Exception as exc:  # keep serving the previous payload
+            self.failed_at = self.clock()
+            metrics.inc("exchange_info_refresh_total", result="error")
+            logger.warning("Failed to refresh exchange info: %s", exc)
+            return False
+        self.failed_at = None
+        return True
+
+    def _backing_off(self) -> bool:
+        return self.failed_at is not None and self.clock() - self.failed_at < self.retry_interval
+
+    def start(self) -> "ExchangeInfoCache":
+        """Load the payload now and keep it fresh from a daemon thread."""
+
+        self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="exchange-info-refresh", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        delay = self._until_stale()
+        while not self._stop.wait(delay):
+            delay = self._until_stale() if self._refresh_quietly() else self.retry_interval
+
+    def _until_stale(self) -> float:
+        if self.fetched_at is None:
+            return 0.0
+        return max(self.fetched_at + self.ttl - self.clock(), 0.0)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,229 @@
+"""Streaming, incremental export of stored candles to compressed files."""
+from __future__ import annotations
+
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from quant_trader.data.columnar_store import to_epoch_ms
+from quant_trader.data.market_data_service import STREAM_CHUNK_ROWS, MarketDataService
+from quant_trader.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv.gz", "csv", "parquet")
+
+# Watermarks of previous exports, kept next to the exported files.
+STATE_FILE = ".export_state.json"
+
+
+@dataclass
+class ExportResult:
+    """What one export run wrote for one symbol."""
+
+    symbol: str
+    path: Path
+    rows: int
+    watermark: Optional[pd.Timestamp]
+
+
+class CandleExporter:
+    """Exports stored candles per symbol, streaming, in parallel and incrementally.
+
+    Candles are read with :meth:`MarketDataService.iter_candles` and written
+    chunk by chunk, so memory stays at about one chunk per worker however
+    long the history. Symbols are exported on ``max_workers`` threads.
+
+    The open time of the newest exported candle is recorded per output file
+    in :data:`STATE_FILE`; the next run only reads and appends candles after
+    it. CSV output is one file per symbol that each run appends to (a new
+    gzip member for ``csv.gz``); the recorded file size lets a run that died
+    half-way be truncated back before appending again. Parquet output is a
+    directory per symbol with one part file per run and needs ``pyarrow``.
+
+    Only closed candles are exported, so a bar that is still forming is never
+    frozen into a file.
+    """
+
+    def __init__(
+        self,
+        service: MarketDataService,
+        output_dir: Path,
+        *,
+        fmt: str = "csv.gz",
+        interval: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_ROWS,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+        self.service = service
+        self.output_dir = Path(output_dir)
+        self.fmt = fmt
+        self.interval = interval or service.settings.candles_interval
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def state_path(self) -> Path:
+        return self.output_dir / STATE_FILE
+
+    def path_for(self, symbol: str) -> Path:
+        stem = f"{symbol.lower()}_{self.interval}"
+        return self.output_dir / (stem if self.fmt == "parquet" else f"{stem}.{self.fmt}")
+
+    def export(self, symbols: Optional[Iterable[str]] = None, *, full: bool = False) -> List[ExportResult]:
+        """Export ``symbols`` (default: the configured ones).
+
+        With ``full`` the previous output and watermarks are discarded and
+        the whole history is written again.
+        """
+
+        targets = [symbol.upper() for symbol in (symbols or self.service.settings.symbols)]
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._state = self._read_state()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(targets) or 1))) as pool:
+            results = list(pool.map(lambda symbol: self._export_symbol(symbol, full), targets))
+        total = sum(result.rows for result in results)
+        logger.info("Exported %d candles for %d symbols to %s", total, len(results), self.output_dir)
+        return results
+
+    def _export_symbol(self, symbol: str, full: bool) -> ExportResult:
+        path = self.path_for(symbol)
+        entry = None if full else self._state.get(path.name)
+        if entry is not None and not self._output_intact(path, entry):
+            logger.warning("Export %s is missing or shorter than recorded; exporting it in full", path)
+            entry = None
+        if entry is None:
+            self._remove(path)
+        watermark = entry["watermark"] if entry else None
+        cutoff = int(self.clock() * 1000)
+        chunks = self._closed(
+            self.service.iter_candles(
+                symbol,
+                interval=self.interval,
+                start=watermark + 1 if watermark is not None else None,
+                chunk_size=self.chunk_size,
+            ),
+            cutoff,
+        )
+        first = next(chunks, None)
+        if first is None:
+            rows, last, size = 0, None, 0
+        elif self.fmt == "parquet":
+            rows, last, size = self._write_parquet(path, itertools.chain([first], chunks))
+        else:
+            rows, last, size = self._write_csv(path, itertools.chain([first], chunks), entry)
+        if rows:
+            watermark = last
+            total = (entry or {}).get("rows", 0) + rows
+            self._record(path.name, {"watermark": watermark, "bytes": size, "rows": total})
+            metrics.inc("export_rows_total", rows, symbol=symbol, format=self.fmt)
+        elif entry is None and path.name in self._state:
+            self._record(path.name, None)
+        logger.info("Exported %d new %s candles of %s to %s", rows, self.interval, symbol, path)
+        stamp = pd.Timestamp(watermark, unit="ms") if watermark is not None else None
+        return ExportResult(symbol, path, rows, stamp)
+
+    @staticmethod
+    def _closed(chunks: Iterable[pd.DataFrame], cutoff: int) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            closed = to_epoch_ms(chunk["close_time"]) < cutoff
+            if not closed.all():
+                chunk = chunk[closed]
+            if not chunk.empty:
+                yield chunk
+
+    def _write_csv(self, path: Path, chunks: Iterable[pd.DataFrame], entry: Optional[Dict[str, Any]]):
+        rows, last = 0, None
+        mode = "r+b" if entry is not None else "wb"
+        with open(path, mode) as raw:
+            if entry is not None:
+                raw.truncate(entry["bytes"])
+                raw.seek(entry["bytes"])
+            sink = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if self.fmt == "csv.gz" else raw
+            handle = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+            try:
+                for chunk in chunks:
+                    chunk.to_csv(handle, header=entry is None and rows == 0, index=False)
+                    rows += len(chunk)
+                    last = int(to_epoch_ms(chunk["open_time"].iloc[-1:])[0])
+            finally:
+                handle.flush()
+                handle.detach()
+                if sink is not raw:
+                    sink.close()
+            size = raw.tell()
+        return rows, last, size
+
+    def _write_parquet(self, path: Path, chunks: Iterable[pd.DataFrame]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - depends on the environment
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from exc
+
+        path.mkdir(parents=True, exist_ok=True)
+        temporary = path / ".part.parquet.tmp"
+        rows, first, last, writer = 0, None, None, None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(temporary, table.schema, compression="zstd")
+                    first = int(to_epoch_ms(chunk["open_time"].iloc[:1])[0])
+                writer.write_table(table)
+                rows += len(chunk)
+                last = int(to_epoch_ms(chunk["open_time"].iloc[-1:])[0])
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is not None:
+            os.replace(temporary, path / f"part-{first}-{last}.parquet")
+        return rows, last, 0
+
+    def _output_intact(self, path: Path, entry: Dict[str, Any]) -> bool:
+        if self.fmt == "parquet":
+            return path.is_dir()
+        return path.exists() and path.stat().st_size >= entry["bytes"]
+
+    def _remove(self, path: Path) -> None:
+        if path.is_dir():
+            for part in path.glob("*.parquet"):
+                part.unlink()
+        elif path.exists():
+            path.unlink()
+
+    def _read_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable export state %s: %s", self.state_path, exc)
+            return {}
+
+    def _record(self, name: str, entry: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            if entry is None:
+                self._state.pop(name, None)
+            else:
+                self._state[name] = entry
+            temporary = self.state_path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(self._state, indent=2, sort_keys=True))
+            os.replace(temporary, self.state_path)
@@ -0,0 +1,29 @@
+"""Binance kline interval helpers."""
+from __future__ import annotations
+
+_UNIT_MILLISECONDS = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+    # Calendar months vary in length; 30 days is used where a fixed step is needed.
+    "M": 2_592_000_000,
+}
+
+
+def interval_to_milliseconds(interval: str) -> int:
+    """Length of a kline interval such as ``"1m"``, ``"4h"`` or ``"1d"`` in milliseconds."""
+
+    unit = interval[-1:]
+    count = interval[:-1]
+    if unit not in _UNIT_MILLISECONDS or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"Unsupported candles interval: {interval!r}")
+    return int(count) * _UNIT_MILLISECONDS[unit]
+
+
+def next_boundary(now_ms: int, interval: str) -> int:
+    """First interval boundary strictly after ``now_ms`` (boundaries are aligned to the epoch)."""
+
+    step = interval_to_milliseconds(interval)
+    return (now_ms // step + 1) * step
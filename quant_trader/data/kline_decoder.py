@@ -0,0 +1,70 @@
+"""Decoding of ``/api/v3/klines`` payloads into typed NumPy columns."""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # pragma: no cover - exercised only when the optional dependency is installed
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Field name -> (position in a REST kline row, dtype). The trailing "ignore" field is dropped.
+KLINE_FIELDS: Dict[str, Tuple[int, np.dtype]] = {
+    "open_time": (0, np.dtype(np.int64)),
+    "open": (1, np.dtype(np.float64)),
+    "high": (2, np.dtype(np.float64)),
+    "low": (3, np.dtype(np.float64)),
+    "close": (4, np.dtype(np.float64)),
+    "volume": (5, np.dtype(np.float64)),
+    "close_time": (6, np.dtype(np.int64)),
+    "quote_asset_volume": (7, np.dtype(np.float64)),
+    "trades": (8, np.dtype(np.int64)),
+    "taker_buy_base": (9, np.dtype(np.float64)),
+    "taker_buy_quote": (10, np.dtype(np.float64)),
+}
+
+_TIME_FIELDS = ("open_time", "close_time")
+
+
+def load_json(payload: bytes | str) -> Any:
+    """Parse a JSON document, with ``orjson`` when it is installed."""
+
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def decode_klines(*pages: Sequence[Sequence[Any]]) -> Dict[str, np.ndarray]:
+    """Decode one or more kline pages into contiguous typed columns.
+
+    Each column is allocated once for the rows of all ``pages``, which are
+    copied in the order given, and filled one field at a time, so no
+    intermediate object-dtype frame is built. Prices may be strings, as
+    Binance sends them, or numbers.
+    """
+
+    total = sum(len(page) for page in pages)
+    columns = {name: np.empty(total, dtype=dtype) for name, (_, dtype) in KLINE_FIELDS.items()}
+    offset = 0
+    for page in pages:
+        count = len(page)
+        for name, (position, _) in KLINE_FIELDS.items():
+            columns[name][offset : offset + count] = [row[position] for row in page]
+        offset += count
+    return columns
+
+
+def klines_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Wrap decoded columns in a frame with UTC ``open_time``/``close_time`` timestamps."""
+
+    data = {}
+    for name, values in columns.items():
+        if name in _TIME_FIELDS:
+            data[name] = pd.DatetimeIndex(values.view("datetime64[ms]")).tz_localize("UTC")
+        else:
+            data[name] = values
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,215 @@
+"""WebSocket kline stream delivering closed candles as they happen."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import aiohttp
+import pandas as pd
+
+from quant_trader.config import Settings
+from quant_trader.data.async_binance_client import AsyncBinanceClient
+from quant_trader.data.market_data_service import MAX_KLINES_PER_REQUEST, MarketDataService
+from quant_trader.strategies.base import Bar
+
+logger = logging.getLogger(__name__)
+
+
+def _kline_row(kline: Dict) -> list:
+    """Convert a stream ``k`` payload to the REST ``/api/v3/klines`` row layout."""
+
+    return [
+        kline["t"],
+        kline["o"],
+        kline["h"],
+        kline["l"],
+        kline["c"],
+        kline["v"],
+        kline["T"],
+        kline.get("q", "0"),
+        kline.get("n", 0),
+        kline.get("V", "0"),
+        kline.get("Q", "0"),
+        kline.get("B", "0"),
+    ]
+
+
+def _bar(symbol: str, row: list) -> Bar:
+    return Bar(
+        symbol=symbol,
+        open_time=pd.Timestamp(int(row[0]), unit="ms"),
+        open=float(row[1]),
+        high=float(row[2]),
+        low=float(row[3]),
+        close=float(row[4]),
+        volume=float(row[5]),
+    )
+
+
+class KlineStream:
+    """Subscribes to the combined kline streams of ``symbols`` and emits closed bars.
+
+    Every closed candle is passed to ``on_bar`` (``open_time`` is a naive UTC
+    timestamp, like candles loaded from the store) and buffered for a batched
+    write to ``market_data``. After connecting, and again after every
+    reconnect, candles missed since the last delivered bar are fetched with
+    ``get_klines`` and delivered first, so consumers see each bar exactly once
+    and in order.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        on_bar: Callable[[Bar], None],
+        market_data: Optional[MarketDataService] = None,
+        rest_client: Optional[AsyncBinanceClient] = None,
+        symbols: Optional[Iterable[str]] = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.settings = settings
+        self.interval = settings.candles_interval
+        self.symbols = [symbol.upper() for symbol in (symbols or settings.symbols)]
+        self.on_bar = on_bar
+        self.market_data = market_data
+        self.rest_client = rest_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.reconnect_delay = reconnect_delay
+        self.bars_received = 0
+        self.bars_gap_filled = 0
+        self.reconnects = 0
+        self._last_open_ms: Dict[str, int] = {}
+        self._pending: Dict[str, List[list]] = {}
+        self._pending_rows = 0
+        self._flush_lock = asyncio.Lock()
+        # The event loop only holds weak references to tasks; keep batch flushes alive until they finish.
+        self._flushes: Set[asyncio.Future] = set()
+
+    @property
+    def url(self) -> str:
+        streams = "/".join(f"{symbol.lower()}@kline_{self.interval}" for symbol in self.symbols)
+        return f"{self.settings.active_stream_url}/stream?streams={streams}"
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Consume the stream until ``stop`` is set, reconnecting on failures."""
+
+        stop = stop or asyncio.Event()
+        self._seed_last_open_times()
+        flusher = asyncio.create_task(self._flush_periodically(stop))
+        try:
+            async with aiohttp.ClientSession() as session:
+                while not stop.is_set():
+                    try:
+                        await self._consume(session, stop)
+                    except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as exc:
+                        logger.warning("Kline stream error: %s", exc)
+                    if stop.is_set():
+                        break
+                    self.reconnects += 1
+                    logger.info("Reconnecting kline stream in %.1fs", self.reconnect_delay)
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=self.reconnect_delay)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            flusher.cancel()
+            await self._drain()
+
+    def _seed_last_open_times(self) -> None:
+        if self.market_data is None:
+            return
+        for symbol in self.symbols:
+            if symbol not in self._last_open_ms:
+                last = self.market_data.last_open_time(symbol)
+                if last is not None:
+                    self._last_open_ms[symbol] = int(last.value // 1_000_000)
+
+    async def _consume(self, session: aiohttp.ClientSession, stop: asyncio.Event) -> None:
+        async with session.ws_connect(self.url, heartbeat=30) as ws:
+            closer = asyncio.create_task(self._close_on_stop(ws, stop))
+            try:
+                await self._gap_fill()
+                async for message in ws:
+                    if message.type == aiohttp.WSMsgType.TEXT:
+                        self._handle(json.loads(message.data))
+                    elif message.type == aiohttp.WSMsgType.ERROR:
+                        raise ConnectionError(f"websocket error: {ws.exception()}")
+            finally:
+                closer.cancel()
+
+    @staticmethod
+    async def _close_on_stop(ws: aiohttp.ClientWebSocketResponse, stop: asyncio.Event) -> None:
+        await stop.wait()
+        await ws.close()
+
+    def _handle(self, message: Dict) -> None:
+        data = message.get("data", message)
+        kline = data.get("k")
+        if not kline or not kline.get("x"):
+            return
+        self._deliver(data.get("s", kline.get("s", "")).upper(), _kline_row(kline))
+
+    def _deliver(self, symbol: str, row: list) -> None:
+        open_ms = int(row[0])
+        if open_ms <= self._last_open_ms.get(symbol, -1):
+            return
+        self._last_open_ms[symbol] = open_ms
+        self.bars_received += 1
+        if self.market_data is not None:
+            self._pending.setdefault(symbol, []).append(row)
+            self._pending_rows += 1
+            if self._pending_rows >= self.batch_size:
+                task = asyncio.ensure_future(self.flush())
+                self._flushes.add(task)
+                task.add_done_callback(self._flush_done)
+        self.on_bar(_bar(symbol, row))
+
+    async def _gap_fill(self) -> None:
+        if self.rest_client is None:
+            return
+        now_ms = int(time.time() * 1000)
+        for symbol in self.symbols:
+            while symbol in self._last_open_ms:
+                start = self._last_open_ms[symbol] + 1
+                rows = await self.rest_client.get_klines(
+                    symbol, self.interval, start_time=start, limit=MAX_KLINES_PER_REQUEST
+                )
+                closed = [row for row in rows if int(row[6]) < now_ms]
+                for row in closed:
+                    self._deliver(symbol, row)
+                self.bars_gap_filled += len(closed)
+                if len(rows) < MAX_KLINES_PER_REQUEST or len(closed) < len(rows):
+                    break
+
+    async def _flush_periodically(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _flush_done(self, task: asyncio.Future) -> None:
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to store streamed candles", exc_info=task.exception())
+
+    async def _drain(self) -> None:
+        """Wait for batch flushes still in flight, then write what is left."""
+
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered candles to the store in one batch per symbol."""
+
+        if self.market_data is None:
+            return
+        async with self._flush_lock:
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+            for symbol, rows in pending.items():
+                candles = self.market_data._klines_to_dataframe(rows)
+                await asyncio.to_thread(self.market_data._persist_candles, symbol, candles)
@@ -1,40 +1,159 @@
 """Market data collection and persistence utilities."""
 from __future__ import annotations
 
+import importlib
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import Column, DateTime, Float, Integer, MetaData, Table, create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    event,
+    exists,
+    func,
+    inspect,
+    literal,
+    select,
+)
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.exc import SQLAlchemyError
 
 from quant_trader.config import Settings
-from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.candle_cache import CandleCache
+from quant_trader.data.columnar_store import ColumnarCandleStore, to_epoch_ms
+from quant_trader.data.intervals import interval_to_milliseconds
+from quant_trader.data.kline_decoder import decode_klines, klines_frame
+from quant_trader.data.rate_limit import RequestBudget
+from quant_trader.data.rollups import bucket_start, check_rollup, iter_rollups, rollup_candles
+from quant_trader.utils.metrics import metrics
+
+if TYPE_CHECKING:  # pragma: no cover - the HTTP clients are only passed in
+    from quant_trader.data.async_binance_client import AsyncBinanceClient
+    from quant_trader.data.binance_client import BinanceClient
 
 logger = logging.getLogger(__name__)
 
 metadata = MetaData()
 
 
-def _create_candles_table(symbol: str) -> Table:
-    name = f"candles_{symbol.lower()}"
+# Largest page Binance serves from /api/v3/klines.
+MAX_KLINES_PER_REQUEST = 1000
+
+# Rows sent per executemany() call when writing candles.
+UPSERT_BATCH_SIZE = 1000
+
+# Rows per chunk when streaming candles out of a store.
+STREAM_CHUNK_ROWS = 50_000
+
+# Backfilled pages are decoded and persisted together once this many rows are pending.
+BACKFILL_FLUSH_ROWS = 10_000
+
+CANDLE_COLUMNS = ["open_time", "open", "high", "low", "close", "volume", "close_time"]
+
+PRICE_COLUMNS = CANDLE_COLUMNS[1:]
+
+# Dialects with INSERT ... ON CONFLICT, and the module providing their insert(); imported on first write.
+_UPSERT_DIALECTS = {"sqlite": "sqlalchemy.dialects.sqlite", "postgresql": "sqlalchemy.dialects.postgresql"}
+
+# Prefix of the per-symbol tables used before candles shared one table.
+LEGACY_TABLE_PREFIX = "candles_"
+
+CANDLE_STORES = ("sql", "columnar")
+
+
+def _to_milliseconds(value: datetime | pd.Timestamp | str | int) -> int:
+    if isinstance(value, int):
+        return value
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.value // 1_000_000)
+
+
+def _naive_utc(milliseconds: int) -> datetime:
+    return pd.Timestamp(milliseconds, unit="ms").to_pydatetime()
+
+
+def _series(symbol: str, interval: str) -> tuple:
+    return candle_table.c.symbol == symbol.upper(), candle_table.c.interval == interval
+
+
+def _time_range(start_ms: Optional[int], end_ms: Optional[int]) -> list:
+    conditions = []
+    if start_ms is not None:
+        conditions.append(candle_table.c.open_time >= _naive_utc(start_ms))
+    if end_ms is not None:
+        conditions.append(candle_table.c.open_time <= _naive_utc(end_ms))
+    return conditions
+
+
+# Every symbol and interval in one table. The primary key doubles as the
+# read index; SQLite stores the rows inside it (WITHOUT ROWID) and PostgreSQL
+# gets an index that includes the prices, so range reads never touch the heap.
+# That index is plain DDL so that importing this module does not load the
+# PostgreSQL dialect.
+candle_table = Table(
+    "candles",
+    metadata,
+    Column("symbol", String(32), primary_key=True),
+    Column("interval", String(8), primary_key=True),
+    Column("open_time", DateTime, primary_key=True),
+    Column("open", Float, nullable=False),
+    Column("high", Float, nullable=False),
+    Column("low", Float, nullable=False),
+    Column("close", Float, nullable=False),
+    Column("volume", Float, nullable=False),
+    Column("close_time", DateTime, nullable=False),
+    sqlite_with_rowid=False,
+)
+event.listen(
+    candle_table,
+    "after_create",
+    DDL(
+        'CREATE INDEX IF NOT EXISTS ix_candles_covering ON candles (symbol, "interval", open_time) '
+        f"INCLUDE ({', '.join(PRICE_COLUMNS)})"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+def _legacy_table(symbol: str) -> Table:
+    """Definition of a pre-unification per-symbol table, for :meth:`MarketDataService.migrate_candles`."""
+
     return Table(
-        name,
-        metadata,
+        f"{LEGACY_TABLE_PREFIX}{symbol.lower()}",
+        MetaData(),
         Column("id", Integer, primary_key=True, autoincrement=True),
-        Column("open_time", DateTime, index=True, nullable=False),
-        Column("open", Float, nullable=False),
-        Column("high", Float, nullable=False),
-        Column("low", Float, nullable=False),
-        Column("close", Float, nullable=False),
-        Column("volume", Float, nullable=False),
+        Column("open_time", DateTime, nullable=False),
+        *(Column(name, Float, nullable=False) for name in ("open", "high", "low", "close", "volume")),
         Column("close_time", DateTime, nullable=False),
     )
 
 
+def _candle_records(symbol: str, interval: str, candles: pd.DataFrame) -> List[Dict[str, Any]]:
+    frame = candles[CANDLE_COLUMNS].copy()
+    for column in ("open_time", "close_time"):
+        values = pd.to_datetime(frame[column], utc=True)
+        frame[column] = values.dt.tz_localize(None).astype(object)
+    frame.insert(0, "interval", interval)
+    frame.insert(0, "symbol", symbol.upper())
+    return frame.to_dict("records")
+
+
 @dataclass
 class MarketDataService:
     """Service responsible for fetching and storing Binance candles."""
@@ -45,58 +164,580 @@ class MarketDataService:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.engine = create_engine(settings.database_url)
-        for symbol in self.settings.symbols:
-            table = _create_candles_table(symbol)
-            metadata.create_all(self.engine, tables=[table])
+        self._write_lock = threading.Lock()
+        if settings.candle_store not in CANDLE_STORES:
+            raise ValueError(f"candle_store must be one of {CANDLE_STORES}, got {settings.candle_store!r}")
+        self.columnar: Optional[ColumnarCandleStore] = None
+        if settings.candle_store == "columnar":
+            self.columnar = ColumnarCandleStore(settings.cache_dir / "candles")
+        self.cache: Optional[CandleCache] = None
+        if settings.candle_cache_size > 0:
+            self.cache = CandleCache(settings.candle_cache_size, settings.candle_cache_symbols)
+        for interval in settings.rollup_intervals:
+            check_rollup(settings.candles_interval, interval)
+        metadata.create_all(self.engine, tables=[candle_table])
+        legacy = [name for name in inspect(self.engine).get_table_names() if name.startswith(LEGACY_TABLE_PREFIX)]
+        if legacy:
+            logger.warning("Found %s per-symbol candle tables; run the migrate command to move them", len(legacy))
 
     def fetch_latest_candles(self, client: BinanceClient, limit: int = 500) -> None:
         for symbol in self.settings.symbols:
             try:
-                logger.info("Fetching %s candles for %s", limit, symbol)
-                klines = client.get_klines(symbol, self.settings.candles_interval, limit=limit)
+                self.fetch_candles(client, symbol, limit)
+            except Exception as exc:  # pragma: no cover - logging path
+                logger.exception("Failed to fetch candles for %s: %s", symbol, exc)
+
+    def fetch_candles(self, client: BinanceClient, symbol: str, limit: int = 500) -> int:
+        """Fetch and persist the latest ``limit`` candles of one symbol; returns the row count."""
+
+        logger.info("Fetching %s candles for %s", limit, symbol)
+        with metrics.timer("stage_seconds", stage="get_klines", symbol=symbol):
+            klines = client.get_klines(symbol, self.settings.candles_interval, limit=limit)
+        candles = self._klines_to_dataframe(klines)
+        self._persist_candles(symbol, candles)
+        return len(candles)
+
+    async def afetch_latest_candles(
+        self,
+        client: AsyncBinanceClient,
+        limit: int = 500,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> Dict[str, int]:
+        """Fetch the latest candles for all symbols concurrently on one event loop.
+
+        Requests are issued together and bounded by the client's connection
+        pool and request scheduler; each response is persisted on a worker
+        thread as soon as it arrives. Returns the rows stored per symbol.
+        """
+
+        import asyncio
+
+        async def fetch(symbol: str) -> int:
+            try:
+                with metrics.timer("stage_seconds", stage="get_klines", symbol=symbol):
+                    klines = await client.get_klines(symbol, self.settings.candles_interval, limit=limit)
                 candles = self._klines_to_dataframe(klines)
-                self._persist_candles(symbol, candles)
+                await asyncio.to_thread(self._persist_candles, symbol, candles)
+                return len(candles)
             except Exception as exc:  # pragma: no cover - logging path
                 logger.exception("Failed to fetch candles for %s: %s", symbol, exc)
+                return 0
 
-    def _klines_to_dataframe(self, klines: Iterable[list]) -> pd.DataFrame:
-        frame = pd.DataFrame(
-            klines,
-            columns=[
-                "open_time",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "close_time",
-                "quote_asset_volume",
-                "trades",
-                "taker_buy_base",
-                "taker_buy_quote",
-                "ignore",
-            ],
-        )
-        frame["open_time"] = pd.to_datetime(frame["open_time"], unit="ms", utc=True)
-        frame["close_time"] = pd.to_datetime(frame["close_time"], unit="ms", utc=True)
-        numeric_cols = ["open", "high", "low", "close", "volume"]
-        frame[numeric_cols] = frame[numeric_cols].astype(float)
-        return frame[["open_time", "open", "high", "low", "close", "volume", "close_time"]]
-
-    def _persist_candles(self, symbol: str, candles: pd.DataFrame) -> None:
-        table = _create_candles_table(symbol)
-        with self.engine.begin() as connection:
+        targets = [symbol.upper() for symbol in (symbols or self.settings.symbols)]
+        counts = await asyncio.gather(*(fetch(symbol) for symbol in targets))
+        return dict(zip(targets, counts))
+
+    def backfill(
+        self,
+        client: BinanceClient,
+        *,
+        start: datetime | pd.Timestamp | str | int,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+        symbols: Optional[Iterable[str]] = None,
+        max_workers: int = 4,
+        budget: Optional[RequestBudget] = None,
+        page_limit: int = MAX_KLINES_PER_REQUEST,
+    ) -> Dict[str, int]:
+        """Page through ``[start, end]`` for each symbol and persist every closed candle.
+
+        Only the parts of the range not stored yet are requested: the span
+        before the earliest stored candle, any gaps, and the span after the
+        newest one. An interrupted backfill can simply be rerun, and one run
+        after ``collect`` still fills the history before the collected bars.
+        Symbols are fetched concurrently on ``max_workers`` threads and every
+        page request first takes a token from ``budget``. Consecutive pages are
+        decoded and written together in batches of about
+        :data:`BACKFILL_FLUSH_ROWS` rows. Returns the number of rows stored per
+        symbol.
+        """
+
+        start_ms = _to_milliseconds(start)
+        end_ms = _to_milliseconds(end) if end is not None else int(time.time() * 1000)
+        targets = [symbol.upper() for symbol in (symbols or self.settings.symbols)]
+
+        def run(symbol: str) -> int:
+            return self._backfill_symbol(client, symbol, start_ms, end_ms, budget, page_limit)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets) or 1))) as pool:
+            counts = dict(zip(targets, pool.map(run, targets)))
+        logger.info("Backfill finished: %s", counts)
+        return counts
+
+    def _backfill_symbol(
+        self,
+        client: BinanceClient,
+        symbol: str,
+        start_ms: int,
+        end_ms: int,
+        budget: Optional[RequestBudget],
+        page_limit: int,
+    ) -> int:
+        ranges = self._missing_ranges(symbol, start_ms, end_ms)
+        now_ms = int(time.time() * 1000)
+        stored = 0
+        pending: List[List[list]] = []
+
+        def flush() -> None:
+            if pending:
+                self._persist_candles(symbol, self._klines_to_dataframe(*pending))
+                pending.clear()
+
+        try:
+            for cursor, range_end in ranges:
+                while cursor <= range_end:
+                    if budget is not None:
+                        budget.acquire()
+                    klines = client.get_klines(
+                        symbol,
+                        self.settings.candles_interval,
+                        start_time=cursor,
+                        end_time=range_end,
+                        limit=page_limit,
+                    )
+                    if not klines:
+                        break
+                    # Skip the candle that is still forming; it is picked up on the next run.
+                    closed = [kline for kline in klines if int(kline[6]) < now_ms]
+                    if closed:
+                        pending.append(closed)
+                        stored += len(closed)
+                        if sum(len(page) for page in pending) >= BACKFILL_FLUSH_ROWS:
+                            flush()
+                    cursor = int(klines[-1][0]) + 1
+                    if len(klines) < page_limit or len(closed) < len(klines):
+                        break
+        finally:
+            # Keep what was fetched so a rerun resumes after it.
+            flush()
+        logger.info("Backfilled %s candles for %s", stored, symbol)
+        return stored
+
+    def _missing_ranges(self, symbol: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """Inclusive epoch-ms sub-ranges of ``[start_ms, end_ms]`` that may hold candles not stored yet."""
+
+        step = interval_to_milliseconds(self.settings.candles_interval)
+        ranges: List[Tuple[int, int]] = []
+        cursor = start_ms
+        for first, last in self._stored_runs(symbol, start_ms, end_ms, step):
+            if first - step >= cursor:
+                ranges.append((cursor, first - 1))
+            cursor = last + 1
+        ranges.append((cursor, end_ms))
+        return ranges
+
+    def _stored_runs(self, symbol: str, start_ms: int, end_ms: int, step: int) -> List[Tuple[int, int]]:
+        """First and last ``open_time`` of each run of consecutive stored candles in the range."""
+
+        interval = self.settings.candles_interval
+        if self.columnar is not None:
+            open_times = to_epoch_ms(self.columnar.read(symbol, interval, start=start_ms, end=end_ms)["open_time"])
+        else:
+            conditions = (*_series(symbol, interval), *_time_range(start_ms, end_ms))
+            column = candle_table.c.open_time
+            with self.engine.connect() as connection:
+                first, last, count = connection.execute(
+                    select(func.min(column), func.max(column), func.count()).where(*conditions)
+                ).one()
+                if not count:
+                    return []
+                first_ms, last_ms = _to_milliseconds(first), _to_milliseconds(last)
+                if (last_ms - first_ms) // step + 1 == count:
+                    return [(first_ms, last_ms)]
+                # Gaps: read the open times alone to find where the runs break.
+                stamps = connection.execute(select(column).where(*conditions).order_by(column)).scalars().all()
+            open_times = to_epoch_ms(pd.Series(stamps))
+        if not len(open_times):
+            return []
+        # A step and a half tolerates calendar months, which vary around their nominal 30 days.
+        breaks = np.flatnonzero(np.diff(open_times) > step + step // 2)
+        firsts = np.r_[open_times[:1], open_times[breaks + 1]]
+        lasts = np.r_[open_times[breaks], open_times[-1:]]
+        return list(zip(firsts.tolist(), lasts.tolist()))
+
+    def last_open_time(self, symbol: str, interval: Optional[str] = None) -> Optional[pd.Timestamp]:
+        """Return the newest stored ``open_time`` for ``symbol`` (UTC), if any."""
+
+        interval = interval or self.settings.candles_interval
+        if self.columnar is not None:
+            last_ms = self.columnar.last_open_time(symbol, interval)
+            return None if last_ms is None else pd.Timestamp(last_ms, unit="ms", tz="UTC")
+        query = select(func.max(candle_table.c.open_time)).where(*_series(symbol, interval))
+        with self.engine.connect() as connection:
+            value = connection.execute(query).scalar()
+        if value is None:
+            return None
+        timestamp = pd.Timestamp(value)
+        return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+    def _klines_to_dataframe(self, *pages: Sequence[list]) -> pd.DataFrame:
+        """Decode one or more ``/api/v3/klines`` pages into a single frame.
+
+        Columns are :data:`CANDLE_COLUMNS` followed by the quote volume, trade
+        count and taker-buy volumes; stores persist only the candle columns.
+        """
+
+        with metrics.timer("stage_seconds", stage="klines_to_dataframe"):
+            return klines_frame(decode_klines(*pages))
+
+    def _persist_candles(self, symbol: str, candles: pd.DataFrame, interval: Optional[str] = None) -> None:
+        """Store ``candles`` for ``symbol`` without creating duplicate ``open_time`` rows.
+
+        ``interval`` defaults to the configured ``candles_interval``. With the
+        columnar backend candles are appended to the per-symbol column files
+        instead. SQL writes are bulk upserts on ``(symbol, interval,
+        open_time)``, so re-fetched candles overwrite their earlier (possibly
+        still forming) version.
+        """
+
+        if candles.empty:
+            return
+        interval = interval or self.settings.candles_interval
+        with metrics.timer("stage_seconds", stage="persist_candles", symbol=symbol):
+            self._store(symbol, interval, candles)
+            if self.cache is not None and interval == self.settings.candles_interval:
+                self.cache.update(symbol, candles)
+        if interval == self.settings.candles_interval and self.settings.rollup_intervals:
+            self._update_rollups(symbol, candles)
+
+    def _store(self, symbol: str, interval: str, candles: pd.DataFrame) -> None:
+        if candles.empty:
+            return
+        if self.columnar is not None:
+            self.columnar.append(symbol, interval, candles)
+        else:
+            self._persist_sql(symbol, interval, candles)
+
+    def _update_rollups(self, symbol: str, candles: pd.DataFrame) -> None:
+        """Re-aggregate the ``ROLLUP_INTERVALS`` candles whose buckets ``candles`` touched.
+
+        Only those buckets are read back from the base series, so the cost
+        follows the size of the write rather than the length of the history.
+        """
+
+        rollups = self.settings.rollup_intervals
+        times = to_epoch_ms(candles["open_time"])
+        first, last = int(times.min()), int(times.max())
+        lo = min(int(bucket_start(first, interval)) for interval in rollups)
+        hi = max(int(bucket_start(last, interval)) + interval_to_milliseconds(interval) - 1 for interval in rollups)
+        with metrics.timer("stage_seconds", stage="update_rollups", symbol=symbol):
+            base = self._load_candles(symbol, None, self.settings.candles_interval, lo, hi).iloc[::-1]
+            base_times = to_epoch_ms(base["open_time"])
+            for interval in rollups:
+                touched = base[base_times >= bucket_start(first, interval)]
+                self._store(symbol, interval, rollup_candles(touched, interval))
+
+    def rebuild_rollups(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Aggregate the whole stored base history into every ``ROLLUP_INTERVALS`` series.
+
+        Needed once after adding an interval to ``ROLLUP_INTERVALS``; new base
+        candles keep the rollups current from then on. Returns the derived
+        candles written per symbol.
+        """
+
+        counts: Dict[str, int] = {}
+        for symbol in (symbol.upper() for symbol in (symbols or self.settings.symbols)):
+            counts[symbol] = 0
+            for interval in self.settings.rollup_intervals:
+                for chunk in iter_rollups(self.iter_candles(symbol), interval):
+                    self._store(symbol, interval, chunk)
+                    counts[symbol] += len(chunk)
+        logger.info("Rebuilt %s rollups: %s", ",".join(self.settings.rollup_intervals), counts)
+        return counts
+
+    def _persist_sql(self, symbol: str, interval: str, candles: pd.DataFrame) -> None:
+        records = _candle_records(symbol, interval, candles.drop_duplicates("open_time", keep="last"))
+        with self._write_lock, self.engine.begin() as connection:
             try:
-                candles.to_sql(table.name, connection, if_exists="append", index=False)
+                if connection.dialect.name in _UPSERT_DIALECTS:
+                    self._upsert(connection, records)
+                else:
+                    self._insert_missing(connection, symbol, interval, records)
             except SQLAlchemyError as exc:
                 logger.error("Failed to persist candles for %s: %s", symbol, exc)
                 raise
 
-    def load_candles(self, symbol: str, limit: int = 1000) -> pd.DataFrame:
-        table_name = f"candles_{symbol.lower()}"
-        query = f"SELECT * FROM {table_name} ORDER BY open_time DESC LIMIT :limit"
+    def _upsert(self, connection: Connection, records: List[Dict[str, Any]]) -> None:
+        insert = importlib.import_module(_UPSERT_DIALECTS[connection.dialect.name]).insert(candle_table)
+        statement = insert.on_conflict_do_update(
+            index_elements=[candle_table.c.symbol, candle_table.c.interval, candle_table.c.open_time],
+            set_={column: insert.excluded[column] for column in PRICE_COLUMNS},
+        )
+        for offset in range(0, len(records), UPSERT_BATCH_SIZE):
+            connection.execute(statement, records[offset : offset + UPSERT_BATCH_SIZE])
+
+    def _insert_missing(
+        self, connection: Connection, symbol: str, interval: str, records: List[Dict[str, Any]]
+    ) -> None:
+        first = min(record["open_time"] for record in records)
+        last = max(record["open_time"] for record in records)
+        query = select(candle_table.c.open_time).where(
+            *_series(symbol, interval), candle_table.c.open_time.between(first, last)
+        )
+        stored = connection.execute(query).scalars()
+        existing = {pd.Timestamp(value) for value in stored}
+        fresh = [record for record in records if pd.Timestamp(record["open_time"]) not in existing]
+        for offset in range(0, len(fresh), UPSERT_BATCH_SIZE):
+            connection.execute(candle_table.insert(), fresh[offset : offset + UPSERT_BATCH_SIZE])
+
+    def migrate_candles(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Move candles out of the old per-symbol tables into the shared ``candles`` table.
+
+        The old tables had no interval column; their rows are filed under the
+        configured ``candles_interval``. For duplicated ``open_time`` values
+        the most recently inserted row wins, and rows already present in the
+        shared table are kept. Each old table is dropped once copied, so the
+        migration is safe to rerun. Returns the rows moved per symbol.
+        """
+
+        interval = self.settings.candles_interval
+        tables = {name for name in inspect(self.engine).get_table_names() if name.startswith(LEGACY_TABLE_PREFIX)}
+        if symbols is None:
+            targets = sorted(name[len(LEGACY_TABLE_PREFIX) :].upper() for name in tables)
+        else:
+            targets = [symbol.upper() for symbol in symbols]
+        moved: Dict[str, int] = {}
+        for symbol in targets:
+            legacy = _legacy_table(symbol)
+            if legacy.name not in tables:
+                moved[symbol] = 0
+                continue
+            latest = select(func.max(legacy.c.id)).group_by(legacy.c.open_time)
+            stored = exists().where(*_series(symbol, interval), candle_table.c.open_time == legacy.c.open_time)
+            rows = select(
+                literal(symbol, String), literal(interval, String), *(legacy.c[name] for name in CANDLE_COLUMNS)
+            ).where(legacy.c.id.in_(latest), ~stored)
+            with self._write_lock, self.engine.begin() as connection:
+                result = connection.execute(
+                    candle_table.insert().from_select(["symbol", "interval", *CANDLE_COLUMNS], rows)
+                )
+                legacy.drop(connection)
+            moved[symbol] = result.rowcount or 0
+            logger.info("Migrated %s: moved %s candles", legacy.name, moved[symbol])
+        return moved
+
+    def load_candles(
+        self,
+        symbol: str,
+        limit: Optional[int] = 1000,
+        *,
+        interval: Optional[str] = None,
+        start: Optional[datetime | pd.Timestamp | str | int] = None,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+    ) -> pd.DataFrame:
+        """Return up to ``limit`` of the newest candles, newest first.
+
+        ``interval`` defaults to the configured ``candles_interval``.
+        ``start``/``end`` restrict the result to an inclusive ``open_time``
+        range; a ``limit`` of ``None`` returns all of it. With the columnar
+        backend the columns are read-only views onto memory-mapped files. Use
+        :meth:`latest_candles` on hot paths.
+        """
+
+        with metrics.timer("stage_seconds", stage="load_candles", symbol=symbol):
+            return self._load_candles(symbol, limit, interval or self.settings.candles_interval, start, end)
+
+    def _load_candles(
+        self,
+        symbol: str,
+        limit: Optional[int],
+        interval: str,
+        start: Optional[datetime | pd.Timestamp | str | int],
+        end: Optional[datetime | pd.Timestamp | str | int],
+    ) -> pd.DataFrame:
+        start_ms = _to_milliseconds(start) if start is not None else None
+        end_ms = _to_milliseconds(end) if end is not None else None
+        if self.columnar is not None:
+            return self.columnar.read(symbol, interval, start=start_ms, end=end_ms, limit=limit, descending=True)
+
+        query = (
+            select(*(candle_table.c[name] for name in CANDLE_COLUMNS))
+            .where(*_series(symbol, interval), *_time_range(start_ms, end_ms))
+            .order_by(candle_table.c.open_time.desc())
+            .limit(limit)
+        )
+        with self.engine.connect() as connection:
+            return pd.read_sql(query, connection)
+
+    def load_candles_many(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        *,
+        interval: Optional[str] = None,
+        start: Optional[datetime | pd.Timestamp | str | int] = None,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Candles of several symbols, oldest first, read from the SQL store in one query.
+
+        ``limit`` keeps the newest ``limit`` candles of each symbol (ranked
+        with a window function). Symbols without candles map to empty frames.
+        """
+
+        targets = [symbol.upper() for symbol in (symbols or self.settings.symbols)]
+        interval = interval or self.settings.candles_interval
+        start_ms = _to_milliseconds(start) if start is not None else None
+        end_ms = _to_milliseconds(end) if end is not None else None
+        if self.columnar is not None:
+            return {
+                symbol: self.columnar.read(symbol, interval, start=start_ms, end=end_ms, limit=limit)
+                for symbol in targets
+            }
+
+        names = ["symbol", *CANDLE_COLUMNS]
+        conditions = (
+            candle_table.c.symbol.in_(targets),
+            candle_table.c.interval == interval,
+            *_time_range(start_ms, end_ms),
+        )
+        if limit is None:
+            query = select(*(candle_table.c[name] for name in names)).where(*conditions)
+            source = candle_table.c
+        else:
+            rank = func.row_number().over(partition_by=candle_table.c.symbol, order_by=candle_table.c.open_time.desc())
+            ranked = select(*(candle_table.c[name] for name in names), rank.label("rank")).where(*conditions).subquery()
+            query = select(*(ranked.c[name] for name in names)).where(ranked.c.rank <= limit)
+            source = ranked.c
+        query = query.order_by(source.symbol, source.open_time)
+        with metrics.timer("stage_seconds", stage="load_candles", symbol="*"):
+            with self.engine.connect() as connection:
+                frame = pd.read_sql(query, connection)
+        groups = {symbol: group for symbol, group in frame.groupby("symbol", sort=False)}
+        empty = frame.iloc[:0].drop(columns="symbol")
+        return {
+            symbol: groups[symbol].drop(columns="symbol").reset_index(drop=True) if symbol in groups else empty
+            for symbol in targets
+        }
+
+    def iter_candles(
+        self,
+        symbol: str,
+        *,
+        interval: Optional[str] = None,
+        start: Optional[datetime | pd.Timestamp | str | int] = None,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+        chunk_size: int = STREAM_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield stored candles oldest first, ``chunk_size`` rows at a time.
+
+        The SQL store reads through a server-side cursor (``stream_results``
+        with ``yield_per``), so memory is bounded by one chunk however long
+        the range. Chunks hold :data:`CANDLE_COLUMNS` only.
+        """
+
+        interval = interval or self.settings.candles_interval
+        start_ms = _to_milliseconds(start) if start is not None else None
+        end_ms = _to_milliseconds(end) if end is not None else None
+        if self.columnar is not None:
+            yield from self.columnar.iter_chunks(symbol, interval, start=start_ms, end=end_ms, chunk_size=chunk_size)
+            return
+
+        query = (
+            select(*(candle_table.c[name] for name in CANDLE_COLUMNS))
+            .where(*_series(symbol, interval), *_time_range(start_ms, end_ms))
+            .order_by(candle_table.c.open_time)
+        )
         with self.engine.connect() as connection:
-            return pd.read_sql(query, connection, params={"limit": limit})
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for rows in result.partitions():
+                yield pd.DataFrame.from_records(rows, columns=CANDLE_COLUMNS)
+
+    def iter_rollup(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        start: Optional[datetime | pd.Timestamp | str | int] = None,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+        chunk_size: int = STREAM_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield ``interval`` candles oldest first, derived from the base candles.
+
+        Intervals listed in ``ROLLUP_INTERVALS`` (and the base interval itself)
+        are read as stored; any other multiple of the base interval is rolled
+        up from streamed base chunks on the fly. Either way nothing is fetched
+        from the exchange. ``start``/``end`` select candles by ``open_time``.
+        """
+
+        if self._materialized(interval):
+            yield from self.iter_candles(symbol, interval=interval, start=start, end=end, chunk_size=chunk_size)
+            return
+        check_rollup(self.settings.candles_interval, interval)
+        step = interval_to_milliseconds(interval)
+        base_start = base_end = None
+        if start is not None:
+            start_ms = _to_milliseconds(start)
+            first = int(bucket_start(start_ms, interval))
+            base_start = first if first == start_ms else first + step
+        if end is not None:
+            base_end = int(bucket_start(_to_milliseconds(end), interval)) + step - 1
+        chunks = self.iter_candles(symbol, start=base_start, end=base_end, chunk_size=chunk_size)
+        yield from iter_rollups(chunks, interval)
+
+    def rollup_window(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 500,
+        *,
+        end: Optional[datetime | pd.Timestamp | str | int] = None,
+    ) -> pd.DataFrame:
+        """The newest ``limit`` ``interval`` candles as they stood at ``end``, oldest first.
+
+        ``end`` (default: the newest base candle) is a base-candle open time.
+        The bucket containing it is aggregated from base candles up to ``end``
+        only, so a replay at ``end`` never sees later prices; older buckets are
+        read from the stored rollup, or derived when ``interval`` is not in
+        ``ROLLUP_INTERVALS``.
+        """
+
+        base = self.settings.candles_interval
+        check_rollup(base, interval)
+        if end is None:
+            last = self.last_open_time(symbol)
+            if last is None:
+                return rollup_candles(pd.DataFrame(), interval)
+            end_ms = last.value // 1_000_000
+        else:
+            end_ms = _to_milliseconds(end)
+        step = interval_to_milliseconds(interval)
+        current = int(bucket_start(end_ms, interval))
+        if interval in self.settings.rollup_intervals:
+            older = self._load_candles(symbol, limit - 1, interval, None, current - 1).iloc[::-1]
+        else:
+            rows = self._load_candles(symbol, None, base, current - (limit - 1) * step, current - 1)
+            older = rollup_candles(rows.iloc[::-1], interval)
+        partial = rollup_candles(self._load_candles(symbol, None, base, current, end_ms).iloc[::-1], interval)
+        frames = [frame for frame in (older, partial) if not frame.empty]
+        if not frames:
+            return partial
+        window = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+        return window.iloc[-limit:].reset_index(drop=True)
+
+    def _materialized(self, interval: str) -> bool:
+        return interval == self.settings.candles_interval or interval in self.settings.rollup_intervals
+
+    def latest_candles(self, symbol: str, limit: int = 500) -> pd.DataFrame:
+        """Return up to ``limit`` of the newest candles, oldest first.
+
+        Served from the in-memory candle cache when possible: the columns are
+        then views onto the cache's buffers, valid until the next write for
+        ``symbol``. On a miss the window is (re)seeded from the store.
+        """
+
+        if self.cache is None or limit > self.cache.capacity:
+            return self.load_candles(symbol, limit).iloc[::-1].reset_index(drop=True)
+        cached = self.cache.get(symbol, limit)
+        if cached is not None:
+            metrics.inc("candle_cache_requests_total", result="hit")
+            return cached
+        metrics.inc("candle_cache_requests_total", result="miss")
+        version = self.cache.version(symbol)
+        stored = self.load_candles(symbol, self.cache.capacity)
+        if self.cache.seed(symbol, stored, complete=len(stored) < self.cache.capacity, version=version):
+            cached = self.cache.get(symbol, limit)
+            if cached is not None:
+                return cached
+        return stored.iloc[:limit].iloc[::-1].reset_index(drop=True)
 
 
 def export_to_csv(
@@ -106,11 +747,17 @@ def export_to_csv(
     symbols: Iterable[str],
     limit: int = 1000,
 ) -> List[Path]:
+    """Write the newest ``limit`` candles of each symbol to one CSV file, oldest first.
+
+    For full or recurring exports use :class:`quant_trader.data.export.CandleExporter`,
+    which streams, compresses and only appends what is new.
+    """
+
     output_dir.mkdir(parents=True, exist_ok=True)
     exported: List[Path] = []
     for symbol in symbols:
         data = service.load_candles(symbol, limit)
         file_path = output_dir / f"{symbol.lower()}_{limit}.csv"
-        data.sort_values("open_time").to_csv(file_path, index=False)
+        data.iloc[::-1].to_csv(file_path, index=False)
         exported.append(file_path)
     return exported
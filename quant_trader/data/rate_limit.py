@@ -0,0 +1,226 @@
+"""Client-side request budgeting and Binance request scheduling."""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Request weight of REST endpoints that do not depend on parameters.
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    "/api/v3/ping": 1,
+    "/api/v3/time": 1,
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/klines": 2,
+    "/api/v3/account": 20,
+    "/api/v3/order": 1,
+}
+
+# Status codes worth retrying for any request: the server refused it before doing any work.
+THROTTLED_STATUSES = {418, 429}
+# Status codes worth retrying for idempotent requests only.
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+USED_WEIGHT_HEADER = "x-mbx-used-weight-1m"
+# Binance error code for a timestamp outside recvWindow.
+TIMESTAMP_OUTSIDE_WINDOW = -1021
+
+
+class RequestBudget:
+    """Thread-safe token bucket limiting how fast callers may issue requests.
+
+    ``rate`` tokens are added per second up to ``capacity``. :meth:`reserve`
+    takes tokens immediately (the balance may go negative) and returns how
+    long the caller must wait before sending, which works for both threads
+    and coroutines. :meth:`acquire` reserves and sleeps.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: float) -> "RequestBudget":
+        return cls(rate=requests / 60.0, capacity=max(1.0, requests / 60.0))
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` now and return the seconds to wait before using them."""
+
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, waiting if needed. Returns seconds waited."""
+
+        delay = self.reserve(tokens)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def limit_available(self, available: float) -> None:
+        """Lower the balance to ``available`` when the server reports less headroom."""
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, available)
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    throttled: int = 0
+    retried: int = 0
+    throttle_seconds: float = 0.0
+    used_weight: int = 0
+    time_syncs: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def request_weight(path: str) -> int:
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+class RequestScheduler:
+    """Schedules Binance REST calls within the account's request weight limit.
+
+    All callers sharing a client share one weight bucket. The bucket is
+    tightened from the ``X-MBX-USED-WEIGHT-1M`` header after every response,
+    throttled and transient failures are retried with full-jitter
+    exponential backoff, and a server clock offset is kept for signed calls.
+    The scheduler performs no I/O itself, so the blocking and asyncio clients
+    share it.
+    """
+
+    def __init__(
+        self,
+        weight_per_minute: int = 1200,
+        *,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.weight_per_minute = weight_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.budget = RequestBudget(weight_per_minute / 60.0, capacity=weight_per_minute, clock=clock, sleep=sleep)
+        self.stats = SchedulerStats()
+        self.time_offset_ms = 0
+        self.time_synced = False
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+
+    def reserve(self, path: str) -> float:
+        """Charge the request's weight and return the seconds to wait before sending it."""
+
+        delay = self.budget.reserve(request_weight(path))
+        with self._lock:
+            self.stats.requests += 1
+            if delay > 0:
+                self.stats.throttled += 1
+                self.stats.throttle_seconds += delay
+        return delay
+
+    def acquire(self, path: str) -> None:
+        delay = self.reserve(path)
+        if delay > 0:
+            logger.debug("Throttling %s for %.3fs", path, delay)
+            self.wait(delay)
+
+    def wait(self, seconds: float) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Tighten the bucket from the used-weight header of a response."""
+
+        used = _header(headers, USED_WEIGHT_HEADER)
+        if used is None:
+            return
+        try:
+            used_weight = int(used)
+        except ValueError:
+            return
+        with self._lock:
+            self.stats.used_weight = used_weight
+        self.budget.limit_available(self.weight_per_minute - used_weight)
+
+    def retry_delay(self, method: str, attempt: int, status: Optional[int], headers: Mapping[str, str]) -> Optional[float]:
+        """Return how long to wait before retry ``attempt`` (1-based), or ``None`` to give up.
+
+        ``status`` is ``None`` for connection errors and timeouts, which are
+        only retried for idempotent methods, like 5xx responses.
+        """
+
+        if attempt > self.max_retries:
+            return None
+        if status in THROTTLED_STATUSES:
+            retry_after = _header(headers, "retry-after")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self._backoff(attempt)
+            with self._lock:
+                self.stats.throttled += 1
+        elif (status is None or status in TRANSIENT_STATUSES) and method.upper() in IDEMPOTENT_METHODS:
+            delay = self._backoff(attempt)
+        else:
+            return None
+        with self._lock:
+            self.stats.retried += 1
+        return delay
+
+    def _backoff(self, attempt: int) -> float:
+        return self._jitter() * min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+
+    def timestamp(self) -> int:
+        """Current time in epoch milliseconds, corrected to the server clock."""
+
+        return int(time.time() * 1000) + self.time_offset_ms
+
+    def record_server_time(self, server_time_ms: int, sent_ms: float, received_ms: float) -> None:
+        """Update the clock offset from a ``/api/v3/time`` round-trip."""
+
+        with self._lock:
+            self.time_offset_ms = int(server_time_ms - (sent_ms + received_ms) / 2)
+            self.time_synced = True
+            self.stats.time_syncs += 1
+        logger.debug("Server time offset is %sms", self.time_offset_ms)
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        lowered = {key.lower(): val for key, val in headers.items()}
+        value = lowered.get(name)
+    return value
@@ -0,0 +1,151 @@
+"""Higher-timeframe candles derived from base-interval candles."""
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.data.columnar_store import to_epoch_ms
+from quant_trader.data.intervals import interval_to_milliseconds
+from quant_trader.strategies.base import Bar
+
+ROLLUP_COLUMNS = ["open_time", "open", "high", "low", "close", "volume", "close_time"]
+
+# Binance weeks open on Monday 00:00 UTC; the epoch fell on a Thursday.
+_WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def _alignment(interval: str) -> int:
+    return _WEEK_OFFSET_MS if interval.endswith("w") else 0
+
+
+def check_rollup(base_interval: str, interval: str) -> None:
+    """Raise ``ValueError`` unless ``interval`` can be built from whole ``base_interval`` candles."""
+
+    if interval.endswith("M"):
+        raise ValueError(f"Calendar-month candles cannot be derived from {base_interval} candles")
+    step = interval_to_milliseconds(interval)
+    base_step = interval_to_milliseconds(base_interval)
+    if step <= base_step or step % base_step:
+        raise ValueError(f"{interval} is not a whole multiple of the {base_interval} base interval")
+
+
+def bucket_start(open_time_ms, interval: str):
+    """Open time (epoch ms) of the ``interval`` candle containing ``open_time_ms``; works on arrays too."""
+
+    step = interval_to_milliseconds(interval)
+    offset = _alignment(interval)
+    return (open_time_ms - offset) // step * step + offset
+
+
+def rollup_candles(candles: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate base candles, oldest first, into ``interval`` candles.
+
+    Each bucket takes the first open, highest high, lowest low, last close and
+    summed volume of the candles inside it; ``close_time`` is the bucket's
+    last millisecond, as on the exchange. A bucket the candles only partly
+    cover comes out as a partial (still forming) candle.
+    """
+
+    if candles.empty:
+        return pd.DataFrame({name: pd.Series(dtype=_dtype(name)) for name in ROLLUP_COLUMNS})
+    times = to_epoch_ms(candles["open_time"])
+    order = None if np.all(times[1:] >= times[:-1]) else np.argsort(times, kind="stable")
+    if order is not None:
+        times = times[order]
+
+    def column(name: str) -> np.ndarray:
+        values = candles[name].to_numpy(dtype=float)
+        return values[order] if order is not None else values
+
+    buckets = bucket_start(times, interval)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    open_times = buckets[starts]
+    return pd.DataFrame(
+        {
+            "open_time": pd.to_datetime(open_times, unit="ms"),
+            "open": column("open")[starts],
+            "high": np.maximum.reduceat(column("high"), starts),
+            "low": np.minimum.reduceat(column("low"), starts),
+            "close": column("close")[ends],
+            "volume": np.add.reduceat(column("volume"), starts),
+            "close_time": pd.to_datetime(open_times + interval_to_milliseconds(interval) - 1, unit="ms"),
+        }
+    )
+
+
+def iter_rollups(chunks: Iterable[pd.DataFrame], interval: str) -> Iterator[pd.DataFrame]:
+    """Roll up consecutive, time-ordered chunks of base candles chunk by chunk.
+
+    The candles of the last bucket of each chunk are held back until the next
+    chunk shows whether the bucket continues, so no bucket is ever split.
+    """
+
+    carry: Optional[pd.DataFrame] = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if carry is not None:
+            chunk = pd.concat([carry, chunk[ROLLUP_COLUMNS]], ignore_index=True)
+        buckets = bucket_start(to_epoch_ms(chunk["open_time"]), interval)
+        split = int(np.searchsorted(buckets, buckets[-1]))
+        carry = chunk.iloc[split:][ROLLUP_COLUMNS].reset_index(drop=True)
+        if split:
+            yield rollup_candles(chunk.iloc[:split], interval)
+    if carry is not None and not carry.empty:
+        yield rollup_candles(carry, interval)
+
+
+def _dtype(name: str) -> str:
+    return "datetime64[ns]" if name in ("open_time", "close_time") else "float64"
+
+
+class BarRollup:
+    """Folds base bars of one symbol into completed bars of a longer interval.
+
+    :meth:`add` returns a derived bar as soon as the base bar closing its
+    bucket arrives, or, when that bar is missing, once a bar of a later
+    bucket shows the bucket is over. Bars must arrive in time order.
+    """
+
+    __slots__ = ("interval", "step", "base_step", "_bucket", "_bar")
+
+    def __init__(self, interval: str, base_interval: str) -> None:
+        check_rollup(base_interval, interval)
+        self.interval = interval
+        self.step = interval_to_milliseconds(interval)
+        self.base_step = interval_to_milliseconds(base_interval)
+        self._bucket: Optional[int] = None
+        self._bar: Optional[Bar] = None
+
+    def add(self, bar: Bar) -> List[Bar]:
+        stamp = pd.Timestamp(bar.open_time)
+        if stamp.tzinfo is not None:
+            stamp = stamp.tz_convert("UTC").tz_localize(None)
+        open_ms = stamp.value // 1_000_000
+        bucket = int(bucket_start(open_ms, self.interval))
+        completed: List[Bar] = []
+        if self._bar is not None and bucket != self._bucket:
+            completed.append(self._bar)
+            self._bar = None
+        if self._bar is None:
+            self._bucket = bucket
+            self._bar = Bar(
+                bar.symbol, pd.Timestamp(bucket, unit="ms"), bar.open, bar.high, bar.low, bar.close, bar.volume
+            )
+        else:
+            current = self._bar
+            current.high = max(current.high, bar.high)
+            current.low = min(current.low, bar.low)
+            current.close = bar.close
+            current.volume += bar.volume
+        if open_ms + self.base_step >= bucket + self.step:
+            completed.append(self._bar)
+            self._bar = None
+        return completed
+
+    def reset(self) -> None:
+        self._bucket = None
+        self._bar = None
@@ -1,5 +1,13 @@
-"""Engine exports."""
+"""Engine exports, imported on first access."""
+from __future__ import annotations
 
-from .trading_engine import TradingEngine
+from typing import TYPE_CHECKING
+
+from quant_trader.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .trading_engine import TradingEngine
 
 __all__ = ["TradingEngine"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {"TradingEngine": "trading_engine"})
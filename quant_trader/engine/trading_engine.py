@@ -1,19 +1,64 @@
 """Trading engine orchestrating data collection, strategy evaluation, and execution."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.columnar_store import to_epoch_ms
+from quant_trader.data.intervals import interval_to_milliseconds, next_boundary
 from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.data.rollups import BarRollup
 from quant_trader.execution.order_executor import ExecutionBackend
-from quant_trader.strategies.base import Signal, Strategy
+from quant_trader.indicators import Features
+from quant_trader.strategies.base import Bar, IndicatorStrategy, Signal, Strategy, StreamingStrategy, iter_bars
+from quant_trader.utils.metrics import metrics
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from quant_trader.data.binance_client import BinanceClient
 
 logger = logging.getLogger(__name__)
 
+# Fraction of the candle interval a cycle may take when no deadline is given.
+DEFAULT_DEADLINE_FRACTION = 0.8
+
+# How the engine feeds each strategy: bar by bar, through shared features, or with the candle frame.
+STREAMING, INDICATOR, FRAME = "streaming", "indicator", "frame"
+
+
+@dataclass
+class CycleReport:
+    """Outcome of one scheduled engine cycle."""
+
+    started_at: float
+    duration: float
+    completed: List[str] = field(default_factory=list)
+    missed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    signals: int = 0
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of :meth:`TradingEngine.replay`."""
+
+    bars: int
+    signals: int
+    seconds: float
+    last_prices: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.seconds if self.seconds else 0.0
+
 
 @dataclass
 class TradingEngine:
@@ -23,19 +68,397 @@ class TradingEngine:
     strategies: List[Strategy]
     execution_backend: ExecutionBackend
     client: BinanceClient
+    concurrent_fetch: bool = False
+    workers: int = 8
+    cycle_fetch_limit: int = 5
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+    last_report: Optional[CycleReport] = field(default=None, init=False)
+    _last_open_time: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+    _symbol_pool: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _order_pool: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    _in_flight: Dict[str, Future] = field(default_factory=dict, init=False, repr=False)
+    _kinds: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+    _intervals: Dict[int, Optional[str]] = field(default_factory=dict, init=False, repr=False)
+    _rollups: Dict[Tuple[str, str], BarRollup] = field(default_factory=dict, init=False, repr=False)
 
     def run(self) -> None:
         logger.info("Starting trading engine")
-        self.market_data.fetch_latest_candles(self.client)
+        if self.concurrent_fetch:
+            asyncio.run(self._fetch_concurrently())
+        else:
+            self.market_data.fetch_latest_candles(self.client)
         for symbol in self.market_data.settings.symbols:
-            data = self.market_data.load_candles(symbol, limit=500)
+            data = self.market_data.latest_candles(symbol, limit=500)
             data["symbol"] = symbol
+            self.evaluate(symbol, data)
+        logger.info("Trading engine run completed")
+
+    async def _fetch_concurrently(self) -> None:
+        from quant_trader.data.async_binance_client import AsyncBinanceClient
+
+        # Share the blocking client's scheduler so both draw from one weight budget.
+        async with AsyncBinanceClient(self.market_data.settings, scheduler=self.client.scheduler) as client:
+            await self.market_data.afetch_latest_candles(client)
+
+    def warm_up(self, limit: int = 500) -> None:
+        """Prime streaming strategies with stored candles without trading on them."""
+
+        for symbol in self.market_data.settings.symbols:
+            data = self.market_data.latest_candles(symbol, limit=limit)
+            streams = self._streamed(symbol, self._unseen_bars(symbol, data))
             for strategy in self.strategies:
-                signal = strategy.generate(data)
-                if signal:
-                    logger.info("Strategy %s generated signal %s", strategy.name, signal)
-                    signal.symbol = symbol
-                    self.execution_backend.execute(signal)
+                if self._is_streaming(strategy):
+                    for bar in streams[self._interval(strategy)]:
+                        strategy.update(bar)
+
+    async def stream(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Trade on closed candles pushed over the websocket kline stream.
+
+        Call :meth:`warm_up` first so strategies start with history.
+        """
+
+        from quant_trader.data.async_binance_client import AsyncBinanceClient
+        from quant_trader.data.kline_stream import KlineStream
+
+        settings = self.market_data.settings
+        async with AsyncBinanceClient(settings, scheduler=self.client.scheduler) as rest_client:
+            kline_stream = KlineStream(
+                settings, on_bar=self.on_bar, market_data=self.market_data, rest_client=rest_client
+            )
+            await kline_stream.run(stop)
+
+    def run_forever(
+        self,
+        *,
+        deadline: Optional[float] = None,
+        max_cycles: Optional[int] = None,
+        settle: float = 1.0,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Run one cycle per ``candles_interval``, shortly after each candle closes.
+
+        Symbols are evaluated concurrently on ``workers`` threads and orders
+        are sent from a separate pool, so a slow symbol or a stuck order call
+        never holds up the others. Symbols that have not finished within
+        ``deadline`` seconds (by default 80% of the interval) are reported as
+        missed and their late signals are dropped.
+        """
+
+        stop = stop or threading.Event()
+        interval = self.market_data.settings.candles_interval
+        if deadline is None:
+            deadline = interval_to_milliseconds(interval) / 1000 * DEFAULT_DEADLINE_FRACTION
+        self.warm_up()
+        self._symbol_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine-symbol")
+        self._order_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="engine-order")
+        cycles = 0
+        try:
+            while not stop.is_set() and (max_cycles is None or cycles < max_cycles):
+                wake_at = next_boundary(int(time.time() * 1000), interval) / 1000 + settle
+                if stop.wait(max(0.0, wake_at - time.time())):
+                    break
+                self.run_cycle(deadline)
+                cycles += 1
+        finally:
+            self._symbol_pool.shutdown(wait=False, cancel_futures=True)
+            self._order_pool.shutdown(wait=False, cancel_futures=True)
+            self._symbol_pool = self._order_pool = None
+
+    def run_cycle(self, deadline: float) -> CycleReport:
+        """Fetch and evaluate every symbol concurrently, waiting at most ``deadline`` seconds."""
+
+        own_pool = self._symbol_pool is None
+        pool = self._symbol_pool or ThreadPoolExecutor(max_workers=self.workers)
+        started = time.monotonic()
+        report = CycleReport(started_at=time.time(), duration=0.0)
+        futures: Dict[Future, str] = {}
+        for symbol in self.market_data.settings.symbols:
+            busy = self._in_flight.get(symbol)
+            if busy is not None and not busy.done():
+                report.skipped.append(symbol)
+                continue
+            future = pool.submit(self._cycle_symbol, symbol, started + deadline)
+            self._in_flight[symbol] = future
+            futures[future] = symbol
+
+        done, not_done = wait(futures, timeout=deadline)
+        for future in done:
+            symbol = futures[future]
+            if future.exception() is not None:
+                logger.error("Cycle failed for %s: %s", symbol, future.exception())
+                report.failed.append(symbol)
+            else:
+                report.completed.append(symbol)
+                report.signals += future.result()
+        report.missed = sorted(futures[future] for future in not_done)
+        report.duration = time.monotonic() - started
+        metrics.observe("cycle_seconds", report.duration)
+        for outcome in ("completed", "missed", "skipped", "failed"):
+            metrics.inc("cycle_symbols_total", len(getattr(report, outcome)), outcome=outcome)
+        if own_pool:
+            pool.shutdown(wait=False)
+        self.last_report = report
+
+        logger.info(
+            "Cycle finished in %.3fs: %s completed, %s missed, %s skipped, %s failed, %s signals",
+            report.duration,
+            len(report.completed),
+            len(report.missed),
+            len(report.skipped),
+            len(report.failed),
+            report.signals,
+        )
+        if report.missed or report.skipped:
+            logger.warning("Symbols past the cycle deadline: missed=%s skipped=%s", report.missed, report.skipped)
+        return report
+
+    def _cycle_symbol(self, symbol: str, deadline_at: float) -> int:
+        with metrics.timer("stage_seconds", stage="cycle", symbol=symbol):
+            return self._run_symbol(symbol, deadline_at)
+
+    def _run_symbol(self, symbol: str, deadline_at: float) -> int:
+        self.market_data.fetch_candles(self.client, symbol, limit=self.cycle_fetch_limit)
+        data = self.market_data.latest_candles(symbol, limit=500)
+        data["symbol"] = symbol
+        results = self._generate(symbol, data)
+        if time.monotonic() > deadline_at:
+            dropped = sum(1 for _, signal in results if signal)
+            if dropped:
+                logger.warning("Dropping %s late signal(s) for %s", dropped, symbol)
+            return 0
+        for strategy, signal in results:
+            self._dispatch(strategy, symbol, signal)
+        return sum(1 for _, signal in results if signal)
+
+    def evaluate(self, symbol: str, data: pd.DataFrame) -> List[Signal]:
+        """Run every strategy against the latest closed candles of ``symbol``.
+
+        A candle still forming in ``data`` is left out; a cycle that wakes
+        just after a boundary would otherwise trade on the bar that has only
+        just opened, before the one that closed is ever evaluated.
+        Streaming strategies are only fed the closed bars they have not seen yet.
+        Indicator strategies share one :class:`Features`, so each distinct
+        indicator is computed once per symbol and bar; all other strategies
+        receive the full frame. Strategies with an ``interval`` attribute
+        naming a longer interval than ``candles_interval`` get candles of that
+        interval instead, derived from the stored base candles (streaming ones
+        only once each derived bar is complete). Returns the signals raised.
+        """
+
+        results = self._generate(symbol, data)
+        for strategy, signal in results:
+            self._dispatch(strategy, symbol, signal)
+        return [signal for _, signal in results if signal]
+
+    def _generate(self, symbol: str, data: pd.DataFrame) -> List[Tuple[Strategy, Optional[Signal]]]:
+        data = self._closed(data)
+        streams = self._streamed(symbol, self._unseen_bars(symbol, data))
+        frames: Dict[Optional[str], pd.DataFrame] = {None: data}
+        features: Dict[Optional[str], Features] = {}
+        results: List[Tuple[Strategy, Optional[Signal]]] = []
+        for strategy in self.strategies:
+            interval = self._interval(strategy)
+            with metrics.timer("stage_seconds", stage="generate", symbol=symbol, strategy=strategy.name):
+                if self._is_streaming(strategy):
+                    # A catch-up over several bars trades every signal raised, not just the last bar's.
+                    fired = [signal for signal in map(strategy.update, streams[interval]) if signal]
+                    results.extend((strategy, signal) for signal in fired or [None])
+                    continue
+                if interval not in frames:
+                    frames[interval] = self._interval_frame(symbol, interval, data)
+                if self._kind(strategy) == INDICATOR:
+                    if interval not in features:
+                        features[interval] = Features(frames[interval])
+                    signal = strategy.evaluate_features(features[interval])
                 else:
-                    logger.debug("Strategy %s no signal for %s", strategy.name, symbol)
-        logger.info("Trading engine run completed")
+                    signal = strategy.generate(frames[interval])
+            results.append((strategy, signal))
+        return results
+
+    def _interval_frame(self, symbol: str, interval: str, data: pd.DataFrame) -> pd.DataFrame:
+        if data.empty:
+            return data
+        frame = self.market_data.rollup_window(symbol, interval, len(data), end=data["open_time"].max())
+        frame["symbol"] = symbol
+        return frame
+
+    def _streamed(self, symbol: str, bars: List[Bar]) -> Dict[Optional[str], List[Bar]]:
+        """``bars`` keyed by the intervals streaming strategies run on, rolled up where needed."""
+
+        streams: Dict[Optional[str], List[Bar]] = {None: bars}
+        for strategy in self.strategies:
+            interval = self._interval(strategy)
+            if interval in streams or not self._is_streaming(strategy):
+                continue
+            rollup = self._rollups.get((symbol, interval))
+            if rollup is None:
+                rollup = BarRollup(interval, self.market_data.settings.candles_interval)
+                self._rollups[(symbol, interval)] = rollup
+            streams[interval] = [derived for bar in bars for derived in rollup.add(bar)]
+        return streams
+
+    def on_bar(self, bar: Bar) -> List[Signal]:
+        """Feed a single closed bar to the streaming strategies; returns the signals raised."""
+
+        last_seen = self._last_open_time.get(bar.symbol)
+        if last_seen is not None and bar.open_time <= last_seen:
+            return []
+        self._last_open_time[bar.symbol] = bar.open_time
+        streams = self._streamed(bar.symbol, [bar])
+        signals = []
+        for strategy in self.strategies:
+            if self._is_streaming(strategy):
+                for streamed in streams[self._interval(strategy)]:
+                    with metrics.timer("stage_seconds", stage="generate", symbol=bar.symbol, strategy=strategy.name):
+                        signal = strategy.update(streamed)
+                    self._dispatch(strategy, bar.symbol, signal)
+                    if signal:
+                        signals.append(signal)
+        return signals
+
+    def replay(
+        self,
+        *,
+        symbols: Optional[Iterable[str]] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        window: int = 500,
+    ) -> ReplayReport:
+        """Drive the engine with stored candles instead of the exchange.
+
+        Bars of all ``symbols`` are interleaved in ``open_time`` order and sent
+        through the same code path as live trading, orders included. When
+        every strategy is a streaming strategy each bar goes through
+        :meth:`on_bar`; otherwise each bar is evaluated with :meth:`evaluate`
+        on the trailing ``window`` candles, which is much slower. Streaming
+        strategy state is reset first, so replays are repeatable.
+        """
+
+        started = time.perf_counter()
+        symbols = [symbol.upper() for symbol in (symbols or self.market_data.settings.symbols)]
+        self._last_open_time.clear()
+        self._rollups.clear()
+        for strategy in self.strategies:
+            if self._is_streaming(strategy):
+                strategy.reset()
+        frames = {}
+        for symbol in symbols:
+            frame = self.market_data.load_candles(symbol, limit=None, start=start, end=end).iloc[::-1]
+            frames[symbol] = frame.reset_index(drop=True).assign(symbol=symbol)
+        order = _interleave([frames[symbol]["open_time"].to_numpy() for symbol in symbols])
+        streaming_only = all(self._is_streaming(strategy) for strategy in self.strategies)
+        columns = {
+            symbol: [frame[name].to_numpy(dtype=float) for name in ("open", "high", "low", "close", "volume")]
+            for symbol, frame in frames.items()
+        }
+        open_times = {symbol: frame["open_time"].to_numpy() for symbol, frame in frames.items()}
+        signals = 0
+        for column, row in order:
+            symbol = symbols[column]
+            if streaming_only:
+                opens, highs, lows, closes, volumes = columns[symbol]
+                bar = Bar(symbol, open_times[symbol][row], opens[row], highs[row], lows[row], closes[row], volumes[row])
+                signals += len(self.on_bar(bar))
+            else:
+                signals += len(self.evaluate(symbol, frames[symbol].iloc[max(0, row - window + 1) : row + 1]))
+        last_prices = {symbol: float(frame["close"].iloc[-1]) for symbol, frame in frames.items() if len(frame)}
+        report = ReplayReport(len(order), signals, time.perf_counter() - started, last_prices)
+        logger.info(
+            "Replayed %s bars of %s symbols in %.2fs (%.0f bars/s), %s signals",
+            report.bars,
+            len(symbols),
+            report.seconds,
+            report.bars_per_second,
+            report.signals,
+        )
+        return report
+
+    def _kind(self, strategy: Strategy) -> str:
+        # Runtime protocol checks cost tens of microseconds, so classify each strategy once.
+        kind = self._kinds.get(id(strategy))
+        if kind is None:
+            if isinstance(strategy, StreamingStrategy):
+                kind = STREAMING
+            elif isinstance(strategy, IndicatorStrategy):
+                kind = INDICATOR
+            else:
+                kind = FRAME
+            self._kinds[id(strategy)] = kind
+        return kind
+
+    def _interval(self, strategy: Strategy) -> Optional[str]:
+        """The longer interval ``strategy`` runs on, or ``None`` for ``candles_interval``."""
+
+        key = id(strategy)
+        if key not in self._intervals:
+            interval = getattr(strategy, "interval", None)
+            base = self.market_data.settings.candles_interval
+            self._intervals[key] = None if interval in (None, base) else interval
+        return self._intervals[key]
+
+    def _is_streaming(self, strategy: Strategy) -> bool:
+        return self._kind(strategy) == STREAMING
+
+    def _closed(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Rows of ``data`` whose candle has closed; a forming candle's close still moves."""
+
+        if data.empty or "close_time" not in data:
+            return data
+        closed = to_epoch_ms(data["close_time"]) < int(self.clock() * 1000)
+        return data if closed.all() else data[closed]
+
+    def _unseen_bars(self, symbol: str, data: pd.DataFrame) -> List[Bar]:
+        """Closed bars of ``data`` newer than the last one fed to the streaming strategies.
+
+        The forming candle is held back: once marked seen it would never be
+        fed again with its final close.
+        """
+
+        data = self._closed(data)
+        if data.empty:
+            return []
+        ordered = data if data["open_time"].is_monotonic_increasing else data.sort_values("open_time")
+        last_seen = self._last_open_time.get(symbol)
+        if last_seen is not None:
+            ordered = ordered[ordered["open_time"] > last_seen]
+        if ordered.empty:
+            return []
+        self._last_open_time[symbol] = ordered["open_time"].iloc[-1]
+        return list(iter_bars(ordered, symbol))
+
+    def _dispatch(self, strategy: Strategy, symbol: str, signal: Signal | None) -> None:
+        if signal:
+            logger.info("Strategy %s generated signal %s", strategy.name, signal)
+            signal.symbol = symbol
+            # Strategies on different intervals can fire on bars sharing an open time.
+            interval = self._interval(strategy) or self.market_data.settings.candles_interval
+            signal.strategy = f"{strategy.name}@{interval}"
+            metrics.inc("signals_total", symbol=symbol, strategy=strategy.name, side=signal.side)
+            if self._order_pool is not None:
+                self._order_pool.submit(self._execute, signal)
+            else:
+                self._send(signal)
+        else:
+            logger.debug("Strategy %s no signal for %s", strategy.name, symbol)
+
+    def _send(self, signal: Signal) -> None:
+        with metrics.timer("stage_seconds", stage="execute", symbol=signal.symbol):
+            self.execution_backend.execute(signal)
+
+    def _execute(self, signal: Signal) -> None:
+        try:
+            self._send(signal)
+        except Exception as exc:  # pragma: no cover - logging path
+            logger.exception("Order for %s failed: %s", signal.symbol, exc)
+
+
+def _interleave(open_times: List[np.ndarray]) -> List[Tuple[int, int]]:
+    """(column, row) pairs visiting every row of every array in time order, ties by column."""
+
+    if not open_times:
+        return []
+    columns = np.concatenate([np.full(len(times), idx) for idx, times in enumerate(open_times)])
+    rows = np.concatenate([np.arange(len(times)) for times in open_times])
+    stamps = np.concatenate([times.astype("datetime64[ns]").view(np.int64) for times in open_times])
+    order = np.lexsort((columns, stamps))
+    return list(zip(columns[order].tolist(), rows[order].tolist()))
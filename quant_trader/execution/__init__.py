@@ -1,5 +1,33 @@
-"""Execution backends."""
+"""Execution backends, imported on first access."""
+from __future__ import annotations
 
-from .order_executor import BinanceExecutionBackend, PaperTradingBackend
+from typing import TYPE_CHECKING
 
-__all__ = ["BinanceExecutionBackend", "PaperTradingBackend"]
+from quant_trader.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .order_executor import BinanceExecutionBackend, PaperTradingBackend
+    from .order_manager import OrderBook, OrderManager, OrderRecord, Position, client_order_id
+
+__all__ = [
+    "BinanceExecutionBackend",
+    "OrderBook",
+    "OrderManager",
+    "OrderRecord",
+    "PaperTradingBackend",
+    "Position",
+    "client_order_id",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BinanceExecutionBackend": "order_executor",
+        "PaperTradingBackend": "order_executor",
+        "OrderBook": "order_manager",
+        "OrderManager": "order_manager",
+        "OrderRecord": "order_manager",
+        "Position": "order_manager",
+        "client_order_id": "order_manager",
+    },
+)
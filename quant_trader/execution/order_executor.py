@@ -2,11 +2,18 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from typing import Protocol
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Protocol
 
-from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.exchange_info import ExchangeInfoCache, OrderRejected
+from quant_trader.execution.order_manager import Position
 from quant_trader.strategies.base import Signal
+from quant_trader.utils.metrics import metrics
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from quant_trader.data.binance_client import BinanceClient
 
 logger = logging.getLogger(__name__)
 
@@ -16,38 +23,151 @@ class ExecutionBackend(Protocol):
         ...
 
 
+@dataclass(frozen=True)
+class FillModel:
+    """Simulated fills: the signal price moved against the trade by ``slippage``, plus a ``fee_rate`` fee."""
+
+    slippage: float = 0.0005
+    fee_rate: float = 0.001
+
+    def fill_price(self, side: str, price: float) -> float:
+        return price * (1 + self.slippage) if side == "BUY" else price * (1 - self.slippage)
+
+    def fee(self, notional: float) -> float:
+        return abs(notional) * self.fee_rate
+
+
+@dataclass
+class PaperFill:
+    symbol: str
+    side: str
+    quantity: float
+    price: float
+    fee: float
+    open_time: Any = None
+
+
 @dataclass
 class PaperTradingBackend:
-    """Paper trading backend that simply logs signals."""
+    """Paper trading backend filling signals against a :class:`FillModel`.
+
+    Each signal trades ``trade_fraction`` of the starting ``balance`` at the
+    simulated fill price. Positions, cash, fees and realized PnL are tracked
+    in memory; :meth:`summary` marks open positions to given prices. With
+    ``exchange_info`` the paper quantity is rounded and validated against the
+    symbol's filters, so paper runs skip the orders live trading would.
+    """
 
     balance: float = 10000.0
+    exchange_info: Optional[ExchangeInfoCache] = None
+    fill_model: FillModel = field(default_factory=FillModel)
+    trade_fraction: float = 0.01
+    cash: float = field(init=False)
+    fees: float = field(default=0.0, init=False)
+    positions: Dict[str, Position] = field(default_factory=dict, init=False)
+    fills: List[PaperFill] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        self.cash = self.balance
+        self._lock = threading.Lock()
 
-    def execute(self, signal: Signal) -> None:  # pragma: no cover - logging heavy
-        direction = 1 if signal.side.upper() == "BUY" else -1
-        notional = self.balance * 0.01 * direction
+    def execute(self, signal: Signal) -> None:
+        side = signal.side.upper()
+        if not signal.price:
+            logger.warning("Skipping paper trade for %s without a price", signal.symbol)
+            return
+        quantity = self.balance * self.trade_fraction / signal.price
+        if self.exchange_info is not None:
+            try:
+                quantity, _ = self.exchange_info.prepare_order(signal.symbol, side, quantity, market_price=signal.price)
+            except OrderRejected as exc:
+                logger.warning("Skipping paper trade: %s", exc)
+                return
+        price = self.fill_model.fill_price(side, signal.price)
+        notional = quantity * price
+        fee = self.fill_model.fee(notional)
+        with self._lock:
+            position = self.positions.get(signal.symbol)
+            if position is None:
+                position = self.positions[signal.symbol] = Position(signal.symbol)
+            position.apply(side, quantity, price)
+            self.cash += (-notional if side == "BUY" else notional) - fee
+            self.fees += fee
+            self.fills.append(PaperFill(signal.symbol, side, quantity, price, fee, signal.open_time))
         logger.info(
-            "Paper trade %s %s with confidence %.2f at price %.2f (notional %.2f)",
-            signal.side,
+            "Paper trade %s %s with confidence %.2f: %s at %.2f (notional %.2f, fee %.4f)",
+            side,
             signal.symbol,
             signal.confidence,
-            signal.price,
+            quantity,
+            price,
             notional,
+            fee,
         )
 
+    def equity(self, prices: Mapping[str, float]) -> float:
+        """Cash plus open positions marked to ``prices`` (average entry price when missing)."""
+
+        with self._lock:
+            return self.cash + sum(
+                position.quantity * prices.get(symbol, position.average_price)
+                for symbol, position in self.positions.items()
+            )
+
+    def summary(self, prices: Mapping[str, float]) -> Dict[str, float]:
+        with self._lock:
+            realized = sum(position.realized_pnl for position in self.positions.values())
+            unrealized = sum(
+                position.quantity * (prices.get(symbol, position.average_price) - position.average_price)
+                for symbol, position in self.positions.items()
+            )
+            trades = len(self.fills)
+        equity = self.equity(prices)
+        return {
+            "trades": trades,
+            "fees": self.fees,
+            "realized_pnl": realized,
+            "unrealized_pnl": unrealized,
+            "equity": equity,
+            "total_return": equity / self.balance - 1,
+        }
+
 
 @dataclass
 class BinanceExecutionBackend:
-    """Live trading backend using Binance API."""
+    """Live trading backend using Binance API.
+
+    With ``exchange_info`` the trade size is rounded to the symbol's lot step
+    and checked against its quantity and notional filters before sending;
+    orders that would be rejected are dropped without a request.
+    """
 
     client: BinanceClient
     trade_size: float
+    exchange_info: Optional[ExchangeInfoCache] = None
 
     def execute(self, signal: Signal) -> None:
         side = signal.side.upper()
-        order = self.client.create_order(
-            symbol=signal.symbol,
-            side=side,
-            type_="MARKET",
-            quantity=self.trade_size,
-        )
+        quantity = self.trade_size
+        if self.exchange_info is not None:
+            try:
+                quantity, _ = self.exchange_info.prepare_order(signal.symbol, side, quantity, market_price=signal.price)
+            except OrderRejected as exc:
+                metrics.inc("orders_total", symbol=signal.symbol, side=side, status="REJECTED_LOCAL")
+                logger.warning("Skipping order: %s", exc)
+                return
+        started = time.perf_counter()
+        try:
+            order = self.client.create_order(
+                symbol=signal.symbol,
+                side=side,
+                type_="MARKET",
+                quantity=quantity,
+            )
+        except Exception:
+            metrics.inc("orders_total", symbol=signal.symbol, side=side, status="ERROR")
+            raise
+        finally:
+            metrics.observe("order_round_trip_seconds", time.perf_counter() - started, symbol=signal.symbol, side=side)
+        metrics.inc("orders_total", symbol=signal.symbol, side=side, status=order.get("status", "UNKNOWN"))
         logger.info("Executed order on Binance: %s", order)
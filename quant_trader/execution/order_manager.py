@@ -0,0 +1,373 @@
+"""Asynchronous order submission with client order IDs and an order/position book."""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+
+import pandas as pd
+import requests
+
+from quant_trader.data.binance_client import BinanceClient, _error_code
+from quant_trader.data.exchange_info import ExchangeInfoCache, OrderRejected
+from quant_trader.strategies.base import Signal
+from quant_trader.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Binance error code for an unknown order.
+ORDER_NOT_FOUND = -2013
+# Statuses after which an order can no longer change.
+FINAL_STATUSES = {"FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH"}
+# Status of an order whose submission may or may not have reached the exchange.
+UNKNOWN = "UNKNOWN"
+
+
+def client_order_id(symbol: str, side: str, open_time: Any, *, strategy: str = "", prefix: str = "qt") -> str:
+    """Deterministic ``newClientOrderId`` for the order a bar's signal raises.
+
+    The same symbol, side, bar and ``strategy`` always map to the same ID (at
+    most 36 characters, as Binance requires), so a resubmitted order is
+    recognised by the exchange instead of being placed twice, while two
+    strategies trading on the same bar each get their own order.
+    """
+
+    if isinstance(open_time, (int, float)):
+        stamp = int(open_time)
+    else:
+        stamp = pd.Timestamp(open_time).value // 1_000_000
+    key = f"{symbol.upper()}|{side.upper()}|{stamp}"
+    if strategy:
+        key = f"{key}|{strategy}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return f"{prefix}-{digest[: 35 - len(prefix)]}"
+
+
+@dataclass
+class OrderRecord:
+    """One order's request, latest exchange state and timings.
+
+    ``queued_at``, ``sent_at`` and ``acked_at`` are :func:`time.perf_counter`
+    readings taken when the order was queued, first sent and answered.
+    """
+
+    client_order_id: str
+    symbol: str
+    side: str
+    quantity: float
+    signal_price: float
+    type_: str = "MARKET"
+    price: Optional[float] = None
+    status: str = "PENDING"
+    order_id: Optional[int] = None
+    executed_qty: float = 0.0
+    quote_qty: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.perf_counter)
+    sent_at: Optional[float] = None
+    acked_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    @property
+    def average_price(self) -> float:
+        return self.quote_qty / self.executed_qty if self.executed_qty else 0.0
+
+    def latency(self) -> Dict[str, Optional[float]]:
+        """Seconds spent queued, waiting on the exchange, and in total."""
+
+        sent, acked = self.sent_at, self.acked_at
+        return {
+            "queue_seconds": sent - self.queued_at if sent is not None else None,
+            "exchange_seconds": acked - sent if acked is not None and sent is not None else None,
+            "total_seconds": acked - self.queued_at if acked is not None else None,
+        }
+
+
+@dataclass
+class Position:
+    """Net quantity and average entry price of one symbol."""
+
+    symbol: str
+    quantity: float = 0.0
+    average_price: float = 0.0
+    realized_pnl: float = 0.0
+
+    def apply(self, side: str, quantity: float, price: float) -> None:
+        signed = quantity if side == "BUY" else -quantity
+        if self.quantity == 0 or (self.quantity > 0) == (signed > 0):
+            total = self.quantity + signed
+            self.average_price = (self.average_price * abs(self.quantity) + price * quantity) / abs(total)
+            self.quantity = total
+            return
+        closed = min(quantity, abs(self.quantity))
+        direction = 1 if self.quantity > 0 else -1
+        self.realized_pnl += closed * (price - self.average_price) * direction
+        self.quantity += signed
+        if abs(self.quantity) < 1e-12:
+            self.quantity = 0.0
+            self.average_price = 0.0
+        elif (self.quantity > 0) != (direction > 0):
+            self.average_price = price
+
+
+class OrderBook:
+    """Thread-safe orders by client order ID and positions by symbol."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.orders: Dict[str, OrderRecord] = {}
+        self.positions: Dict[str, Position] = {}
+
+    def add(self, record: OrderRecord) -> bool:
+        """Track ``record``; ``False`` when its client order ID is already known."""
+
+        with self._lock:
+            if record.client_order_id in self.orders:
+                return False
+            self.orders[record.client_order_id] = record
+            return True
+
+    def get(self, client_order_id: str) -> Optional[OrderRecord]:
+        return self.orders.get(client_order_id)
+
+    def apply(self, record: OrderRecord, response: Mapping[str, Any]) -> None:
+        """Update ``record`` from an order response and book any newly executed quantity.
+
+        A ``FILLED`` acknowledgement without fill details is booked as the
+        full quantity at the signal price.
+        """
+
+        status = response.get("status", "UNKNOWN")
+        if "executedQty" in response:
+            executed = float(response["executedQty"])
+            quote = float(response.get("cummulativeQuoteQty", 0.0)) or executed * record.signal_price
+        elif status == "FILLED":
+            executed, quote = record.quantity, record.quantity * record.signal_price
+        else:
+            executed, quote = record.executed_qty, record.quote_qty
+        with self._lock:
+            delta = executed - record.executed_qty
+            if delta > 0:
+                price = (quote - record.quote_qty) / delta
+                position = self.positions.setdefault(record.symbol, Position(record.symbol))
+                position.apply(record.side, delta, price)
+            record.status = status
+            record.order_id = response.get("orderId", record.order_id)
+            record.executed_qty, record.quote_qty = executed, quote
+
+    def open_orders(self) -> List[OrderRecord]:
+        with self._lock:
+            return [record for record in self.orders.values() if not record.done]
+
+    def position(self, symbol: str) -> Position:
+        with self._lock:
+            return self.positions.get(symbol.upper(), Position(symbol.upper()))
+
+
+class OrderManager:
+    """Execution backend that queues orders and sends them from worker threads.
+
+    :meth:`execute` only sizes the order, books it and puts it on the queue,
+    so signal generation never waits on the exchange. Every order carries a
+    :func:`client_order_id`. When a submission times out or fails with a
+    server error, the workers look the ID up on the exchange and only send
+    again if the order is not there, so retries cannot double-fill. An order
+    still unaccounted for after ``max_attempts`` is left ``UNKNOWN`` and
+    settled by :meth:`reconcile`, which idle workers run every
+    ``reconcile_interval`` seconds. Signals without a bar time fall back to a
+    per-manager sequence number.
+    """
+
+    def __init__(
+        self,
+        client: BinanceClient,
+        trade_size: float,
+        *,
+        exchange_info: Optional[ExchangeInfoCache] = None,
+        workers: int = 2,
+        max_attempts: int = 3,
+        retry_delay: float = 0.5,
+        reconcile_interval: float = 30.0,
+        prefix: str = "qt",
+    ) -> None:
+        self.client = client
+        self.trade_size = trade_size
+        self.exchange_info = exchange_info
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.reconcile_interval = reconcile_interval
+        self.prefix = prefix
+        self.book = OrderBook()
+        self._queue: "queue.Queue[Optional[OrderRecord]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._reconcile_lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._session = f"{time.time_ns():x}"
+
+    def start(self) -> "OrderManager":
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"order-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop the workers, by default after the queued orders have been sent."""
+
+        if wait:
+            self._queue.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def join(self) -> None:
+        """Block until every queued order has been sent and answered."""
+
+        self._queue.join()
+
+    def __enter__(self) -> "OrderManager":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def execute(self, signal: Signal) -> Optional[OrderRecord]:
+        side = signal.side.upper()
+        quantity = self.trade_size
+        if self.exchange_info is not None:
+            try:
+                quantity, _ = self.exchange_info.prepare_order(signal.symbol, side, quantity, market_price=signal.price)
+            except OrderRejected as exc:
+                metrics.inc("orders_total", symbol=signal.symbol, side=side, status="REJECTED_LOCAL")
+                logger.warning("Skipping order: %s", exc)
+                return None
+        if signal.open_time is not None:
+            order_id = client_order_id(
+                signal.symbol, side, signal.open_time, strategy=signal.strategy or "", prefix=self.prefix
+            )
+        else:
+            order_id = f"{self.prefix}-{self._session}-{next(self._sequence)}"[:36]
+        record = OrderRecord(order_id, signal.symbol.upper(), side, quantity, signal.price)
+        if not self.book.add(record):
+            logger.info("Order %s for %s was already submitted", order_id, signal.symbol)
+            return self.book.get(order_id)
+        if not self._threads:
+            self.start()
+        self._queue.put(record)
+        metrics.set_gauge("order_queue_depth", self._queue.qsize())
+        return record
+
+    def reconcile(self) -> List[OrderRecord]:
+        """Settle ``UNKNOWN`` orders by looking up their client order IDs.
+
+        An order the exchange has is booked from its copy; one it never
+        received is queued to be sent again. Orders whose lookup fails stay
+        ``UNKNOWN`` until the next pass. Returns the orders settled.
+        """
+
+        settled: List[OrderRecord] = []
+        with self._reconcile_lock:
+            for record in self.book.open_orders():
+                if record.status != UNKNOWN:
+                    continue
+                try:
+                    response = self._lookup(record)
+                except (requests.RequestException, ValueError) as exc:
+                    record.error = str(exc)
+                    logger.warning("Order %s is still unknown: %s", record.client_order_id, exc)
+                    continue
+                settled.append(record)
+                if response is None:
+                    logger.info("Order %s never reached the exchange; sending it again", record.client_order_id)
+                    record.status, record.attempts = "PENDING", 0
+                    if not self._threads:
+                        self.start()
+                    self._queue.put(record)
+                    continue
+                self.book.apply(record, response)
+                metrics.inc("orders_total", symbol=record.symbol, side=record.side, status=record.status)
+                logger.info("Order %s reconciled: %s", record.client_order_id, record.status)
+        return settled
+
+    def _run(self) -> None:
+        while True:
+            try:
+                record = self._queue.get(timeout=self.reconcile_interval)
+            except queue.Empty:
+                if any(order.status == UNKNOWN for order in self.book.open_orders()):
+                    self.reconcile()
+                continue
+            try:
+                if record is None:
+                    return
+                self._submit(record)
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                logger.exception("Order worker failed on %s: %s", record, exc)
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, record: OrderRecord) -> None:
+        record.sent_at = time.perf_counter()
+        metrics.observe("order_queue_seconds", record.sent_at - record.queued_at, symbol=record.symbol)
+        response: Optional[Mapping[str, Any]] = None
+        while record.attempts < self.max_attempts:
+            record.attempts += 1
+            if record.attempts > 1:
+                time.sleep(self.retry_delay * 2 ** (record.attempts - 2))
+                try:
+                    response = self._lookup(record)
+                except (requests.RequestException, ValueError) as exc:
+                    # Unknown whether the order arrived; never resend blind.
+                    record.error = str(exc)
+                    continue
+                if response is not None:
+                    break
+            try:
+                response = self.client.create_order(
+                    symbol=record.symbol,
+                    side=record.side,
+                    type_=record.type_,
+                    quantity=record.quantity,
+                    price=record.price,
+                    client_order_id=record.client_order_id,
+                )
+                break
+            except requests.HTTPError as exc:
+                if exc.response is not None and exc.response.status_code < 500:
+                    record.error = exc.response.text
+                    response = {"status": "REJECTED"}
+                    break
+                record.error = str(exc)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                record.error = str(exc)
+            logger.warning("Order %s attempt %s failed: %s", record.client_order_id, record.attempts, record.error)
+        record.acked_at = time.perf_counter()
+        # Without an answer the order may still have arrived; leave it for reconcile().
+        self.book.apply(record, response or {"status": UNKNOWN})
+        metrics.observe(
+            "order_round_trip_seconds", record.acked_at - record.sent_at, symbol=record.symbol, side=record.side
+        )
+        metrics.inc("orders_total", symbol=record.symbol, side=record.side, status=record.status)
+        logger.info("Order %s %s %s: %s", record.client_order_id, record.side, record.symbol, record.status)
+
+    def _lookup(self, record: OrderRecord) -> Optional[Mapping[str, Any]]:
+        """The exchange's copy of ``record``, or ``None`` when it never arrived."""
+
+        try:
+            return self.client.get_order(record.symbol, client_order_id=record.client_order_id)
+        except requests.HTTPError as exc:
+            if exc.response is not None and _error_code(exc.response) == ORDER_NOT_FOUND:
+                return None
+            raise
@@ -0,0 +1,18 @@
+"""Shared indicator computations."""
+
+from .functions import atr, ema, rolling_std, rsi, sma, true_range, vwap
+from .registry import INDICATORS, Features, Indicator, register_indicator
+
+__all__ = [
+    "INDICATORS",
+    "Features",
+    "Indicator",
+    "atr",
+    "ema",
+    "register_indicator",
+    "rolling_std",
+    "rsi",
+    "sma",
+    "true_range",
+    "vwap",
+]
@@ -0,0 +1,105 @@
+"""Vectorized indicator implementations over NumPy arrays.
+
+Every function returns an array aligned with its inputs, with NaN for bars
+that do not have enough history yet.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` rows along the first axis.
+
+    Each window is summed left to right with one vector add per lag, so a
+    value only depends on the rows inside its window. The same bar therefore
+    yields bit-identical results whether it is computed over a short tail or
+    the full history. The first ``window - 1`` rows are NaN.
+    """
+
+    values = np.asarray(values, dtype=float)
+    result = np.full(values.shape, np.nan)
+    count = len(values) - window + 1
+    if window <= 0 or count <= 0:
+        return result
+    total = values[:count].copy()
+    for lag in range(1, window):
+        total += values[lag : lag + count]
+    result[window - 1 :] = total / window
+    return result
+
+
+def ema(values: np.ndarray, window: int) -> np.ndarray:
+    """Exponential moving average with ``alpha = 2 / (window + 1)``, along the first axis."""
+
+    return _smooth(values, alpha=2.0 / (window + 1), min_periods=window)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Population standard deviation over a trailing ``window`` along the first axis.
+
+    Deviations are taken from each window's own mean, one lag at a time, so
+    memory stays proportional to the input even for 2-D panels.
+    """
+
+    values = np.asarray(values, dtype=float)
+    means = sma(values, window)
+    count = len(values) - window + 1
+    if window <= 0 or count <= 0:
+        return means
+    centre = means[window - 1 :]
+    total = (values[:count] - centre) ** 2
+    for lag in range(1, window):
+        total += (values[lag : lag + count] - centre) ** 2
+    means[window - 1 :] = np.sqrt(total / window)
+    return means
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    previous_close = np.roll(np.asarray(close, dtype=float), 1, axis=0)
+    ranges = high - low
+    if len(ranges) > 1:
+        ranges[1:] = np.maximum.reduce(
+            [ranges[1:], np.abs(high[1:] - previous_close[1:]), np.abs(low[1:] - previous_close[1:])]
+        )
+    return ranges
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> np.ndarray:
+    """Average true range with Wilder's smoothing, along the first axis."""
+
+    return _smooth(true_range(high, low, close), alpha=1.0 / window, min_periods=window)
+
+
+def rsi(values: np.ndarray, window: int) -> np.ndarray:
+    """Relative strength index (0-100) with Wilder's smoothing, along the first axis."""
+
+    values = np.asarray(values, dtype=float)
+    result = np.full(values.shape, np.nan)
+    if len(values) <= window:
+        return result
+    deltas = np.diff(values, axis=0)
+    gains = _smooth(np.clip(deltas, 0, None), alpha=1.0 / window, min_periods=window)
+    losses = _smooth(np.clip(-deltas, 0, None), alpha=1.0 / window, min_periods=window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[1:] = np.where(losses == 0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+    return result
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, window: int) -> np.ndarray:
+    """Volume-weighted typical price over a trailing ``window``."""
+
+    typical = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3
+    volume = np.asarray(volume, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sma(typical * volume, window) / sma(volume, window)
+
+
+def _smooth(values: np.ndarray, *, alpha: float, min_periods: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    # A DataFrame smooths each column of a (bars, symbols) panel on its own.
+    frame = pd.DataFrame(values) if values.ndim == 2 else pd.Series(values)
+    return frame.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
@@ -0,0 +1,136 @@
+"""Indicator specifications and per-frame memoization."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from . import functions
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """Hashable description of one indicator series, e.g. ``Indicator("sma", 20)``.
+
+    Two strategies asking for equal specs share a single computation.
+    ``source`` names the input column for single-input indicators.
+    """
+
+    kind: str
+    window: int
+    source: str = "close"
+
+    def __post_init__(self) -> None:
+        if self.kind not in INDICATORS:
+            raise ValueError(f"unknown indicator {self.kind!r}; registered: {sorted(INDICATORS)}")
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+
+    @property
+    def key(self) -> str:
+        suffix = "" if self.source == "close" else f"_{self.source}"
+        return f"{self.kind}_{self.window}{suffix}"
+
+
+IndicatorFunction = Callable[["Features", Indicator], np.ndarray]
+
+INDICATORS: Dict[str, IndicatorFunction] = {}
+
+
+def register_indicator(kind: str) -> Callable[[IndicatorFunction], IndicatorFunction]:
+    """Register ``function(features, indicator)`` as the implementation of ``kind``."""
+
+    def decorator(function: IndicatorFunction) -> IndicatorFunction:
+        INDICATORS[kind] = function
+        return function
+
+    return decorator
+
+
+class Features:
+    """Indicators over one candle frame, each computed at most once.
+
+    The engine builds one instance per symbol and bar and hands it to every
+    strategy, so the work per bar grows with the number of distinct
+    indicators rather than with the number of strategies. Backtests build
+    one over the full history; since the implementations are vectorized the
+    same code serves both. Arrays follow ``data`` sorted by ``open_time``.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        if "open_time" in data and not data["open_time"].is_monotonic_increasing:
+            data = data.sort_values("open_time")
+        self.data = data
+        self._columns: Dict[str, np.ndarray] = {}
+        self._values: Dict[Indicator, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, indicator: Indicator) -> np.ndarray:
+        values = self._values.get(indicator)
+        if values is None:
+            values = self._values[indicator] = INDICATORS[indicator.kind](self, indicator)
+        return values
+
+    @property
+    def computed(self) -> int:
+        """Number of distinct indicators evaluated so far."""
+
+        return len(self._values)
+
+    def column(self, name: str) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = self.data[name].to_numpy(dtype=float)
+        return values
+
+    def compute(self, indicators: Iterable[Indicator]) -> Mapping[Indicator, np.ndarray]:
+        return {indicator: self[indicator] for indicator in indicators}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Computed indicators as columns named by :attr:`Indicator.key`."""
+
+        return pd.DataFrame(
+            {indicator.key: values for indicator, values in self._values.items()}, index=self.data.index
+        )
+
+
+@register_indicator("sma")
+def _sma(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.sma(features.column(indicator.source), indicator.window)
+
+
+@register_indicator("ema")
+def _ema(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.ema(features.column(indicator.source), indicator.window)
+
+
+@register_indicator("std")
+def _rolling_std(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.rolling_std(features.column(indicator.source), indicator.window)
+
+
+@register_indicator("rsi")
+def _rsi(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.rsi(features.column(indicator.source), indicator.window)
+
+
+@register_indicator("atr")
+def _atr(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.atr(
+        features.column("high"), features.column("low"), features.column("close"), indicator.window
+    )
+
+
+@register_indicator("vwap")
+def _vwap(features: Features, indicator: Indicator) -> np.ndarray:
+    return functions.vwap(
+        features.column("high"),
+        features.column("low"),
+        features.column("close"),
+        features.column("volume"),
+        indicator.window,
+    )
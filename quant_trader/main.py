@@ -1,54 +1,269 @@
-"""Command line interface for Quant Trader."""
+"""Command line interface for Quant Trader.
+
+Only the standard library is imported up front. Each command imports what it
+needs when it runs, so ``--help`` and light commands skip loading pandas,
+SQLAlchemy and the HTTP clients they never use.
+"""
 from __future__ import annotations
 
 import argparse
 import logging
 from pathlib import Path
 
-from quant_trader.config import load_settings
-from quant_trader.data.binance_client import BinanceClient
-from quant_trader.data.market_data_service import MarketDataService, export_to_csv
-from quant_trader.engine.trading_engine import TradingEngine
-from quant_trader.execution.order_executor import BinanceExecutionBackend, PaperTradingBackend
-from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+from quant_trader.config import Settings, load_settings
 from quant_trader.utils.logging import configure_logging
+from quant_trader.utils.metrics import metrics
+
+# Mirrors quant_trader.data.export.EXPORT_FORMATS and
+# quant_trader.backtesting.portfolio.SIZING_METHODS without importing them.
+EXPORT_FORMATS = ("csv.gz", "csv", "parquet")
+SIZING_METHODS = ("equal", "volatility")
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _timestamp_arg(value: str) -> str | int:
+    return int(value) if value.isdigit() else value
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Quantitative trading automation for Binance")
-    parser.add_argument("command", choices=["collect", "export", "trade"], help="Command to run")
+    parser.add_argument(
+        "command",
+        choices=["collect", "backfill", "migrate", "rollup", "export", "trade", "optimize", "portfolio", "replay"],
+        help="Command to run",
+    )
     parser.add_argument("--env", dest="env_file", type=Path, default=None, help="Path to .env file")
-    parser.add_argument("--limit", type=int, default=500, help="Number of candles to fetch/export")
+    parser.add_argument("--limit", type=int, default=500, help="Number of candles to fetch/load")
     parser.add_argument("--output", type=Path, default=Path("data"), help="Output directory for exports")
+    parser.add_argument(
+        "--format", dest="export_format", choices=EXPORT_FORMATS, default="csv.gz", help="Export format"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Rewrite exports from scratch instead of appending new candles"
+    )
     parser.add_argument("--paper", action="store_true", help="Run in paper trading mode")
+    parser.add_argument(
+        "--stream", action="store_true", help="Trade continuously on closed candles from the websocket stream"
+    )
+    parser.add_argument(
+        "--loop", action="store_true", help="Run the engine continuously, one cycle per candle interval"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Symbols evaluated concurrently in --loop mode")
+    parser.add_argument(
+        "--deadline", type=float, default=None, help="Per-cycle deadline in seconds for --loop (default 80%% of interval)"
+    )
+    parser.add_argument(
+        "--concurrent-fetch", action="store_true", help="Fetch all symbols concurrently with the asyncio client"
+    )
     parser.add_argument("--trade-size", type=float, default=0.001, help="Trade size for live execution")
+    parser.add_argument("--order-workers", type=int, default=2, help="Threads sending queued live orders")
+    parser.add_argument("--start", default=None, help="Backfill/replay start (ISO date or epoch ms)")
+    parser.add_argument("--end", default=None, help="Backfill/replay end (ISO date or epoch ms), defaults to now")
+    parser.add_argument("--max-workers", type=int, default=4, help="Symbols fetched/exported concurrently")
+    parser.add_argument(
+        "--requests-per-minute", type=float, default=600, help="Request budget shared by backfill workers"
+    )
+    parser.add_argument("--symbol", default=None, help="Symbol to optimize (defaults to the first configured symbol)")
+    parser.add_argument("--short-windows", type=_int_list, default=[5, 10, 15, 20], help="Comma-separated short MA windows")
+    parser.add_argument("--long-windows", type=_int_list, default=[30, 50, 100, 200], help="Comma-separated long MA windows")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes for optimize (defaults to CPU count)")
+    parser.add_argument("--top", type=int, default=20, help="Number of ranked results to report")
+    parser.add_argument("--fee-rate", type=float, default=0.001, help="Portfolio/replay fee per unit of traded notional")
+    parser.add_argument(
+        "--slippage", type=float, default=0.0005, help="Portfolio/replay slippage per unit of traded notional"
+    )
+    parser.add_argument("--sizing", choices=SIZING_METHODS, default="equal", help="Portfolio position sizing")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this local port")
+    parser.add_argument("--metrics-snapshot", type=Path, default=None, help="Write periodic JSON metric snapshots here")
     parser.add_argument("--log-file", type=Path, default=None, help="Optional log file path")
     parser.add_argument("--log-level", default="INFO", help="Logging level")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main() -> None:
     args = parse_args()
     configure_logging(getattr(logging, args.log_level.upper(), logging.INFO), args.log_file)
 
-    settings = load_settings(args.env_file)
-    market_data = MarketDataService(settings)
-    strategy = MovingAverageCrossStrategy()
+    settings = load_settings(args.env_file, require_credentials=_signs_requests(args))
+    exporters = _start_metrics(
+        args.metrics_port if args.metrics_port is not None else settings.metrics_port,
+        args.metrics_snapshot or settings.metrics_snapshot_path,
+        settings.metrics_snapshot_interval,
+        enabled=settings.metrics_enabled,
+    )
+    try:
+        COMMANDS[args.command](args, settings)
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+
+
+def _signs_requests(args: argparse.Namespace) -> bool:
+    """Only live trading sends signed requests; every other command works without API keys."""
+
+    return args.command == "trade" and not args.paper
+
+
+def _start_metrics(port: int, snapshot_path: Path | None, interval: float, *, enabled: bool) -> list:
+    metrics.enabled = enabled or bool(port) or snapshot_path is not None
+    exporters: list = []
+    if port:
+        from quant_trader.utils.metrics import MetricsServer
+
+        exporters.append(MetricsServer(metrics, port=port).start())
+    if snapshot_path is not None:
+        from quant_trader.utils.metrics import SnapshotWriter
+
+        exporters.append(SnapshotWriter(snapshot_path, interval, metrics).start())
+    return exporters
+
+
+def _market_data(settings: Settings):
+    from quant_trader.data.market_data_service import MarketDataService
+
+    return MarketDataService(settings)
+
+
+def _strategy():
+    from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+    return MovingAverageCrossStrategy()
+
+
+def _collect(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.data.binance_client import BinanceClient
+
+    market_data = _market_data(settings)
+    with BinanceClient(settings) as client:
+        market_data.fetch_latest_candles(client, limit=args.limit)
+
 
+def _backfill(args: argparse.Namespace, settings: Settings) -> None:
+    if args.start is None:
+        raise SystemExit("backfill requires --start")
+    from quant_trader.data.binance_client import BinanceClient
+    from quant_trader.data.rate_limit import RequestBudget
+
+    market_data = _market_data(settings)
+    with BinanceClient(settings) as client:
+        market_data.backfill(
+            client,
+            start=_timestamp_arg(args.start),
+            end=_timestamp_arg(args.end) if args.end else None,
+            max_workers=args.max_workers,
+            budget=RequestBudget.per_minute(args.requests_per_minute),
+        )
+
+
+def _migrate(args: argparse.Namespace, settings: Settings) -> None:
+    _market_data(settings).migrate_candles()
+
+
+def _rollup(args: argparse.Namespace, settings: Settings) -> None:
+    _market_data(settings).rebuild_rollups()
+
+
+def _export(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.data.export import CandleExporter
+
+    exporter = CandleExporter(_market_data(settings), args.output, fmt=args.export_format, max_workers=args.max_workers)
+    for result in exporter.export(settings.symbols, full=args.full):
+        print(f"{result.symbol}: {result.rows} new candles -> {result.path}")
+
+
+def _trade(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.data.binance_client import BinanceClient
+    from quant_trader.data.exchange_info import ExchangeInfoCache
+    from quant_trader.engine.trading_engine import TradingEngine
+    from quant_trader.execution.order_executor import PaperTradingBackend
+    from quant_trader.execution.order_manager import OrderManager
+
+    market_data = _market_data(settings)
     with BinanceClient(settings) as client:
-        if args.command == "collect":
-            market_data.fetch_latest_candles(client, limit=args.limit)
-        elif args.command == "export":
-            export_to_csv(market_data, output_dir=args.output, symbols=settings.symbols, limit=args.limit)
-        elif args.command == "trade":
-            backend = PaperTradingBackend() if args.paper else BinanceExecutionBackend(client, args.trade_size)
-            engine = TradingEngine(
-                market_data=market_data,
-                strategies=[strategy],
-                execution_backend=backend,
-                client=client,
-            )
-            engine.run()
+        exchange_info = ExchangeInfoCache.for_client(client, settings).start()
+        if args.paper:
+            backend = PaperTradingBackend(exchange_info=exchange_info)
+        else:
+            backend = OrderManager(
+                client, args.trade_size, exchange_info=exchange_info, workers=args.order_workers
+            ).start()
+        engine = TradingEngine(
+            market_data=market_data,
+            strategies=[_strategy()],
+            execution_backend=backend,
+            client=client,
+            concurrent_fetch=args.concurrent_fetch,
+            workers=args.workers,
+        )
+        try:
+            if args.loop:
+                engine.run_forever(deadline=args.deadline)
+            elif args.stream:
+                import asyncio
+
+                engine.warm_up()
+                asyncio.run(engine.stream())
+            else:
+                engine.run()
+        finally:
+            if isinstance(backend, OrderManager):
+                backend.stop()
+            exchange_info.stop()
+
+
+def _optimize(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.backtesting.optimizer import parameter_grid, run_sweep
+
+    symbol = (args.symbol or settings.symbols[0]).upper()
+    data = _market_data(settings).load_candles(symbol, limit=args.limit)
+    grid = parameter_grid(args.short_windows, args.long_windows)
+    ranked = run_sweep(data, grid, processes=args.processes, top=args.top)
+    print(ranked.to_string())
+
+
+def _portfolio(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.backtesting.portfolio import PortfolioBacktester, load_panel
+
+    backtester = PortfolioBacktester(_strategy(), fee_rate=args.fee_rate, slippage=args.slippage, sizing=args.sizing)
+    result = backtester.run(load_panel(_market_data(settings), settings.symbols, limit=args.limit))
+    print(result.summary().to_string())
+
+
+def _replay(args: argparse.Namespace, settings: Settings) -> None:
+    from quant_trader.engine.trading_engine import TradingEngine
+    from quant_trader.execution.order_executor import FillModel, PaperTradingBackend
+
+    backend = PaperTradingBackend(fill_model=FillModel(slippage=args.slippage, fee_rate=args.fee_rate))
+    # Replays never reach the exchange, so the engine gets no client.
+    engine = TradingEngine(
+        market_data=_market_data(settings), strategies=[_strategy()], execution_backend=backend, client=None
+    )
+    report = engine.replay(
+        start=_timestamp_arg(args.start) if args.start else None,
+        end=_timestamp_arg(args.end) if args.end else None,
+    )
+    print(
+        f"Replayed {report.bars} bars in {report.seconds:.2f}s "
+        f"({report.bars_per_second:,.0f} bars/s), {report.signals} signals"
+    )
+    for name, value in backend.summary(report.last_prices).items():
+        print(f"{name:>15}: {value:,.4f}")
+
+
+COMMANDS = {
+    "collect": _collect,
+    "backfill": _backfill,
+    "migrate": _migrate,
+    "rollup": _rollup,
+    "export": _export,
+    "trade": _trade,
+    "optimize": _optimize,
+    "portfolio": _portfolio,
+    "replay": _replay,
+}
 
 
 if __name__ == "__main__":
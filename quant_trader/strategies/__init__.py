@@ -1,6 +1,37 @@
-"""Strategy exports."""
+"""Strategy exports, imported on first access."""
+from __future__ import annotations
 
-from .base import Signal, Strategy
-from .moving_average import MovingAverageCrossStrategy
+from typing import TYPE_CHECKING
 
-__all__ = ["Signal", "Strategy", "MovingAverageCrossStrategy"]
+from quant_trader.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .base import (
+        Bar,
+        IndicatorStrategy,
+        PanelStrategy,
+        Signal,
+        Strategy,
+        StreamingStrategy,
+        VectorizedStrategy,
+        carry_forward,
+        iter_bars,
+    )
+    from .moving_average import MovingAverageCrossStrategy
+
+__all__ = [
+    "Bar",
+    "IndicatorStrategy",
+    "PanelStrategy",
+    "Signal",
+    "Strategy",
+    "StreamingStrategy",
+    "VectorizedStrategy",
+    "MovingAverageCrossStrategy",
+    "carry_forward",
+    "iter_bars",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {name: "moving_average" if name == "MovingAverageCrossStrategy" else "base" for name in __all__}
+)
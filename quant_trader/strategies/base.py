@@ -2,26 +2,97 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Iterator, Optional, Protocol, Tuple, runtime_checkable
 
+import numpy as np
 import pandas as pd
 
+from quant_trader.indicators import Features, Indicator
+
 
 class Signal:
-    """Represents a trading signal."""
+    """Represents a trading signal.
+
+    ``open_time`` is the open time of the bar that raised the signal, when the
+    strategy knows it; order management derives client order IDs from it,
+    together with ``strategy``, which the engine sets to the name and
+    interval of the strategy that raised it.
+    """
 
-    def __init__(self, symbol: str, side: str, confidence: float, price: float) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        confidence: float,
+        price: float,
+        open_time: Any = None,
+        strategy: Optional[str] = None,
+    ) -> None:
         self.symbol = symbol
         self.side = side
         self.confidence = confidence
         self.price = price
+        self.open_time = open_time
+        self.strategy = strategy
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"Signal(symbol={self.symbol!r}, side={self.side!r}, confidence={self.confidence!r}, price={self.price!r})"
 
 
+@dataclass
+class Bar:
+    """A single candle delivered to incremental strategies."""
+
+    symbol: str
+    open_time: Any
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def iter_bars(data: pd.DataFrame, symbol: str = "") -> Iterator[Bar]:
+    """Yield ``data`` row by row as :class:`Bar` objects without per-row frames.
+
+    Missing price columns are reported as NaN. ``symbol`` is used when the frame
+    has no ``symbol`` column.
+    """
+
+    columns = {}
+    for name in ("open", "high", "low", "close", "volume"):
+        columns[name] = data[name].to_numpy(dtype=float) if name in data else np.full(len(data), np.nan)
+    open_times = data["open_time"].to_numpy()
+    symbols = data["symbol"].to_numpy() if "symbol" in data else None
+    for idx in range(len(data)):
+        yield Bar(
+            symbol=symbols[idx] if symbols is not None else symbol,
+            open_time=open_times[idx],
+            open=float(columns["open"][idx]),
+            high=float(columns["high"][idx]),
+            low=float(columns["low"][idx]),
+            close=float(columns["close"][idx]),
+            volume=float(columns["volume"][idx]),
+        )
+
+
+def carry_forward(signals: np.ndarray) -> np.ndarray:
+    """Hold the most recent non-zero signal until the next one, along the first axis."""
+
+    rows = np.arange(len(signals)).reshape((-1,) + (1,) * (signals.ndim - 1))
+    last_seen = np.where(signals != 0, rows, -1)
+    np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+    held = np.take_along_axis(signals, np.maximum(last_seen, 0), axis=0)
+    return np.where(last_seen >= 0, held, 0).astype(np.int8)
+
+
 class Strategy(Protocol):
-    """Protocol for strategies."""
+    """Protocol for strategies.
+
+    A strategy may also set an ``interval`` attribute (e.g. ``"4h"``) to be
+    evaluated on candles of that interval, derived from the stored
+    ``candles_interval`` candles, instead of the base candles.
+    """
 
     name: str
 
@@ -29,6 +100,64 @@ class Strategy(Protocol):
         ...
 
 
+@runtime_checkable
+class VectorizedStrategy(Strategy, Protocol):
+    """Strategy that can evaluate a whole history in a single pass.
+
+    ``generate_signals`` returns a frame aligned with ``data`` sorted by
+    ``open_time`` holding ``signal``, ``position``, ``confidence`` and
+    ``price`` columns. Row ``i`` must agree with ``generate(data.iloc[: i + 1])``.
+    """
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        ...
+
+
+@runtime_checkable
+class PanelStrategy(Strategy, Protocol):
+    """Strategy that evaluates many symbols at once.
+
+    ``generate_positions`` receives closes as a ``(bars, symbols)`` array,
+    oldest bar first, with NaN where a symbol has no data yet. It returns the
+    position held after each bar (``+1`` long, ``-1`` short, ``0`` flat) in
+    the same shape.
+    """
+
+    def generate_positions(self, closes: np.ndarray) -> np.ndarray:
+        ...
+
+
+@runtime_checkable
+class StreamingStrategy(Strategy, Protocol):
+    """Strategy that consumes one bar at a time with constant work per bar.
+
+    Implementations keep their own per-symbol state, so a single instance can
+    follow several symbols. ``update`` must give the same answer as ``generate``
+    on the history seen so far.
+    """
+
+    def update(self, bar: Bar) -> Signal | None:
+        ...
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        ...
+
+
+@runtime_checkable
+class IndicatorStrategy(Strategy, Protocol):
+    """Strategy that reads shared indicators instead of computing its own.
+
+    ``indicators`` declares every series ``evaluate_features`` looks up, so a
+    caller running several strategies can compute each distinct indicator once
+    per bar and pass the same :class:`Features` to all of them.
+    """
+
+    indicators: Tuple[Indicator, ...]
+
+    def evaluate_features(self, features: Features) -> Signal | None:
+        ...
+
+
 @dataclass
 class StrategyContext:
     symbol: str
@@ -1,41 +1,158 @@
 """Moving average crossover strategy."""
 from __future__ import annotations
 
+import math
+from typing import Dict, Optional
+
+import numpy as np
 import pandas as pd
 
-from .base import Signal
+from quant_trader.indicators import Features, Indicator, sma
+
+from .base import Bar, Signal, carry_forward
+from .rolling import RollingMean
+
+
+def crossover_signals(closes: np.ndarray, short_window: int, long_window: int) -> np.ndarray:
+    """Return ``+1``/``-1``/``0`` for bars where the short MA crosses the long MA."""
+
+    return crossover_from_means(sma(closes, short_window), sma(closes, long_window))
+
+
+def crossover_from_means(short_ma: np.ndarray, long_ma: np.ndarray) -> np.ndarray:
+    """Crossover signals from precomputed short and long moving averages."""
+
+    previous_short = np.roll(short_ma, 1, axis=0)
+    previous_long = np.roll(long_ma, 1, axis=0)
+    previous_short[:1] = np.nan
+    previous_long[:1] = np.nan
+
+    signals = np.zeros(short_ma.shape, dtype=np.int8)
+    signals[(previous_short < previous_long) & (short_ma > long_ma)] = 1
+    signals[(previous_short > previous_long) & (short_ma < long_ma)] = -1
+    return signals
+
+
+class _CrossState:
+    """Per-symbol incremental state for :class:`MovingAverageCrossStrategy`."""
+
+    __slots__ = ("short", "long", "previous_short", "previous_long")
+
+    def __init__(self, short_window: int, long_window: int) -> None:
+        self.short = RollingMean(short_window)
+        self.long = RollingMean(long_window)
+        self.previous_short = math.nan
+        self.previous_long = math.nan
 
 
 class MovingAverageCrossStrategy:
-    """Simple moving average crossover strategy."""
+    """Simple moving average crossover strategy.
+
+    ``interval`` runs it on candles of a longer interval than the configured
+    ``candles_interval`` (e.g. ``"4h"`` over 1h candles), derived by the
+    engine from stored candles.
+    """
 
     name = "moving_average_cross"
 
-    def __init__(self, short_window: int = 10, long_window: int = 30, min_confidence: float = 0.55) -> None:
+    def __init__(
+        self,
+        short_window: int = 10,
+        long_window: int = 30,
+        min_confidence: float = 0.55,
+        interval: Optional[str] = None,
+    ) -> None:
         if short_window >= long_window:
             raise ValueError("short_window must be less than long_window")
+        self.interval = interval
         self.short_window = short_window
         self.long_window = long_window
         self.min_confidence = min_confidence
+        self.indicators = (Indicator("sma", short_window), Indicator("sma", long_window))
+        # A crossover compares the means of the last two bars.
+        self.lookback = long_window + 1
+        self._states: Dict[str, _CrossState] = {}
 
     def generate(self, data: pd.DataFrame) -> Signal | None:
         if len(data) < self.long_window:
             return None
+        ordered = data if data["open_time"].is_monotonic_increasing else data.sort_values("open_time")
+        # Only the last long_window + 1 bars can decide the latest crossover.
+        return self.evaluate_features(Features(ordered.iloc[-(self.long_window + 1) :]))
+
+    def evaluate_features(self, features: Features) -> Signal | None:
+        if len(features) < self.long_window:
+            return None
 
-        closes = data.sort_values("open_time")["close"]
-        short_ma = closes.rolling(window=self.short_window).mean().iloc[-1]
-        long_ma = closes.rolling(window=self.long_window).mean().iloc[-1]
+        short_ma, long_ma = (features[indicator] for indicator in self.indicators)
+        side = crossover_from_means(short_ma[-2:], long_ma[-2:])[-1]
+        price = float(features.column("close")[-1])
+        symbol = features.data["symbol"].iloc[-1] if "symbol" in features.data else ""
+        open_time = features.data["open_time"].iloc[-1] if "open_time" in features.data else None
+        if side > 0:
+            return Signal(symbol=symbol, side="BUY", confidence=self.min_confidence, price=price, open_time=open_time)
+        if side < 0:
+            return Signal(symbol=symbol, side="SELL", confidence=self.min_confidence, price=price, open_time=open_time)
+        return None
 
-        previous_short = closes.rolling(window=self.short_window).mean().iloc[-2]
-        previous_long = closes.rolling(window=self.long_window).mean().iloc[-2]
+    def update(self, bar: Bar) -> Signal | None:
+        """Advance the state for ``bar.symbol`` by one bar in constant time.
 
-        price = float(closes.iloc[-1])
+        Bars with a non-finite close are ignored so that a single bad print
+        cannot poison the running sums.
+        """
 
-        if pd.isna(short_ma) or pd.isna(long_ma):
+        if not math.isfinite(bar.close):
             return None
+        state = self._states.get(bar.symbol)
+        if state is None:
+            state = self._states[bar.symbol] = _CrossState(self.short_window, self.long_window)
+
+        state.short.push(bar.close)
+        state.long.push(bar.close)
+        if not state.long.ready:
+            return None
+
+        short_ma = state.short.mean
+        long_ma = state.long.mean
+        previous_short, previous_long = state.previous_short, state.previous_long
+        state.previous_short, state.previous_long = short_ma, long_ma
 
         if previous_short < previous_long and short_ma > long_ma:
-            return Signal(symbol=data["symbol"].iloc[-1] if "symbol" in data else "", side="BUY", confidence=self.min_confidence, price=price)
+            return Signal(bar.symbol, "BUY", self.min_confidence, bar.close, open_time=bar.open_time)
         if previous_short > previous_long and short_ma < long_ma:
-            return Signal(symbol=data["symbol"].iloc[-1] if "symbol" in data else "", side="SELL", confidence=self.min_confidence, price=price)
+            return Signal(bar.symbol, "SELL", self.min_confidence, bar.close, open_time=bar.open_time)
         return None
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
+
+    def generate_positions(self, closes: np.ndarray) -> np.ndarray:
+        """Positions (``+1``/``-1``/``0``) for a ``(bars, symbols)`` panel of closes."""
+
+        return carry_forward(crossover_signals(closes, self.short_window, self.long_window))
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Evaluate every bar of ``data`` in one pass.
+
+        Row ``i`` of the result matches what :meth:`generate` returns for
+        ``data.iloc[: i + 1]``. Columns are ``signal`` (``+1`` buy, ``-1`` sell,
+        ``0`` none), ``position`` (last signal carried forward), ``confidence``
+        and ``price``.
+        """
+
+        features = Features(data)
+        short_ma, long_ma = (features[indicator] for indicator in self.indicators)
+        signals = crossover_from_means(short_ma, long_ma)
+        return pd.DataFrame(
+            {
+                "signal": signals,
+                "position": carry_forward(signals),
+                "confidence": self.min_confidence,
+                "price": features.column("close"),
+            },
+            index=features.data.index,
+        )
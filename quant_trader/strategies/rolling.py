@@ -0,0 +1,57 @@
+"""Fixed-size rolling state for incremental strategies."""
+from __future__ import annotations
+
+import math
+from typing import List
+
+
+class RollingMean:
+    """Ring buffer with a running sum, giving O(1) updates of a trailing mean.
+
+    The running sum is rebuilt from the buffer once per full revolution, which
+    keeps floating point drift bounded on long-running streams at an amortised
+    cost of one extra add per update.
+    """
+
+    __slots__ = ("window", "_values", "_index", "_count", "_total", "_since_rebuild")
+
+    def __init__(self, window: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._values: List[float] = [0.0] * window
+        self._index = 0
+        self._count = 0
+        self._total = 0.0
+        self._since_rebuild = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    @property
+    def mean(self) -> float:
+        return self._total / self.window if self.ready else math.nan
+
+    def push(self, value: float) -> None:
+        outgoing = self._values[self._index]
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self.window
+        if self._count < self.window:
+            self._count += 1
+            self._total += value
+            return
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._total = math.fsum(self._values)
+            self._since_rebuild = 0
+        else:
+            self._total += value - outgoing
+
+    def clear(self) -> None:
+        self._values = [0.0] * self.window
+        self._index = 0
+        self._count = 0
+        self._total = 0.0
+        self._since_rebuild = 0
@@ -1,5 +1,6 @@
 """Utility exports."""
 
 from .logging import configure_logging
+from .metrics import MetricsRegistry, MetricsServer, SnapshotWriter, metrics
 
-__all__ = ["configure_logging"]
+__all__ = ["MetricsRegistry", "MetricsServer", "SnapshotWriter", "configure_logging", "metrics"]
@@ -0,0 +1,35 @@
+"""Package exports that are imported on first use."""
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Callable, List, Mapping, Tuple
+
+
+def lazy_exports(package: str, exports: Mapping[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Module-level ``__getattr__`` and ``__dir__`` for ``package`` (PEP 562).
+
+    ``exports`` maps each exported name to the submodule, relative to
+    ``package``, that defines it; a name mapped to ``""`` is a submodule
+    itself. Nothing is imported until a name is first looked up, after which
+    it is cached in the package namespace.
+    """
+
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        if module:
+            value = getattr(importlib.import_module(f"{package}.{module}"), name)
+        else:
+            value = importlib.import_module(f"{package}.{name}")
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,287 @@
+"""In-process metrics with Prometheus and JSON export.
+
+Modules record into the shared :data:`metrics` registry, much like they log
+through module loggers. The registry starts disabled; in that state every
+call returns immediately and :meth:`MetricsRegistry.timer` hands back one
+shared no-op context manager, so instrumented hot paths cost a single
+attribute check.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_PREFIX = "quant_trader_"
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count", "maximum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * (size + 1)
+        self.total = 0.0
+        self.count = 0
+        self.maximum = 0.0
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_labels", "_started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Dict[str, Any]) -> None:
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._registry.observe(self._name, time.perf_counter() - self._started, **self._labels)
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and latency histograms keyed by name and labels."""
+
+    def __init__(self, enabled: bool = False, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, _LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, _LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, _LabelKey], _Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = float(value)
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets))
+            histogram.counts[slot] += 1
+            histogram.total += seconds
+            histogram.count += 1
+            histogram.maximum = max(histogram.maximum, seconds)
+
+    def timer(self, name: str, **labels: Any):
+        """Context manager recording the duration of its block into histogram ``name``."""
+
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All current values as a JSON-serialisable dict."""
+
+        with self._lock:
+            counters = [_entry(key, value=value) for key, value in sorted(self._counters.items())]
+            gauges = [_entry(key, value=value) for key, value in sorted(self._gauges.items())]
+            histograms = [
+                _entry(
+                    key,
+                    count=histogram.count,
+                    sum=histogram.total,
+                    mean=histogram.total / histogram.count if histogram.count else 0.0,
+                    max=histogram.maximum,
+                    buckets=dict(zip([*map(str, self.buckets), "+Inf"], _cumulative(histogram.counts))),
+                )
+                for key, histogram in sorted(self._histograms.items())
+            ]
+        return {"timestamp": time.time(), "counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+
+        lines: List[str] = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} {kind}")
+                    for (series_name, labels), value in sorted(series.items()):
+                        if series_name == name:
+                            lines.append(f"{PROMETHEUS_PREFIX}{name}{_format_labels(labels)} {_number(value)}")
+            bounds = [*map(_number, self.buckets), "+Inf"]
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} histogram")
+                for (series_name, labels), histogram in sorted(self._histograms.items()):
+                    if series_name != name:
+                        continue
+                    for bound, count in zip(bounds, _cumulative(histogram.counts)):
+                        bucket_labels = _format_labels(labels + (("le", bound),))
+                        lines.append(f"{PROMETHEUS_PREFIX}{name}_bucket{bucket_labels} {count}")
+                    lines.append(f"{PROMETHEUS_PREFIX}{name}_sum{_format_labels(labels)} {_number(histogram.total)}")
+                    lines.append(f"{PROMETHEUS_PREFIX}{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Registry shared by the data, strategy, engine and execution modules.
+metrics = MetricsRegistry()
+
+
+class MetricsServer:
+    """Serves ``/metrics`` (Prometheus text) and ``/metrics.json`` from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry = metrics, host: str = "127.0.0.1", port: int = 9102) -> None:
+        # Imported here so that processes not serving metrics skip loading http.server.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?")[0]
+                if path == "/metrics":
+                    body = registry.to_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/metrics.json":
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info("Serving metrics on http://%s:%s/metrics", *self._server.server_address[:2])
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class SnapshotWriter:
+    """Writes :meth:`MetricsRegistry.snapshot` to ``path`` every ``interval`` seconds.
+
+    Each file is replaced atomically, so readers never see a partial snapshot.
+    """
+
+    def __init__(self, path: Path, interval: float = 60.0, registry: MetricsRegistry = metrics) -> None:
+        self.path = Path(path)
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary.write_text(json.dumps(self.registry.snapshot()))
+        os.replace(temporary, self.path)
+
+    def start(self) -> "SnapshotWriter":
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as exc:  # pragma: no cover - logging path
+                logger.warning("Failed to write metrics snapshot: %s", exc)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+
+def _label_key(labels: Dict[str, Any]) -> _LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _entry(key: Tuple[str, _LabelKey], **values: Any) -> Dict[str, Any]:
+    name, labels = key
+    return {"name": name, "labels": dict(labels), **values}
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    total = 0
+    result = []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _format_labels(labels: _LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
@@ -0,0 +1,197 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import pytest
+
+from quant_trader.config import Settings
+
+
+def _exchange_symbol(symbol: str, *, tick: str, step: str, min_qty: str, min_notional: str) -> dict:
+    return {
+        "symbol": symbol,
+        "status": "TRADING",
+        "baseAsset": symbol[:-4],
+        "quoteAsset": symbol[-4:],
+        "orderTypes": ["LIMIT", "MARKET"],
+        "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": tick, "maxPrice": "1000000.00", "tickSize": tick},
+            {"filterType": "LOT_SIZE", "minQty": min_qty, "maxQty": "9000.00000000", "stepSize": step},
+            {"filterType": "MARKET_LOT_SIZE", "minQty": "0.0", "maxQty": "100.0", "stepSize": "0.0"},
+            {
+                "filterType": "NOTIONAL",
+                "minNotional": min_notional,
+                "applyMinToMarket": True,
+                "maxNotional": "9000000.00",
+                "applyMaxToMarket": False,
+                "avgPriceMins": 5,
+            },
+        ],
+    }
+
+
+class StubBinance:
+    """In-process stand-in for the Binance REST API."""
+
+    def __init__(self) -> None:
+        self.klines: Dict[str, List[list]] = {}
+        self.requests: List[tuple] = []
+        self.failures: Dict[str, List[tuple]] = {}
+        self.clock_offset_ms = 0
+        self.used_weight = 0
+        self.exchange_symbols: List[dict] = [
+            _exchange_symbol("BTCUSDT", tick="0.01", step="0.00001", min_qty="0.00001", min_notional="5"),
+            _exchange_symbol("ETHUSDT", tick="0.01", step="0.0001", min_qty="0.0001", min_notional="5"),
+        ]
+        self.orders: Dict[str, dict] = {}
+        self.lost_responses: Dict[str, int] = {}
+        self.order_delay = 0.0
+        self.lock = threading.Lock()
+
+    def fail_next(self, path: str, status: int, times: int = 1, headers: Dict[str, str] | None = None) -> None:
+        self.failures.setdefault(path, []).extend([(status, {"code": -1, "msg": "injected"}, headers or {})] * times)
+
+    def lose_next_response(self, path: str, times: int = 1) -> None:
+        """Process the next request to ``path`` but answer with a gateway timeout."""
+
+        self.lost_responses[path] = self.lost_responses.get(path, 0) + times
+
+    def server_time(self) -> int:
+        return int(time.time() * 1000) + self.clock_offset_ms
+
+    def add_series(self, symbol: str, start_ms: int, periods: int, step_ms: int = 60_000, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        closes = 100 + np.cumsum(rng.normal(0, 1, periods))
+        rows = []
+        for idx, close in enumerate(closes):
+            open_time = start_ms + idx * step_ms
+            price = f"{close:.8f}"
+            rows.append(
+                [open_time, price, price, price, price, "1.5", open_time + step_ms - 1, "150.0", 10, "0.7", "70.0", "0"]
+            )
+        self.klines[symbol] = rows
+
+    def handle(self, method: str, path: str, params: Dict[str, str], query: str = ""):
+        with self.lock:
+            self.requests.append((method, path, params))
+            self.used_weight += 1
+            pending = self.failures.get(path)
+            if pending:
+                return pending.pop(0)
+        if "signature" in params:
+            payload, _, signature = query.rpartition("&signature=")
+            expected = hmac.new(b"secret", payload.encode(), hashlib.sha256).hexdigest()
+            if signature != expected:
+                return 400, {"code": -1022, "msg": "Signature for this request is not valid."}
+        if "signature" in params and abs(int(params["timestamp"]) - self.server_time()) > 1000:
+            return 400, {"code": -1021, "msg": "Timestamp for this request is outside of the recvWindow."}
+        if path == "/api/v3/time":
+            return 200, {"serverTime": self.server_time()}
+        if path == "/api/v3/account":
+            return 200, {"balances": []}
+        if path == "/api/v3/order" and method == "POST":
+            time.sleep(self.order_delay)
+            order = {"symbol": params["symbol"], "side": params["side"], "status": "FILLED"}
+            if "newClientOrderId" in params:
+                client_id = params["newClientOrderId"]
+                with self.lock:
+                    if client_id in self.orders:
+                        return 400, {"code": -2010, "msg": "Duplicate order sent."}
+                    order.update(
+                        orderId=len(self.orders) + 1,
+                        clientOrderId=client_id,
+                        executedQty=params["quantity"],
+                        cummulativeQuoteQty=str(float(params["quantity"]) * 100.0),
+                    )
+                    self.orders[client_id] = order
+            return self._maybe_lose(path, (200, order))
+        if path == "/api/v3/order" and method == "GET":
+            order = self.orders.get(params["origClientOrderId"])
+            if order is None:
+                return 400, {"code": -2013, "msg": "Order does not exist."}
+            return 200, order
+        if path == "/api/v3/klines":
+            rows = self.klines.get(params["symbol"], [])
+            start = int(params.get("startTime", 0))
+            end = int(params.get("endTime", 2**63))
+            limit = int(params.get("limit", 500))
+            selected = [row for row in rows if start <= row[0] <= end]
+            if "startTime" not in params:
+                return 200, selected[-limit:]
+            return 200, selected[:limit]
+        if path == "/api/v3/exchangeInfo":
+            return 200, {"timezone": "UTC", "serverTime": self.server_time(), "symbols": self.exchange_symbols}
+        if path == "/api/v3/ping":
+            return 200, {}
+        return 404, {"code": -1, "msg": f"unknown path {path}"}
+
+    def _maybe_lose(self, path: str, result: tuple) -> tuple:
+        with self.lock:
+            if self.lost_responses.get(path):
+                self.lost_responses[path] -= 1
+                return 504, {"code": -1, "msg": "lost"}
+        return result
+
+
+def _make_handler(stub: StubBinance):
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self, method: str) -> None:
+            parsed = urlparse(self.path)
+            params = dict(parse_qsl(parsed.query))
+            status, payload, *extra = stub.handle(method, parsed.path, params, parsed.query)
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            for name, value in (extra[0] if extra else {}).items():
+                self.send_header(name, value)
+            self.send_header("X-MBX-USED-WEIGHT-1M", str(stub.used_weight))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            self._respond("GET")
+
+        def do_POST(self) -> None:
+            self._respond("POST")
+
+        def do_DELETE(self) -> None:
+            self._respond("DELETE")
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def binance_stub():
+    stub = StubBinance()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(stub))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def settings(tmp_path, binance_stub) -> Settings:
+    return Settings(
+        binance_api_key="key",
+        binance_api_secret="secret",
+        base_url=binance_stub.url,
+        database_url=f"sqlite:///{tmp_path / 'candles.db'}",
+        symbols=("BTCUSDT", "ETHUSDT"),
+        candles_interval="1m",
+        cache_dir=tmp_path / "cache",
+    )
@@ -0,0 +1,40 @@
+import asyncio
+
+from quant_trader.data.async_binance_client import AsyncBinanceClient
+from quant_trader.data.market_data_service import MarketDataService
+
+START = 1_672_531_200_000
+
+
+def test_async_client_fans_out_symbols_over_pooled_connections(settings, binance_stub):
+    symbols = [f"SYM{idx}USDT" for idx in range(60)]
+    for idx, symbol in enumerate(symbols):
+        binance_stub.add_series(symbol, START, 50, seed=idx)
+    service = MarketDataService(settings)
+
+    async def run():
+        async with AsyncBinanceClient(settings) as client:
+            counts = await service.afetch_latest_candles(client, limit=20, symbols=symbols)
+            assert len(client.session.connector._conns) <= settings.http_pool_size
+            return counts
+
+    counts = asyncio.run(run())
+    assert counts == {symbol: 20 for symbol in symbols}
+    assert len(service.load_candles("SYM59USDT", limit=100)) == 20
+
+
+def test_async_client_signs_and_retries(settings, binance_stub):
+    binance_stub.fail_next("/api/v3/ping", 503)
+    binance_stub.clock_offset_ms = 3_000
+
+    async def run():
+        async with AsyncBinanceClient(settings) as client:
+            client.scheduler.backoff_base = 0.01
+            await client.ping()
+            order = await client.create_order(symbol="btcusdt", side="buy", type_="market", quantity=0.001)
+            return client, order
+
+    client, order = asyncio.run(run())
+    assert order["status"] == "FILLED"
+    assert client.stats.retried == 1
+    assert 2_000 < client.scheduler.time_offset_ms < 4_000
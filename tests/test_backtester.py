@@ -0,0 +1,100 @@
+import dataclasses
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.backtesting.backtester import Backtester
+from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+
+def _random_walk(periods: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2023-01-01", periods=periods, freq="h"),
+            "close": closes,
+            "symbol": "BTCUSDT",
+        }
+    )
+
+
+def test_vectorized_backtest_matches_per_bar_loop():
+    data = _random_walk(400).sample(frac=1, random_state=1)
+    strategy = MovingAverageCrossStrategy(short_window=5, long_window=20)
+
+    fast = Backtester(strategy).run(data)
+    slow = Backtester(strategy, mode="per_bar").run(data)
+
+    assert fast.trades == slow.trades > 0
+    assert [(s.side, s.price, s.symbol) for s in fast.signals] == [(s.side, s.price, s.symbol) for s in slow.signals]
+    assert fast.returns == pytest.approx(slow.returns, rel=1e-12)
+
+
+def test_generate_signals_rows_match_generate_on_prefix():
+    data = _random_walk(120)
+    strategy = MovingAverageCrossStrategy(short_window=3, long_window=8)
+    frame = strategy.generate_signals(data)
+
+    for idx in range(len(data)):
+        signal = strategy.generate(data.iloc[: idx + 1])
+        expected = 0 if signal is None else (1 if signal.side == "BUY" else -1)
+        assert frame["signal"].iat[idx] == expected
+
+
+def test_streaming_backtest_matches_vectorized():
+    data = _random_walk(600, seed=11)
+    strategy = MovingAverageCrossStrategy(short_window=5, long_window=20)
+
+    fast = Backtester(strategy, mode="vectorized").run(data)
+    streamed = Backtester(strategy, mode="streaming").run(data)
+
+    assert streamed.trades == fast.trades > 0
+    assert [(s.side, s.price, s.open_time) for s in streamed.signals] == [
+        (s.side, s.price, s.open_time) for s in fast.signals
+    ]
+    assert streamed.returns == pytest.approx(fast.returns, rel=1e-9)
+
+
+def _stored(settings, store, periods):
+    settings = dataclasses.replace(settings, candle_store=store, symbols=("BTCUSDT",))
+    service = MarketDataService(settings)
+    data = _random_walk(periods, seed=3)
+    data["open"] = data["high"] = data["low"] = data["close"]
+    data["volume"] = 1.0
+    data["close_time"] = data["open_time"] + pd.Timedelta(minutes=59)
+    service._persist_candles("BTCUSDT", data)
+    return service
+
+
+@pytest.mark.parametrize("store", ["sql", "columnar"])
+@pytest.mark.parametrize("mode", ["vectorized", "streaming", "per_bar"])
+def test_chunked_backtest_matches_in_memory_run(settings, store, mode):
+    service = _stored(settings, store, 3000 if mode != "per_bar" else 400)
+    backtester = Backtester(MovingAverageCrossStrategy(short_window=5, long_window=20), mode=mode)
+
+    whole = backtester.run(service.load_candles("BTCUSDT", limit=None))
+    chunked = backtester.run_chunks(service.iter_candles("BTCUSDT", chunk_size=97))
+
+    assert chunked.trades == whole.trades > 0
+    assert [(s.side, s.price, s.open_time) for s in chunked.signals] == [
+        (s.side, s.price, s.open_time) for s in whole.signals
+    ]
+    assert chunked.returns == pytest.approx(whole.returns, rel=1e-12)
+
+
+def test_chunked_backtest_memory_does_not_grow_with_history(settings):
+    backtester = Backtester(MovingAverageCrossStrategy(short_window=5, long_window=20))
+    peaks = []
+    for periods in (5_000, 40_000):
+        service = _stored(settings, "sql", periods)
+        tracemalloc.start()
+        try:
+            backtester.run_chunks(service.iter_candles("BTCUSDT", chunk_size=2_000))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    assert peaks[1] < peaks[0] * 1.5
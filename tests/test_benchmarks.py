@@ -0,0 +1,34 @@
+import json
+
+import pandas as pd
+
+from benchmarks.run import CASES, main, run_benchmarks
+from benchmarks.synthetic import synthetic_candles, synthetic_klines
+from quant_trader.data.market_data_service import CANDLE_COLUMNS
+
+
+def test_synthetic_data_is_seeded_and_well_formed():
+    frame = synthetic_candles(500, seed=4)
+    pd.testing.assert_frame_equal(frame, synthetic_candles(500, seed=4))
+    assert list(frame.columns) == CANDLE_COLUMNS
+    assert (frame["high"] >= frame[["open", "close"]].max(axis=1)).all()
+    assert (frame["low"] <= frame[["open", "close"]].min(axis=1)).all()
+    rows = synthetic_klines(3, seed=4)
+    assert len(rows[0]) == 12 and rows[1][0] - rows[0][0] == 60_000
+
+
+def test_suite_records_results_and_compare_flags_regressions(tmp_path, capsys):
+    report = run_benchmarks([200], repeat=1)
+    assert {row["case"] for row in report["results"]} == set(CASES)
+    assert all(row["throughput"] > 0 and row["peak_bytes"] > 0 for row in report["results"])
+
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(report))
+    assert main(["compare", str(current), str(current)]) == 0
+
+    faster = json.loads(json.dumps(report))
+    faster["results"][0]["throughput"] *= 10
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(faster))
+    assert main(["compare", str(baseline), str(current), "--threshold", "0.5"]) == 1
+    assert "REGRESSION backtester.run @ 200" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.rate_limit import RequestBudget, RequestScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_request_budget_waits_for_tokens():
+    clock = FakeClock()
+    budget = RequestBudget(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+    assert budget.acquire() == 0 and budget.acquire() == 0
+    assert budget.acquire() == 0.1
+    budget.limit_available(0)
+    assert budget.reserve(2) == 0.2
+
+
+def _scheduler(clock: FakeClock = None, **kwargs) -> RequestScheduler:
+    clock = clock or FakeClock()
+    return RequestScheduler(clock=clock, sleep=clock.sleep, jitter=lambda: 1.0, **kwargs)
+
+
+def test_client_retries_throttled_and_transient_responses(settings, binance_stub):
+    binance_stub.fail_next("/api/v3/ping", 429, headers={"Retry-After": "2"})
+    binance_stub.fail_next("/api/v3/ping", 503, times=2)
+    clock = FakeClock()
+    scheduler = _scheduler(clock, backoff_base=0.25)
+
+    with BinanceClient(settings, scheduler=scheduler) as client:
+        assert client.ping() == {}
+
+    assert clock.sleeps == [2.0, 0.5, 1.0]
+    assert client.stats.retried == 3
+    assert client.stats.throttled == 1
+    assert client.stats.used_weight == 4
+
+
+def test_client_does_not_retry_unsafe_methods_on_server_errors(settings, binance_stub):
+    import pytest
+    import requests
+
+    binance_stub.fail_next("/api/v3/order", 503)
+    with BinanceClient(settings, scheduler=_scheduler()) as client:
+        client.scheduler.time_synced = True
+        with pytest.raises(requests.HTTPError):
+            client.create_order(symbol="BTCUSDT", side="BUY", type_="MARKET", quantity=1)
+    assert client.stats.retried == 0
+
+
+def test_client_throttles_on_used_weight_header(settings, binance_stub):
+    clock = FakeClock()
+    scheduler = _scheduler(clock, weight_per_minute=60)
+    binance_stub.used_weight = 59
+    with BinanceClient(settings, scheduler=scheduler) as client:
+        client.ping()
+        client.ping()
+    assert client.stats.throttled == 1
+    assert clock.sleeps == [1.0]
+
+
+def test_signed_requests_follow_server_clock(settings, binance_stub):
+    binance_stub.clock_offset_ms = 5_000
+    with BinanceClient(settings) as client:
+        assert client.get_account() == {"balances": []}
+        assert 4_000 < client.scheduler.time_offset_ms < 6_000
+
+        binance_stub.clock_offset_ms = -5_000
+        assert client.get_account() == {"balances": []}
+        assert client.stats.time_syncs == 2
+
+
+def test_signed_order_parameters_match_signature(settings, binance_stub):
+    with BinanceClient(settings) as client:
+        order = client.create_order(symbol="btcusdt", side="sell", type_="limit", quantity=0.5, price=100.0, time_in_force="GTC")
+    assert order == {"symbol": "BTCUSDT", "side": "SELL", "status": "FILLED"}
@@ -0,0 +1,84 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+
+from quant_trader.data.candle_cache import CandleCache
+from quant_trader.data.market_data_service import MarketDataService
+
+START = 1_672_531_200_000
+
+
+def _frame(start_ms: int, periods: int, close: float = 1.0) -> pd.DataFrame:
+    open_times = pd.to_datetime([start_ms + idx * 60_000 for idx in range(periods)], unit="ms", utc=True)
+    closes = close + np.arange(periods, dtype=float)
+    return pd.DataFrame(
+        {
+            "open_time": open_times,
+            "open": closes,
+            "high": closes,
+            "low": closes,
+            "close": closes,
+            "volume": 1.0,
+            "close_time": open_times + pd.Timedelta(seconds=59),
+        }
+    )
+
+
+def test_window_keeps_latest_rows_contiguous_and_evicts_lru():
+    cache = CandleCache(capacity=4, max_symbols=2)
+    cache.seed("BTCUSDT", _frame(START, 3), complete=True)
+    for idx in range(3, 12):
+        cache.update("BTCUSDT", _frame(START + idx * 60_000, 1, close=1.0 + idx))
+        latest = cache.get("BTCUSDT", 3)
+        assert latest["close"].tolist() == [float(idx - 1), float(idx), float(idx + 1)]
+        assert latest["close"].to_numpy().base is not None
+    assert cache.get("BTCUSDT", 5) is None
+
+    cache.seed("ETHUSDT", _frame(START, 2), complete=True)
+    cache.get("BTCUSDT", 1)
+    cache.seed("BNBUSDT", _frame(START, 2), complete=True)
+    assert "ETHUSDT" not in cache and "BTCUSDT" in cache
+
+
+def test_latest_candles_tracks_persisted_rows_without_reloading(settings, monkeypatch):
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", _frame(START, 50))
+    first = service.latest_candles("BTCUSDT", limit=10)
+    assert first["close"].tolist() == service.load_candles("BTCUSDT", limit=10)["close"].tolist()[::-1]
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("expected a cache hit")
+
+    monkeypatch.setattr(service, "load_candles", no_reads)
+    service._persist_candles("BTCUSDT", _frame(START + 49 * 60_000, 3, close=100.0))
+    latest = service.latest_candles("BTCUSDT", limit=3)
+    assert latest["close"].tolist() == [100.0, 101.0, 102.0]
+    assert latest["open_time"].is_monotonic_increasing
+    assert service.cache.misses == 1
+
+    # An engine cycle re-fetches the last few bars; the overlap is overwritten in place.
+    service._persist_candles("BTCUSDT", _frame(START + 48 * 60_000, 5, close=200.0))
+    latest = service.latest_candles("BTCUSDT", limit=6)
+    assert latest["close"].tolist() == [48.0, 200.0, 201.0, 202.0, 203.0, 204.0]
+    assert latest["open_time"].is_unique and service.cache.misses == 1
+
+    # Filling a gap inside the window rebuilds it from the store.
+    service._persist_candles("BTCUSDT", _frame(START + 60 * 60_000, 2, close=9.0))
+    service._persist_candles("BTCUSDT", _frame(START + 58 * 60_000, 1, close=8.0))
+    assert "BTCUSDT" not in service.cache
+    monkeypatch.undo()
+    assert service.latest_candles("BTCUSDT", limit=61)["close"].iloc[-3:].tolist() == [8.0, 9.0, 10.0]
+
+
+def test_writes_before_the_cached_window_invalidate_it(settings):
+    service = MarketDataService(dataclasses.replace(settings, candle_cache_size=20))
+    service._persist_candles("BTCUSDT", _frame(START, 50))
+    service.latest_candles("BTCUSDT", limit=10)
+
+    service._persist_candles("BTCUSDT", _frame(START + 45 * 60_000, 5, close=7.0))
+    assert "BTCUSDT" in service.cache
+    service._persist_candles("BTCUSDT", _frame(START + 20 * 60_000, 12, close=3.0))
+    assert "BTCUSDT" not in service.cache
+    latest = service.latest_candles("BTCUSDT", limit=20)["close"].tolist()
+    assert latest[:2] == [13.0, 14.0] and latest[-5:] == [7.0, 8.0, 9.0, 10.0, 11.0]
@@ -0,0 +1,104 @@
+import dataclasses
+import json
+from decimal import Decimal
+
+import pytest
+
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.exchange_info import ExchangeInfoCache, OrderRejected, SymbolFilters
+from quant_trader.execution.order_executor import BinanceExecutionBackend
+from quant_trader.strategies.base import Signal
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _exchange_info_calls(stub):
+    return sum(1 for _, path, _ in stub.requests if path == "/api/v3/exchangeInfo")
+
+
+def test_cache_persists_payload_and_refreshes_after_ttl(settings, binance_stub):
+    clock = FakeClock()
+    path = settings.cache_dir / "exchange_info.json"
+    with BinanceClient(settings) as client:
+        cache = ExchangeInfoCache(client.get_exchange_info, path, ttl=60, clock=clock)
+        filters = cache.get("btcusdt")
+        assert str(filters.step_size) == "0.00001" and str(filters.min_notional) == "5"
+        assert cache.get("DOGEUSDT") is None
+        assert json.loads(path.read_text())["fetched_at"] == 1_000.0
+
+        restarted = ExchangeInfoCache(client.get_exchange_info, path, ttl=60, clock=clock)
+        assert restarted.get("ETHUSDT").symbol == "ETHUSDT"
+        assert _exchange_info_calls(binance_stub) == 1
+
+        clock.now += 61
+        binance_stub.fail_next("/api/v3/exchangeInfo", 400)
+        assert restarted.get("ETHUSDT") is not None
+        assert restarted.stale
+        # Failed refreshes are not retried on every lookup during an outage.
+        for _ in range(5):
+            restarted.get("ETHUSDT")
+        assert restarted.stale and _exchange_info_calls(binance_stub) == 2
+        clock.now += restarted.retry_interval
+        restarted.get("ETHUSDT")
+        assert not restarted.stale and _exchange_info_calls(binance_stub) == 3
+
+
+def test_prepare_order_rounds_to_filters_and_rejects_locally(settings, binance_stub):
+    with BinanceClient(settings) as client:
+        cache = ExchangeInfoCache(client.get_exchange_info, ttl=60)
+        assert cache.prepare_order("BTCUSDT", "BUY", 0.0012345, market_price=30_000) == (0.00123, None)
+        assert cache.prepare_order("BTCUSDT", "SELL", 0.5, 100.456) == (0.5, 100.46)
+        assert cache.prepare_order("BTCUSDT", "BUY", 0.5, 100.456) == (0.5, 100.45)
+        with pytest.raises(OrderRejected, match="notional"):
+            cache.prepare_order("BTCUSDT", "BUY", 0.0001, market_price=30_000)
+        with pytest.raises(OrderRejected, match="minimum"):
+            cache.prepare_order("ETHUSDT", "BUY", 0.00005, market_price=2_000)
+        with pytest.raises(OrderRejected, match="not listed"):
+            cache.prepare_order("DOGEUSDT", "BUY", 1, market_price=0.1)
+
+        backend = BinanceExecutionBackend(client, trade_size=0.0012345, exchange_info=cache)
+        backend.execute(Signal("BTCUSDT", "BUY", 0.9, 30_000.0))
+        backend.trade_size = 0.0001
+        backend.execute(Signal("BTCUSDT", "BUY", 0.9, 30_000.0))
+
+    orders = [params for _, path, params in binance_stub.requests if path == "/api/v3/order"]
+    assert [order["quantity"] for order in orders] == ["0.00123"]
+
+
+def test_market_orders_are_bounded_by_market_lot_size():
+    filters = SymbolFilters.from_payload(
+        {
+            "symbol": "BTCUSDT",
+            "filters": [
+                {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "9000", "stepSize": "0.001"},
+                {"filterType": "MARKET_LOT_SIZE", "minQty": "0.0", "maxQty": "100.0", "stepSize": "0.0"},
+            ],
+        }
+    )
+    filters.check(500.0)
+    with pytest.raises(OrderRejected, match="above the maximum 100"):
+        filters.check(500.0, market=True)
+    with pytest.raises(OrderRejected, match="below the minimum 0.001"):
+        filters.check(0.0005, market=True)
+    assert filters.round_quantity(1.23456, market=True) == 1.234
+
+    strict = dataclasses.replace(filters, market_min_qty=Decimal("0.01"), market_step_size=Decimal("0.01"))
+    with pytest.raises(OrderRejected, match="below the minimum 0.01"):
+        strict.check(0.005, market=True)
+    assert strict.round_quantity(1.23456, market=True) == 1.23
+    strict.check(0.005)
+
+    # Both steps apply: quantities are rounded to a multiple of each.
+    coarse = dataclasses.replace(filters, market_step_size=Decimal("0.0025"))
+    assert coarse.round_quantity(1.2345, market=True) == 1.23
+    with pytest.raises(OrderRejected, match="multiple of the step 0.001"):
+        coarse.check(0.0025, market=True)
+    with pytest.raises(OrderRejected, match="multiple of the step 0.0025"):
+        coarse.check(0.003, market=True)
+    coarse.check(0.005, market=True)
@@ -0,0 +1,82 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from quant_trader.data.export import CandleExporter
+from quant_trader.data.market_data_service import MarketDataService
+
+START = pd.Timestamp("2023-01-01")
+
+
+def _candles(first: int, periods: int, close: float = 1.0) -> pd.DataFrame:
+    open_times = START + pd.to_timedelta(range(first, first + periods), unit="min")
+    return pd.DataFrame(
+        {
+            "open_time": open_times,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 1.0,
+            "close_time": open_times + pd.Timedelta(seconds=59),
+        }
+    )
+
+
+def _clock(minutes: int):
+    # Mid-way through the bar opened `minutes` after START.
+    return lambda: (START + pd.Timedelta(minutes=minutes, seconds=30)).timestamp()
+
+
+@pytest.mark.parametrize("store", ["sql", "columnar"])
+def test_export_appends_only_closed_candles_after_the_watermark(settings, store):
+    service = MarketDataService(dataclasses.replace(settings, candle_store=store))
+    service._persist_candles("BTCUSDT", _candles(0, 100))
+    service._persist_candles("ETHUSDT", _candles(0, 40, close=5.0))
+    output = settings.cache_dir / "export"
+
+    first = CandleExporter(service, output, chunk_size=7, clock=_clock(99)).export()
+    assert [(result.symbol, result.rows) for result in first] == [("BTCUSDT", 99), ("ETHUSDT", 40)]
+    assert first[0].watermark == START + pd.Timedelta(minutes=98)
+
+    service._persist_candles("BTCUSDT", _candles(99, 51, close=2.0))
+    second = CandleExporter(service, output, chunk_size=7, clock=_clock(200)).export(["BTCUSDT", "ETHUSDT"])
+    assert [result.rows for result in second] == [51, 0]
+
+    exported = pd.read_csv(output / "btcusdt_1m.csv.gz", parse_dates=["open_time", "close_time"])
+    stored = service.load_candles("BTCUSDT", limit=None).iloc[::-1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(exported, stored, check_dtype=False)
+    assert len(pd.read_csv(output / "ethusdt_1m.csv.gz")) == 40
+
+
+def test_export_recovers_from_an_interrupted_run_and_full_rewrites(settings):
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", _candles(0, 30))
+    output = settings.cache_dir / "export"
+    exporter = CandleExporter(service, output, fmt="csv", clock=_clock(1000))
+    exporter.export(["BTCUSDT"])
+
+    path = output / "btcusdt_1m.csv"
+    with open(path, "a") as handle:
+        handle.write("2023-01-01 00:30:00,half-written")
+    service._persist_candles("BTCUSDT", _candles(30, 10))
+    assert exporter.export(["BTCUSDT"])[0].rows == 10
+    assert pd.read_csv(path)["open_time"].is_unique and len(pd.read_csv(path)) == 40
+
+    assert exporter.export(["BTCUSDT"], full=True)[0].rows == 40
+    assert len(pd.read_csv(path)) == 40
+
+
+def test_parquet_export_writes_one_part_per_run(settings):
+    pytest.importorskip("pyarrow")
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", _candles(0, 20))
+    output = settings.cache_dir / "export"
+    exporter = CandleExporter(service, output, fmt="parquet", chunk_size=6, clock=_clock(1000))
+    exporter.export(["BTCUSDT"])
+    service._persist_candles("BTCUSDT", _candles(20, 5))
+    exporter.export(["BTCUSDT"])
+
+    assert len(list((output / "btcusdt_1m").glob("part-*.parquet"))) == 2
+    assert len(pd.read_parquet(output / "btcusdt_1m")) == 25
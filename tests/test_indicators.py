@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.indicators import Features, Indicator, atr, ema, rolling_std, rsi, sma, vwap
+from quant_trader.strategies.base import IndicatorStrategy, Signal
+
+
+def _candles(periods: int = 200, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2023-01-01", periods=periods, freq="min"),
+            "high": close + rng.uniform(0, 1, periods),
+            "low": close - rng.uniform(0, 1, periods),
+            "close": close,
+            "volume": rng.uniform(1, 5, periods),
+        }
+    )
+
+
+def test_functions_match_pandas_references():
+    data = _candles()
+    close = data["close"]
+    np.testing.assert_allclose(sma(close, 14), close.rolling(14).mean(), equal_nan=True)
+    np.testing.assert_allclose(ema(close, 14), close.ewm(span=14, adjust=False, min_periods=14).mean(), equal_nan=True)
+    np.testing.assert_allclose(rolling_std(close, 14), close.rolling(14).std(ddof=0), equal_nan=True)
+
+    tr = pd.concat(
+        [data["high"] - data["low"], (data["high"] - close.shift()).abs(), (data["low"] - close.shift()).abs()], axis=1
+    ).max(axis=1)
+    expected_atr = tr.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    np.testing.assert_allclose(atr(data["high"], data["low"], close, 14), expected_atr, equal_nan=True)
+
+    values = rsi(close, 14)
+    assert np.isnan(values[:14]).all() and np.isfinite(values[14:]).all()
+    assert ((values[14:] >= 0) & (values[14:] <= 100)).all()
+
+    typical = (data["high"] + data["low"] + close) / 3
+    expected = (typical * data["volume"]).rolling(20).sum() / data["volume"].rolling(20).sum()
+    np.testing.assert_allclose(vwap(data["high"], data["low"], close, data["volume"], 20), expected, equal_nan=True)
+
+
+def test_functions_run_down_each_column_of_a_panel():
+    frames = [_candles(seed=seed) for seed in (3, 4, 5)]
+    high, low, close, volume = (
+        np.column_stack([frame[name] for frame in frames]) for name in ("high", "low", "close", "volume")
+    )
+    panels = {
+        "sma": sma(close, 14),
+        "ema": ema(close, 14),
+        "rolling_std": rolling_std(close, 14),
+        "atr": atr(high, low, close, 14),
+        "rsi": rsi(close, 14),
+        "vwap": vwap(high, low, close, volume, 20),
+    }
+    for column, frame in enumerate(frames):
+        h, l, c, v = frame["high"], frame["low"], frame["close"], frame["volume"]
+        expected = {
+            "sma": sma(c, 14),
+            "ema": ema(c, 14),
+            "rolling_std": rolling_std(c, 14),
+            "atr": atr(h, l, c, 14),
+            "rsi": rsi(c, 14),
+            "vwap": vwap(h, l, c, v, 20),
+        }
+        for name, panel in panels.items():
+            assert panel.shape == close.shape
+            np.testing.assert_allclose(panel[:, column], expected[name], equal_nan=True, err_msg=name)
+
+
+class SmaAbove:
+    name = "sma_above"
+
+    def __init__(self, window: int) -> None:
+        self.indicators = (Indicator("sma", window), Indicator("rsi", 14))
+
+    def generate(self, data):
+        return self.evaluate_features(Features(data))
+
+    def evaluate_features(self, features):
+        if features.column("close")[-1] > features[self.indicators[0]][-1]:
+            return Signal(symbol="", side="BUY", confidence=1.0, price=features.column("close")[-1])
+        return None
+
+
+def test_features_compute_each_distinct_indicator_once():
+    features = Features(_candles().iloc[::-1])
+    strategies = [SmaAbove(20), SmaAbove(20), SmaAbove(50)]
+    assert all(isinstance(strategy, IndicatorStrategy) for strategy in strategies)
+    for strategy in strategies:
+        features.compute(strategy.indicators)
+        strategy.evaluate_features(features)
+
+    assert features.computed == 3
+    assert features[Indicator("sma", 20)] is features[Indicator("sma", 20)]
+    assert features.data["open_time"].is_monotonic_increasing
+    assert list(features.to_frame().columns) == ["sma_20", "rsi_14", "sma_50"]
+    with pytest.raises(ValueError):
+        Indicator("macd", 12)
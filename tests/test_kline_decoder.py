@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_klines
+from quant_trader.data.kline_decoder import KLINE_FIELDS, decode_klines, load_json
+from quant_trader.data.market_data_service import CANDLE_COLUMNS, MarketDataService
+
+
+def test_pages_decode_into_one_contiguous_typed_batch(settings):
+    rows = synthetic_klines(250, seed=5)
+    columns = decode_klines(rows[:100], [], rows[100:])
+    assert list(columns) == list(KLINE_FIELDS)
+    for name, (position, dtype) in KLINE_FIELDS.items():
+        assert columns[name].dtype == dtype and columns[name].flags.c_contiguous
+        np.testing.assert_array_equal(columns[name], np.array([row[position] for row in rows]).astype(dtype))
+
+    frame = MarketDataService(settings)._klines_to_dataframe(rows[:100], rows[100:])
+    assert list(frame.columns[: len(CANDLE_COLUMNS)]) == CANDLE_COLUMNS
+    assert {"quote_asset_volume", "trades", "taker_buy_base", "taker_buy_quote"} <= set(frame.columns)
+    expected = pd.to_datetime([row[0] for row in rows], unit="ms", utc=True)
+    assert (frame["open_time"] == expected).all()
+    assert frame["trades"].dtype == np.int64
+
+
+def test_load_json_accepts_bytes_and_text():
+    payload = '[[1, "2.5", "3"]]'
+    assert load_json(payload) == load_json(payload.encode()) == [[1, "2.5", "3"]]
+    assert decode_klines()["open"].shape == (0,)
@@ -0,0 +1,122 @@
+import asyncio
+import dataclasses
+import json
+
+from aiohttp import web
+
+from conftest import StubBinance
+from quant_trader.data.async_binance_client import AsyncBinanceClient
+from quant_trader.data.kline_stream import KlineStream
+from quant_trader.data.market_data_service import MarketDataService
+
+START = 1_672_531_200_000
+
+
+def _message(row, closed=True):
+    keys = ["t", "o", "h", "l", "c", "v", "T", "q", "n", "V", "Q", "B"]
+    kline = dict(zip(keys, row), x=closed, i="1m", s="BTCUSDT")
+    return json.dumps({"stream": "btcusdt@kline_1m", "data": {"e": "kline", "s": "BTCUSDT", "k": kline}})
+
+
+def test_stream_delivers_each_closed_bar_once_across_reconnects(settings, binance_stub):
+    reference = StubBinance()
+    reference.add_series("BTCUSDT", START, 76, seed=1)
+    rows = reference.klines["BTCUSDT"]
+    binance_stub.add_series("BTCUSDT", START, 70, seed=1)
+
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", service._klines_to_dataframe(rows[:50]))
+    connections = []
+
+    async def websocket(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connections.append(request.query["streams"])
+        if len(connections) == 1:
+            # Let the initial gap fill (bars 50-69) finish before streaming.
+            while not any(path == "/api/v3/klines" for _, path, _ in binance_stub.requests):
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            await ws.send_str(_message(rows[70]))
+            await ws.send_str(_message(rows[71]))
+            await ws.send_str(_message(rows[72], closed=False))
+            # Bars 72-74 close while the client is disconnected.
+            binance_stub.add_series("BTCUSDT", START, 75, seed=1)
+        else:
+            await ws.send_str(_message(rows[74]))
+            await ws.send_str(_message(rows[75]))
+            await ws.receive()
+        await ws.close()
+        return ws
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/stream", websocket)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        stream_settings = dataclasses.replace(settings, symbols=("BTCUSDT",), stream_url=f"http://127.0.0.1:{port}")
+
+        delivered = []
+        stop = asyncio.Event()
+
+        def on_bar(bar):
+            delivered.append(bar)
+            if len(delivered) == 26:
+                stop.set()
+
+        async with AsyncBinanceClient(stream_settings) as rest_client:
+            stream = KlineStream(
+                stream_settings,
+                on_bar=on_bar,
+                market_data=service,
+                rest_client=rest_client,
+                reconnect_delay=0.01,
+                flush_interval=0.05,
+            )
+            await asyncio.wait_for(stream.run(stop), timeout=10)
+        await runner.cleanup()
+        return stream, delivered
+
+    stream, delivered = asyncio.run(run())
+
+    assert [int(bar.open_time.value // 1_000_000) for bar in delivered] == [row[0] for row in rows[50:76]]
+    assert connections == ["btcusdt@kline_1m"] * 2
+    assert stream.reconnects == 1
+    assert stream.bars_gap_filled == 20 + 3
+    stored = service.load_candles("BTCUSDT", limit=1000)
+    assert len(stored) == 76
+
+
+def test_batch_flushes_are_kept_until_done_and_awaited_on_close(settings, caplog):
+    reference = StubBinance()
+    reference.add_series("BTCUSDT", START, 6, seed=2)
+    rows = reference.klines["BTCUSDT"]
+    service = MarketDataService(settings)
+    persist = service._persist_candles
+    failures = []
+
+    def flaky_persist(symbol, candles):
+        if not failures:
+            failures.append(symbol)
+            raise OSError("disk full")
+        persist(symbol, candles)
+
+    service._persist_candles = flaky_persist
+
+    async def run():
+        stream = KlineStream(settings, on_bar=lambda bar: None, market_data=service, batch_size=2)
+        for batch in (rows[:2], rows[2:4], rows[4:5]):
+            for row in batch:
+                stream._deliver("BTCUSDT", row)
+            assert len(stream._flushes) == (len(batch) == 2)
+            await stream._drain()
+            assert not stream._flushes
+
+    asyncio.run(run())
+
+    assert "Failed to store streamed candles" in caplog.text
+    stored = service.load_candles("BTCUSDT", limit=10)
+    assert sorted(stored["open_time"].astype("int64") // 1_000_000) == [row[0] for row in rows[2:5]]
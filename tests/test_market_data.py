@@ -0,0 +1,152 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.data.rate_limit import RequestBudget
+
+START = 1_672_531_200_000  # 2023-01-01T00:00:00Z
+
+
+def test_backfill_pages_through_range_and_resumes(settings, binance_stub):
+    binance_stub.add_series("BTCUSDT", START, 2500, seed=1)
+    binance_stub.add_series("ETHUSDT", START, 1200, seed=2)
+    service = MarketDataService(settings)
+
+    with BinanceClient(settings) as client:
+        counts = service.backfill(client, start=START, end=START + 1999 * 60_000, page_limit=500, max_workers=2)
+        assert counts == {"BTCUSDT": 2000, "ETHUSDT": 1200}
+        assert len(binance_stub.requests) == 4 + 3
+
+        binance_stub.requests.clear()
+        counts = service.backfill(client, start=START, page_limit=500, budget=RequestBudget(rate=1000))
+
+    assert counts == {"BTCUSDT": 500, "ETHUSDT": 0}
+    assert int(binance_stub.requests[0][2]["startTime"]) > START
+    candles = service.load_candles("BTCUSDT", limit=5000)
+    assert len(candles) == 2500
+    assert candles["open_time"].is_unique
+
+
+@pytest.mark.parametrize("store", ["sql", "columnar"])
+def test_backfill_after_collect_fills_older_history_and_gaps(settings, binance_stub, store):
+    binance_stub.add_series("BTCUSDT", START, 2000, seed=3)
+    service = MarketDataService(dataclasses.replace(settings, candle_store=store, symbols=("BTCUSDT",)))
+
+    with BinanceClient(settings) as client:
+        service.fetch_candles(client, "BTCUSDT", limit=500)
+        # Another hole in the middle of the collected bars.
+        service._persist_candles("BTCUSDT", service._klines_to_dataframe(binance_stub.klines["BTCUSDT"][:100]))
+        binance_stub.requests.clear()
+        counts = service.backfill(client, start=START, page_limit=1000)
+
+    assert counts == {"BTCUSDT": 1400}
+    starts = [int(params["startTime"]) for _, _, params in binance_stub.requests]
+    assert starts == [START + 99 * 60_000 + 1, START + 1099 * 60_000 + 1, START + 1999 * 60_000 + 1]
+    candles = service.load_candles("BTCUSDT", limit=None)
+    assert len(candles) == 2000 and candles["open_time"].is_unique
+    assert candles["open_time"].is_monotonic_decreasing
+
+
+def _frame(start_ms: int, periods: int, close: float = 1.0):
+    import pandas as pd
+
+    open_times = pd.to_datetime([start_ms + idx * 60_000 for idx in range(periods)], unit="ms", utc=True)
+    return pd.DataFrame(
+        {
+            "open_time": open_times,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 1.0,
+            "close_time": open_times + pd.Timedelta(seconds=59),
+        }
+    )
+
+
+def test_persist_is_idempotent_and_updates_existing_rows(settings):
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", _frame(START, 10))
+    service._persist_candles("BTCUSDT", _frame(START + 5 * 60_000, 10, close=2.0))
+
+    candles = service.load_candles("BTCUSDT", limit=100).sort_values("open_time")
+    assert len(candles) == 15
+    assert candles["close"].tolist() == [1.0] * 5 + [2.0] * 10
+
+
+def test_migrate_moves_legacy_tables_into_the_shared_table(settings):
+    from sqlalchemy import inspect, text
+
+    service = MarketDataService(settings)
+    with service.engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE candles_ethusdt (id INTEGER PRIMARY KEY AUTOINCREMENT, open_time DATETIME NOT NULL,"
+                " open FLOAT NOT NULL, high FLOAT NOT NULL, low FLOAT NOT NULL, close FLOAT NOT NULL,"
+                " volume FLOAT NOT NULL, close_time DATETIME NOT NULL)"
+            )
+        )
+    legacy = _frame(START, 10)
+    legacy["open_time"] = legacy["open_time"].dt.tz_localize(None)
+    legacy["close_time"] = legacy["close_time"].dt.tz_localize(None)
+    legacy.to_sql("candles_ethusdt", service.engine, if_exists="append", index=False)
+    legacy.assign(close=2.0).to_sql("candles_ethusdt", service.engine, if_exists="append", index=False)
+    service._persist_candles("ETHUSDT", _frame(START + 8 * 60_000, 4, close=3.0))
+
+    assert service.migrate_candles() == {"ETHUSDT": 8}
+    assert service.migrate_candles(["ETHUSDT"]) == {"ETHUSDT": 0}
+    assert "candles_ethusdt" not in inspect(service.engine).get_table_names()
+    candles = service.load_candles("ETHUSDT", limit=100).sort_values("open_time")
+    assert candles["close"].tolist() == [2.0] * 8 + [3.0] * 4
+
+
+def test_shared_table_keeps_intervals_apart_and_reads_many_symbols_at_once(settings):
+    import dataclasses
+
+    from sqlalchemy import event
+
+    symbols = tuple(f"S{idx:03d}USDT" for idx in range(500))
+    service = MarketDataService(dataclasses.replace(settings, symbols=symbols))
+    for idx, symbol in enumerate(symbols[:50]):
+        service._persist_candles(symbol, _frame(START, 5 + idx % 3, close=float(idx)))
+    service._persist_candles("S000USDT", _frame(START, 3, close=-1.0), interval="1h")
+
+    statements = []
+    event.listen(service.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    frames = service.load_candles_many(limit=6)
+    assert len(statements) == 1
+    assert len(frames) == 500 and frames["S499USDT"].empty
+    assert [len(frames[symbol]) for symbol in symbols[:3]] == [5, 6, 6]
+    assert frames["S002USDT"]["open_time"].is_monotonic_increasing
+    assert set(frames["S000USDT"]["close"]) == {0.0}
+
+    hourly = service.load_candles("S000USDT", interval="1h", start=START + 60_000, end=START + 2 * 60_000)
+    assert hourly["close"].tolist() == [-1.0, -1.0]
+    assert service.last_open_time("S000USDT", "1h") == service.last_open_time("S000USDT") - pd.Timedelta(minutes=2)
+
+
+def test_columnar_backend_round_trip(settings, binance_stub):
+    import dataclasses
+
+    import numpy as np
+    import pandas as pd
+
+    binance_stub.add_series("BTCUSDT", START, 1500, seed=4)
+    columnar = MarketDataService(dataclasses.replace(settings, candle_store="columnar"))
+    sql = MarketDataService(settings)
+    with BinanceClient(settings) as client:
+        columnar.backfill(client, start=START, symbols=["BTCUSDT"], page_limit=400)
+        sql.backfill(client, start=START, symbols=["BTCUSDT"], page_limit=400)
+        assert columnar.backfill(client, start=START, symbols=["BTCUSDT"]) == {"BTCUSDT": 0}
+
+    assert columnar.last_open_time("BTCUSDT") == pd.Timestamp(START + 1499 * 60_000, unit="ms", tz="UTC")
+    latest = columnar.load_candles("BTCUSDT", limit=10)
+    assert latest["close"].tolist() == sql.load_candles("BTCUSDT", limit=10)["close"].tolist()
+
+    window = columnar.load_candles("BTCUSDT", start=START + 100 * 60_000, end="2023-01-01 02:00")
+    assert len(window) == 21
+    assert window["open_time"].iloc[-1] == pd.Timestamp(START + 100 * 60_000, unit="ms")
+    assert isinstance(window["close"].to_numpy().base, np.memmap)
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import requests
+
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.utils.metrics import MetricsRegistry, MetricsServer, SnapshotWriter, metrics
+
+START = 1_672_531_200_000
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enabled = True
+    try:
+        yield metrics
+    finally:
+        metrics.enabled = False
+        metrics.reset()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    with registry.timer("stage_seconds", stage="x") as timer:
+        pass
+    registry.inc("requests_total")
+    registry.observe("latency", 0.5)
+    assert timer is registry.timer("other")
+    assert registry.snapshot()["counters"] == [] and registry.snapshot()["histograms"] == []
+
+
+def test_prometheus_text_and_snapshot():
+    registry = MetricsRegistry(enabled=True, buckets=(0.01, 0.1))
+    registry.inc("requests_total", endpoint="/api/v3/klines", status=200)
+    registry.inc("requests_total", 2, endpoint="/api/v3/klines", status=200)
+    registry.set_gauge("used_weight", 42)
+    registry.observe("latency_seconds", 0.05, symbol='A"B')
+    registry.observe("latency_seconds", 0.5, symbol='A"B')
+
+    text = registry.to_prometheus()
+    assert '# TYPE quant_trader_requests_total counter' in text
+    assert 'quant_trader_requests_total{endpoint="/api/v3/klines",status="200"} 3' in text
+    assert "quant_trader_used_weight 42" in text
+    assert 'quant_trader_latency_seconds_bucket{symbol="A\\"B",le="0.1"} 1' in text
+    assert 'quant_trader_latency_seconds_bucket{symbol="A\\"B",le="+Inf"} 2' in text
+    assert 'quant_trader_latency_seconds_count{symbol="A\\"B"} 2' in text
+
+    histogram = registry.snapshot()["histograms"][0]
+    assert histogram["count"] == 2 and histogram["max"] == 0.5
+    assert histogram["buckets"] == {"0.01": 0, "0.1": 1, "+Inf": 2}
+
+
+def test_fetch_records_stages_and_http_metrics(settings, binance_stub, enabled_metrics, tmp_path):
+    binance_stub.add_series("BTCUSDT", START, 20)
+    service = MarketDataService(settings)
+    with BinanceClient(settings) as client:
+        service.fetch_candles(client, "BTCUSDT", limit=20)
+    service.load_candles("BTCUSDT", limit=5)
+
+    snapshot = enabled_metrics.snapshot()
+    stages = {entry["labels"]["stage"] for entry in snapshot["histograms"] if entry["name"] == "stage_seconds"}
+    assert stages == {"get_klines", "klines_to_dataframe", "persist_candles", "load_candles"}
+    requests_total = [entry for entry in snapshot["counters"] if entry["name"] == "http_requests_total"]
+    labels = {"endpoint": "/api/v3/klines", "method": "GET", "status": "200"}
+    assert requests_total == [{"name": "http_requests_total", "labels": labels, "value": 1.0}]
+
+    server = MetricsServer(enabled_metrics, port=0).start()
+    try:
+        body = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=5).text
+        assert 'quant_trader_http_request_weight_total{endpoint="/api/v3/klines"} 2' in body
+        assert requests.get(f"http://127.0.0.1:{server.port}/metrics.json", timeout=5).json()["counters"]
+    finally:
+        server.stop()
+
+    writer = SnapshotWriter(tmp_path / "metrics.json", interval=60, registry=enabled_metrics).start()
+    writer.stop()
+    assert json.loads((tmp_path / "metrics.json").read_text())["histograms"]
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.backtesting.backtester import Backtester
+from quant_trader.backtesting.optimizer import parameter_grid, run_sweep
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+
+@pytest.fixture
+def candles() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2023-01-01", periods=800, freq="h"),
+            "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 800))),
+        }
+    )
+
+
+def test_parameter_grid_skips_invalid_pairs_and_ranks_each_pair_once(candles):
+    grid = parameter_grid([5, 20, 5], [10, 20])
+    assert [(p.short_window, p.long_window) for p in grid] == [(5, 10), (5, 20)]
+
+    table = run_sweep(candles, grid, processes=1)
+    assert list(table.columns) == ["short_window", "long_window", "returns", "trades"]
+    assert not table.duplicated(["short_window", "long_window"]).any()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep_matches_backtester_and_is_ranked(candles, processes):
+    grid = parameter_grid([3, 5, 8], [13, 21, 34])
+    table = run_sweep(candles, grid, processes=processes)
+
+    assert len(table) == len(grid)
+    assert table["returns"].is_monotonic_decreasing
+    best = table.iloc[0]
+    expected = Backtester(MovingAverageCrossStrategy(int(best.short_window), int(best.long_window))).run(candles)
+    assert best.returns == pytest.approx(expected.returns, rel=1e-12)
+    assert best.trades == expected.trades
+
+
+def test_sweep_top_keeps_best_rows(candles):
+    grid = parameter_grid(range(2, 10), range(12, 30, 3))
+    full = run_sweep(candles, grid, processes=1)
+    top = run_sweep(candles, grid, processes=1, top=5)
+    assert top["returns"].tolist() == full["returns"].head(5).tolist()
@@ -0,0 +1,112 @@
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.execution.order_manager import OrderManager, Position, client_order_id
+from quant_trader.strategies.base import Signal
+
+BAR = pd.Timestamp("2024-01-01 00:00")
+
+
+def _posted(stub):
+    return [params for method, path, params in stub.requests if path == "/api/v3/order" and method == "POST"]
+
+
+def test_client_order_ids_are_deterministic():
+    first = client_order_id("btcusdt", "buy", BAR)
+    assert first == client_order_id("BTCUSDT", "BUY", int(BAR.value // 1_000_000))
+    assert first != client_order_id("BTCUSDT", "SELL", BAR)
+    assert len(first) <= 36 and first.startswith("qt-")
+    assert client_order_id("BTCUSDT", "BUY", BAR, strategy="trend@1m") != client_order_id(
+        "BTCUSDT", "BUY", BAR, strategy="trend@1h"
+    )
+
+
+def test_execute_queues_without_waiting_and_books_fills(settings, binance_stub):
+    binance_stub.order_delay = 0.3
+    with BinanceClient(settings) as client, OrderManager(client, trade_size=0.5, retry_delay=0) as manager:
+        started = time.perf_counter()
+        buy = manager.execute(Signal("BTCUSDT", "BUY", 0.9, 101.0, open_time=BAR))
+        sell = manager.execute(Signal("BTCUSDT", "SELL", 0.9, 99.0, open_time=BAR + pd.Timedelta(hours=1)))
+        assert time.perf_counter() - started < 0.2
+        assert manager.execute(Signal("BTCUSDT", "BUY", 0.9, 101.0, open_time=BAR)) is buy
+        manager.join()
+
+    assert buy.status == sell.status == "FILLED"
+    assert buy.average_price == pytest.approx(100.0) and buy.order_id is not None
+    assert buy.latency()["exchange_seconds"] >= 0.3
+    posted = sorted(order["newClientOrderId"] for order in _posted(binance_stub))
+    assert posted == sorted([buy.client_order_id, sell.client_order_id])
+    assert manager.book.position("BTCUSDT").quantity == 0.0
+    assert manager.book.open_orders() == []
+
+
+def test_retries_reuse_the_client_order_id_without_double_filling(settings, binance_stub):
+    with BinanceClient(settings) as client, OrderManager(client, trade_size=0.25, workers=1, retry_delay=0) as manager:
+        binance_stub.lose_next_response("/api/v3/order")
+        lost = manager.execute(Signal("ETHUSDT", "BUY", 0.9, 100.0, open_time=BAR))
+        manager.join()
+        binance_stub.fail_next("/api/v3/order", 503)
+        refused = manager.execute(Signal("ETHUSDT", "BUY", 0.9, 100.0, open_time=BAR + pd.Timedelta(hours=1)))
+        manager.join()
+
+    posted = _posted(binance_stub)
+    assert len(posted) == 3
+    assert posted[1]["newClientOrderId"] == posted[2]["newClientOrderId"] == refused.client_order_id
+    assert (lost.status, lost.attempts) == ("FILLED", 2)
+    assert (refused.status, refused.attempts) == ("FILLED", 2)
+    assert manager.book.position("ETHUSDT").quantity == pytest.approx(0.5)
+
+
+def test_unanswered_orders_stay_unknown_until_reconciled(settings, binance_stub, monkeypatch):
+    def unreachable(*args, **kwargs):
+        raise requests.ConnectionError("lookup timed out")
+
+    with BinanceClient(settings) as client, OrderManager(client, trade_size=0.25, workers=1, retry_delay=0) as manager:
+        monkeypatch.setattr(client, "get_order", unreachable)
+        binance_stub.lose_next_response("/api/v3/order")
+        lost = manager.execute(Signal("ETHUSDT", "BUY", 0.9, 100.0, open_time=BAR))
+        manager.join()
+        assert (lost.status, lost.attempts) == ("UNKNOWN", 3)
+        assert manager.book.open_orders() == [lost]
+        assert manager.reconcile() == []
+
+        monkeypatch.undo()
+        assert manager.reconcile() == [lost]
+        assert lost.status == "FILLED" and manager.book.open_orders() == []
+
+    assert len(_posted(binance_stub)) == 1
+    assert manager.book.position("ETHUSDT").quantity == pytest.approx(0.25)
+
+
+def test_reconcile_resends_orders_the_exchange_never_received(settings, binance_stub, monkeypatch):
+    def unreachable(*args, **kwargs):
+        raise requests.ConnectionError("lookup timed out")
+
+    with BinanceClient(settings) as client, OrderManager(client, trade_size=0.25, workers=1, retry_delay=0) as manager:
+        monkeypatch.setattr(client, "create_order", unreachable)
+        monkeypatch.setattr(client, "get_order", unreachable)
+        dropped = manager.execute(Signal("ETHUSDT", "SELL", 0.9, 100.0, open_time=BAR))
+        manager.join()
+        assert dropped.status == "UNKNOWN"
+
+        monkeypatch.undo()
+        assert manager.reconcile() == [dropped]
+        manager.join()
+
+    assert dropped.status == "FILLED" and dropped.attempts == 1
+    assert [order["newClientOrderId"] for order in _posted(binance_stub)] == [dropped.client_order_id]
+    assert manager.book.position("ETHUSDT").quantity == pytest.approx(-0.25)
+
+
+def test_position_tracks_average_price_and_realized_pnl():
+    position = Position("BTCUSDT")
+    position.apply("BUY", 1.0, 100.0)
+    position.apply("BUY", 1.0, 110.0)
+    assert position.average_price == pytest.approx(105.0)
+    position.apply("SELL", 3.0, 120.0)
+    assert position.realized_pnl == pytest.approx(30.0)
+    assert (position.quantity, position.average_price) == (-1.0, 120.0)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.backtesting.portfolio import Panel, PortfolioBacktester
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+
+def _frames(symbols=("AAA", "BBB", "CCC"), periods=600, seed=11):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for offset, symbol in enumerate(symbols):
+        times = pd.date_range("2023-01-01", periods=periods, freq="h")[offset * 50 :]
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(times))))
+        frames[symbol] = pd.DataFrame({"open_time": times, "close": closes})
+    frames[symbols[0]] = frames[symbols[0]].drop(index=[300, 301])
+    return frames
+
+
+class SignalsOnly:
+    """Hides ``generate_positions`` to exercise the per-symbol fallback."""
+
+    name = "signals_only"
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def generate(self, data):
+        return self.strategy.generate(data)
+
+    def generate_signals(self, data):
+        return self.strategy.generate_signals(data)
+
+
+def test_panel_aligns_symbols_and_fills_gaps():
+    panel = Panel.from_frames(_frames())
+    assert panel.close.shape == (600, 3)
+    assert np.isnan(panel.close[:100, 2]).all() and not np.isnan(panel.close[100:, 2]).any()
+    assert panel.close[300, 0] == panel.close[299, 0] == panel.close[301, 0]
+    assert panel.returns[300, 0] == 0.0
+
+
+def test_portfolio_matches_per_symbol_replay_and_charges_costs():
+    panel = Panel.from_frames(_frames())
+    strategy = MovingAverageCrossStrategy(short_window=5, long_window=20)
+
+    free = PortfolioBacktester(strategy, fee_rate=0.0, slippage=0.0).run(panel)
+    fallback = PortfolioBacktester(SignalsOnly(strategy), fee_rate=0.0, slippage=0.0).run(panel)
+    np.testing.assert_allclose(free.weights, fallback.weights)
+
+    for column in range(3):
+        listed = ~np.isnan(panel.close[:, column])
+        frame = pd.DataFrame({"open_time": panel.times[listed], "close": panel.close[listed, column]})
+        weights = strategy.generate_signals(frame)["position"].to_numpy(dtype=float) / 3
+        returns = frame["close"].pct_change().fillna(0).to_numpy()
+        expected = np.concatenate([[0.0], weights[:-1] * returns[1:]])
+        np.testing.assert_allclose(free.returns[listed, column], expected, atol=1e-15)
+
+    costly = PortfolioBacktester(strategy, fee_rate=0.001, slippage=0.0005).run(panel)
+    assert free.turnover.sum() > 0
+    np.testing.assert_allclose(free.returns - costly.returns, free.turnover * 0.0015)
+
+    summary = costly.summary()
+    assert list(summary.index) == ["AAA", "BBB", "CCC", "portfolio"]
+    assert summary.loc["portfolio", "turnover"] == pytest.approx(costly.turnover.sum())
+    assert summary.loc["portfolio", "total_return"] == pytest.approx(costly.equity.iloc[-1] - 1)
+    assert (summary["max_drawdown"] <= 0).all()
+    assert costly.drawdown.min() == pytest.approx(summary.loc["portfolio", "max_drawdown"])
+
+
+def test_volatility_sizing_caps_gross_exposure():
+    panel = Panel.from_frames(_frames())
+    result = PortfolioBacktester(
+        MovingAverageCrossStrategy(short_window=5, long_window=20), sizing="volatility", leverage=2.0
+    ).run(panel)
+    gross = np.abs(result.weights).sum(axis=1)
+    assert gross.max() <= 2.0 + 1e-9 and gross.max() > 0
+    with pytest.raises(ValueError):
+        PortfolioBacktester(MovingAverageCrossStrategy(), sizing="kelly")
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.backtesting.backtester import Backtester
+from quant_trader.backtesting.portfolio import max_drawdown
+from quant_trader.backtesting.robustness import MonteCarlo, trade_returns
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+
+def _random_walk(periods: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "open_time": pd.date_range("2023-01-01", periods=periods, freq="h"),
+            "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods))),
+            "symbol": "BTCUSDT",
+        }
+    )
+
+
+def test_trade_returns_compound_each_run_of_one_position():
+    positions = np.array([0, 1, 1, 0, 0, 1, -1, -1, 0])
+    bar_returns = np.array([0.0, 0.1, 0.1, 0.0, 0.0, -0.5, 0.2, 0.1, 0.0])
+    np.testing.assert_allclose(trade_returns(bar_returns, positions), [0.21, -0.5, 0.32])
+    assert len(trade_returns(bar_returns, np.zeros(9))) == 0
+
+
+def test_block_bootstrap_is_seeded_and_independent_of_processes():
+    returns = np.random.default_rng(2).normal(0.0005, 0.01, 1_000)
+    serial = MonteCarlo(resamples=450, chunk_size=100, seed=4).run(returns, periods_per_year=8760)
+    pooled = MonteCarlo(resamples=450, chunk_size=100, seed=4, processes=2).run(returns, periods_per_year=8760)
+
+    assert serial.resamples == 450
+    for name in ("total_return", "max_drawdown", "sharpe"):
+        np.testing.assert_array_equal(getattr(serial, name), getattr(pooled, name))
+    assert serial.observed["total_return"] == pytest.approx(np.prod(1 + returns) - 1)
+    assert serial.observed["max_drawdown"] == pytest.approx(max_drawdown(np.cumprod(1 + returns)))
+    assert serial.total_return.std() > 0 and (serial.max_drawdown <= 0).all()
+
+    # Blocks as long as the series are rotations of it: same compounded return and Sharpe.
+    rotations = MonteCarlo(resamples=50, block_size=len(returns), seed=1).run(returns)
+    np.testing.assert_allclose(rotations.total_return, rotations.observed["total_return"], rtol=1e-10)
+    np.testing.assert_allclose(rotations.sharpe, rotations.observed["sharpe"], rtol=1e-10)
+
+
+def test_trade_resampling_of_a_backtest_result():
+    result = Backtester(MovingAverageCrossStrategy(short_window=5, long_window=20)).run(_random_walk(2_000))
+    assert result.periods_per_year == pytest.approx(365 * 24)
+    assert np.prod(1 + result.bar_returns) - 1 == pytest.approx(result.returns, rel=1e-12)
+
+    shuffled = MonteCarlo(resamples=300, method="trades", replace=False, seed=3).run_backtest(result)
+    np.testing.assert_allclose(shuffled.total_return, result.returns, rtol=1e-10)
+    assert shuffled.max_drawdown.std() > 0
+
+    bootstrapped = MonteCarlo(resamples=300, method="trades", seed=3).run_backtest(result)
+    assert bootstrapped.total_return.std() > 0
+    summary = bootstrapped.summary()
+    assert list(summary.index) == ["total_return", "max_drawdown", "sharpe"]
+    assert summary.loc["total_return", "observed"] == pytest.approx(result.returns)
+    assert 0 <= summary.loc["sharpe", "percentile"] <= 1
+    assert len(bootstrapped.distributions()) == 300
+
+
+def test_chunked_backtests_keep_series_on_request():
+    data = _random_walk(1_500)
+    backtester = Backtester(MovingAverageCrossStrategy(short_window=5, long_window=20))
+    whole = backtester.run(data)
+    chunks = [data.iloc[start : start + 200] for start in range(0, len(data), 200)]
+
+    assert backtester.run_chunks(chunks).bar_returns is None
+    chunked = backtester.run_chunks(chunks, keep_series=True)
+    np.testing.assert_array_equal(chunked.positions, whole.positions)
+    np.testing.assert_allclose(chunked.bar_returns, whole.bar_returns, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        MonteCarlo(method="trades").run(whole.bar_returns)
+    with pytest.raises(ValueError):
+        MonteCarlo(method="bayesian")
@@ -0,0 +1,130 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.backtesting.backtester import Backtester
+from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.data.rollups import BarRollup, rollup_candles
+from quant_trader.strategies.base import iter_bars
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+
+def _minutes(periods: int, start: str = "2024-01-03 22:17", seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    open_times = pd.date_range(start, periods=periods, freq="min")
+    closes = 100 + np.cumsum(rng.normal(0, 0.5, periods))
+    return pd.DataFrame(
+        {
+            "open_time": open_times,
+            "open": closes + rng.normal(0, 0.1, periods),
+            "high": closes + 1 + rng.random(periods),
+            "low": closes - 1 - rng.random(periods),
+            "close": closes,
+            "volume": rng.random(periods),
+            "close_time": open_times + pd.Timedelta(seconds=59),
+        }
+    )
+
+
+@pytest.mark.parametrize("interval, rule", [("15m", "15min"), ("4h", "4h"), ("1w", "W-MON")])
+def test_rollup_candles_matches_pandas_resample(interval, rule):
+    base = _minutes(20_000)
+    rolled = rollup_candles(base.sample(frac=1, random_state=3), interval)
+
+    expected = (
+        base.set_index("open_time")
+        .resample(rule, label="left", closed="left")
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        .dropna()
+    )
+    assert rolled["open_time"].tolist() == expected.index.tolist()
+    for column in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_allclose(rolled[column], expected[column])
+    assert (rolled["close_time"] - rolled["open_time"]).iloc[0] == pd.Timedelta(interval) - pd.Timedelta(milliseconds=1)
+
+
+@pytest.mark.parametrize("store", ["sql", "columnar"])
+def test_rollups_follow_incremental_writes(settings, store):
+    settings = dataclasses.replace(settings, candle_store=store, rollup_intervals=("5m", "1h"))
+    service = MarketDataService(settings)
+    base = _minutes(600)
+    for first, last in ((0, 130), (130, 131), (131, 407), (400, 600)):
+        service._persist_candles("BTCUSDT", base.iloc[first:last])
+    # A forming bar re-fetched with a new close replaces its earlier version.
+    service._persist_candles("BTCUSDT", base.iloc[-1:].assign(close=1.0, high=500.0))
+    base.loc[base.index[-1], ["close", "high"]] = [1.0, 500.0]
+
+    for interval in ("5m", "1h"):
+        stored = service.load_candles("BTCUSDT", limit=None, interval=interval).iloc[::-1].reset_index(drop=True)
+        expected = rollup_candles(base, interval)
+        pd.testing.assert_frame_equal(stored, expected, check_dtype=False)
+
+    # Rollups added after the base history was stored.
+    later = dataclasses.replace(
+        settings, database_url=settings.database_url + "-later", cache_dir=settings.cache_dir / "later"
+    )
+    MarketDataService(dataclasses.replace(later, rollup_intervals=()))._persist_candles("BTCUSDT", base)
+    rebuilt = MarketDataService(later)
+    assert rebuilt.rebuild_rollups(["BTCUSDT"]) == {"BTCUSDT": 121 + 11}
+    stored = rebuilt.load_candles("BTCUSDT", limit=None, interval="1h").iloc[::-1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored, rollup_candles(base, "1h"), check_dtype=False)
+
+
+@pytest.mark.parametrize("store", ["sql", "columnar"])
+def test_rollups_take_in_late_and_corrected_base_candles(settings, store):
+    service = MarketDataService(dataclasses.replace(settings, candle_store=store, rollup_intervals=("1h",)))
+    base = _minutes(120, start="2024-01-04 00:00").assign(close=np.arange(100.0, 220.0), volume=2.0)
+    service._persist_candles("BTCUSDT", base.iloc[:30].assign(close=np.arange(1.0, 31.0), volume=1.0))
+    service._persist_candles("BTCUSDT", base.iloc[60:])
+    # Corrected copies of stored bars arrive together with the missing ones.
+    service._persist_candles("BTCUSDT", base.iloc[:60])
+
+    stored = service.load_candles("BTCUSDT", limit=None, interval="1h").iloc[::-1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored, rollup_candles(base, "1h"), check_dtype=False)
+    assert stored["close"].tolist() == [159.0, 219.0] and stored["volume"].tolist() == [120.0, 120.0]
+
+    # Corrections to stored bars alone replace them as well.
+    service._persist_candles("BTCUSDT", base.iloc[50:70].assign(close=0.5))
+    base.loc[50:69, "close"] = 0.5
+    base_stored = service.load_candles("BTCUSDT", limit=None).iloc[::-1].reset_index(drop=True)
+    np.testing.assert_array_equal(base_stored["close"], base["close"])
+    stored = service.load_candles("BTCUSDT", limit=None, interval="1h").iloc[::-1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored, rollup_candles(base, "1h"), check_dtype=False)
+
+
+def test_derived_intervals_are_served_without_being_stored(settings):
+    service = MarketDataService(settings)
+    base = _minutes(3_000)
+    service._persist_candles("BTCUSDT", base)
+
+    chunks = list(service.iter_rollup("BTCUSDT", "15m", chunk_size=97))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), rollup_candles(base, "15m"))
+    ranged = pd.concat(service.iter_rollup("BTCUSDT", "1h", start="2024-01-04 00:10", end="2024-01-04 05:00"))
+    assert ranged["open_time"].tolist() == list(pd.date_range("2024-01-04 01:00", "2024-01-04 05:00", freq="h"))
+
+    end = pd.Timestamp("2024-01-04 10:20")
+    window = service.rollup_window("BTCUSDT", "4h", 3, end=end)
+    assert window["open_time"].tolist() == list(pd.date_range("2024-01-04 00:00", periods=3, freq="4h"))
+    seen = base[base["open_time"] <= end]
+    assert window["close"].iloc[-1] == seen["close"].iloc[-1]
+    assert window["high"].iloc[-1] == seen[seen["open_time"] >= "2024-01-04 08:00"]["high"].max()
+
+
+def test_bar_rollup_emits_completed_bars_and_backtests_run_on_them(settings):
+    base = _minutes(1_000)
+    rollup = BarRollup("1h", "1m")
+    bars = [derived for bar in iter_bars(base.drop(index=[400]), "BTCUSDT") for derived in rollup.add(bar)]
+    expected = rollup_candles(base.drop(index=[400]), "1h").iloc[:-1]
+    assert [bar.open_time for bar in bars] == expected["open_time"].tolist()
+    np.testing.assert_allclose([bar.volume for bar in bars], expected["volume"])
+
+    service = MarketDataService(settings)
+    service._persist_candles("BTCUSDT", _minutes(20_000))
+    strategy = MovingAverageCrossStrategy(short_window=3, long_window=8, interval="1h")
+    stored = Backtester(strategy).run_stored(service, "BTCUSDT", chunk_size=1_000)
+    in_memory = Backtester(strategy).run(rollup_candles(_minutes(20_000), "1h").assign(symbol="BTCUSDT"))
+    assert stored.trades == in_memory.trades > 0
+    assert stored.returns == pytest.approx(in_memory.returns, rel=1e-12)
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup import ROOT, _parse_importtime, check_startup
+from quant_trader import main as cli
+from quant_trader.config import load_settings
+
+
+def test_cli_and_package_import_within_budget_and_without_heavy_dependencies():
+    assert check_startup(repeat=3) == []
+
+
+def test_parse_importtime_reads_cumulative_microseconds():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       360 |      17855 |   asyncio\n"
+        "import time:      1200 |      29000 | quant_trader.main\n"
+    )
+    assert _parse_importtime(output) == {"asyncio": 17855, "quant_trader.main": 29000}
+
+
+def test_cli_choices_mirror_the_modules_they_avoid_importing():
+    from quant_trader.backtesting.portfolio import SIZING_METHODS
+    from quant_trader.data.export import EXPORT_FORMATS
+
+    assert cli.EXPORT_FORMATS == EXPORT_FORMATS
+    assert cli.SIZING_METHODS == SIZING_METHODS
+
+
+def test_public_data_commands_do_not_need_credentials(tmp_path, monkeypatch):
+    monkeypatch.delenv("BINANCE_API_KEY", raising=False)
+    monkeypatch.delenv("BINANCE_API_SECRET", raising=False)
+    env_file = tmp_path / ".env"
+
+    settings = load_settings(env_file, require_credentials=False)
+    assert settings.binance_api_key == settings.binance_api_secret == ""
+    with pytest.raises(ValueError):
+        load_settings(env_file)
+
+    assert not cli._signs_requests(cli.parse_args(["collect"]))
+    assert not cli._signs_requests(cli.parse_args(["trade", "--paper"]))
+    assert cli._signs_requests(cli.parse_args(["trade"]))
+
+
+def test_packages_load_their_exports_on_first_access():
+    code = (
+        "import sys, quant_trader.data as data\n"
+        "assert 'quant_trader.data.market_data_service' not in sys.modules\n"
+        "assert 'MarketDataService' in dir(data)\n"
+        "from quant_trader.data import MarketDataService\n"
+        "assert MarketDataService.__module__ == 'quant_trader.data.market_data_service'\n"
+        "import quant_trader\n"
+        "assert quant_trader.engine.TradingEngine.__name__ == 'TradingEngine'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+
+    import quant_trader.data
+
+    with pytest.raises(AttributeError):
+        quant_trader.data.NotAnExport
@@ -14,3 +14,29 @@ def test_moving_average_cross_strategy_generates_signals():
     signal = strategy.generate(data)
     assert signal is not None
     assert signal.side == "BUY"
+
+
+def test_update_matches_generate_per_symbol():
+    import numpy as np
+
+    from quant_trader.strategies.base import iter_bars
+
+    rng = np.random.default_rng(3)
+    strategy = MovingAverageCrossStrategy(short_window=4, long_window=9)
+    frames = {
+        symbol: pd.DataFrame(
+            {
+                "open_time": pd.date_range("2023-01-01", periods=150, freq="h"),
+                "close": 50 + np.cumsum(rng.normal(0, 1, 150)),
+                "symbol": symbol,
+            }
+        )
+        for symbol in ("BTCUSDT", "ETHUSDT")
+    }
+    bars = {symbol: list(iter_bars(frame)) for symbol, frame in frames.items()}
+
+    for idx in range(150):
+        for symbol, frame in frames.items():
+            streamed = strategy.update(bars[symbol][idx])
+            expected = strategy.generate(frame.iloc[: idx + 1])
+            assert (streamed and streamed.side) == (expected and expected.side)
@@ -0,0 +1,284 @@
+import dataclasses
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_trader.data.binance_client import BinanceClient
+from quant_trader.data.market_data_service import MarketDataService
+from quant_trader.data.rollups import rollup_candles
+from quant_trader.engine.trading_engine import TradingEngine
+from quant_trader.execution.order_executor import FillModel, PaperTradingBackend
+from quant_trader.execution.order_manager import OrderManager
+from quant_trader.strategies.base import Signal
+from quant_trader.strategies.moving_average import MovingAverageCrossStrategy
+
+START = 1_672_531_200_000
+
+
+class AlwaysBuy:
+    name = "always_buy"
+
+    def __init__(self, slow_symbol: str, delay: float) -> None:
+        self.slow_symbol = slow_symbol
+        self.delay = delay
+
+    def generate(self, data):
+        symbol = data["symbol"].iloc[-1]
+        if symbol == self.slow_symbol:
+            time.sleep(self.delay)
+        return Signal(symbol=symbol, side="BUY", confidence=1.0, price=float(data["close"].iloc[0]))
+
+
+class RecordingBackend:
+    def __init__(self, stuck_symbol: str) -> None:
+        self.stuck_symbol = stuck_symbol
+        self.release = threading.Event()
+        self.executed = []
+
+    def execute(self, signal):
+        if signal.symbol == self.stuck_symbol:
+            self.release.wait(5)
+        self.executed.append(signal.symbol)
+
+
+def test_scheduled_cycle_isolates_slow_symbols_and_stuck_orders(settings, binance_stub):
+    symbols = ("BTCUSDT", "ETHUSDT", "SLOWUSDT")
+    settings = dataclasses.replace(settings, symbols=symbols, candles_interval="1s")
+    for idx, symbol in enumerate(symbols):
+        binance_stub.add_series(symbol, START, 10, seed=idx)
+    backend = RecordingBackend(stuck_symbol="BTCUSDT")
+
+    with BinanceClient(settings) as client:
+        engine = TradingEngine(
+            market_data=MarketDataService(settings),
+            strategies=[AlwaysBuy(slow_symbol="SLOWUSDT", delay=1.5)],
+            execution_backend=backend,
+            client=client,
+            workers=4,
+        )
+        try:
+            engine.run_forever(deadline=0.5, max_cycles=1, settle=0)
+            report = engine.last_report
+            time.sleep(0.1)
+            assert backend.executed == ["ETHUSDT"]
+        finally:
+            backend.release.set()
+            # Let the late symbol and the stuck order finish before the client closes.
+            for future in engine._in_flight.values():
+                future.result(timeout=5)
+            deadline = time.monotonic() + 5
+            while len(backend.executed) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+    assert sorted(report.completed) == ["BTCUSDT", "ETHUSDT"]
+    assert report.missed == ["SLOWUSDT"]
+    assert report.signals == 2
+    assert report.duration < 1.0
+
+
+class BuyAt:
+    """Buys on the bar opening at ``at``, on candles of ``interval``."""
+
+    name = "buy_at"
+
+    def __init__(self, at, interval=None):
+        self.at = pd.Timestamp(at)
+        self.interval = interval
+
+    def generate(self, data):
+        if not (data["open_time"] == self.at).any():
+            return None
+        return Signal(data["symbol"].iloc[-1], "BUY", 1.0, float(data["close"].iloc[-1]), open_time=self.at)
+
+
+def test_strategies_on_different_intervals_each_order_on_a_shared_bar(settings, binance_stub):
+    service = MarketDataService(settings)
+    _store_waves(service, ["BTCUSDT"], periods=180)
+    data = service.latest_candles("BTCUSDT", limit=180).assign(symbol="BTCUSDT")
+    strategies = [BuyAt("2024-01-01 01:00"), BuyAt("2024-01-01 01:00", interval="1h")]
+
+    with BinanceClient(settings) as client, OrderManager(client, trade_size=0.25, retry_delay=0) as manager:
+        engine = TradingEngine(market_data=service, strategies=strategies, execution_backend=manager, client=client)
+        assert len(engine.evaluate("BTCUSDT", data)) == 2
+        manager.join()
+        # Re-evaluating the same bars resubmits under the same IDs, which are not sent again.
+        engine.evaluate("BTCUSDT", data)
+        manager.join()
+
+    posted = [params for method, path, params in binance_stub.requests if path == "/api/v3/order" and method == "POST"]
+    assert len({order["newClientOrderId"] for order in posted}) == len(posted) == 2
+    assert manager.book.position("BTCUSDT").quantity == pytest.approx(0.5)
+
+
+class WindowOnly:
+    """Hides ``update`` so the engine evaluates trailing windows instead of single bars."""
+
+    name = "window_only"
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def generate(self, data):
+        return self.strategy.generate(data)
+
+
+def _store_waves(service, symbols, periods=400):
+    frames = {}
+    for idx, symbol in enumerate(symbols):
+        open_times = pd.date_range("2024-01-01", periods=periods, freq="min") + pd.Timedelta(seconds=idx)
+        closes = 100 + 10 * np.sin(np.arange(periods) / (7 + idx)) + np.arange(periods) * 0.01
+        frame = pd.DataFrame({"open_time": open_times, "close": closes, "volume": 1.0})
+        frame["open"] = frame["high"] = frame["low"] = frame["close"]
+        frame["close_time"] = open_times + pd.Timedelta(seconds=59)
+        service._persist_candles(symbol, frame)
+        frames[symbol] = frame
+    return frames
+
+
+def test_replay_drives_strategies_and_paper_fills_from_stored_candles(settings, binance_stub):
+    service = MarketDataService(settings)
+    frames = _store_waves(service, settings.symbols)
+    strategy = MovingAverageCrossStrategy(short_window=5, long_window=20)
+    expected = sum(int(np.count_nonzero(strategy.generate_signals(frame)["signal"])) for frame in frames.values())
+
+    with BinanceClient(settings) as client:
+        backend = PaperTradingBackend(fill_model=FillModel(slippage=0.001, fee_rate=0.001))
+        engine = TradingEngine(market_data=service, strategies=[strategy], execution_backend=backend, client=client)
+        report = engine.replay()
+        assert (report.bars, report.signals) == (800, expected) and expected > 10
+        assert len(backend.fills) == expected
+        assert engine.replay().signals == expected
+
+        windowed = PaperTradingBackend()
+        engine = TradingEngine(
+            market_data=service, strategies=[WindowOnly(strategy)], execution_backend=windowed, client=client
+        )
+        assert engine.replay(window=50, start="2024-01-01 01:00").signals == sum(
+            int(np.count_nonzero(strategy.generate_signals(frame.iloc[60:])["signal"])) for frame in frames.values()
+        )
+
+    summary = backend.summary(report.last_prices)
+    assert summary["trades"] == 2 * expected
+    assert summary["equity"] - backend.balance == pytest.approx(
+        summary["realized_pnl"] + summary["unrealized_pnl"] - summary["fees"]
+    )
+    first = backend.fills[0]
+    assert first.price == pytest.approx(
+        frames[first.symbol].set_index("open_time").loc[first.open_time, "close"] * (1.001 if first.side == "BUY" else 0.999)
+    )
+
+
+def test_strategies_on_derived_intervals_see_only_completed_or_past_candles(settings, binance_stub):
+    settings = dataclasses.replace(settings, rollup_intervals=("15m",))
+    service = MarketDataService(settings)
+    frames = _store_waves(service, settings.symbols, periods=1_537)
+    hourly = MovingAverageCrossStrategy(short_window=2, long_window=5, interval="1h")
+    quarterly = MovingAverageCrossStrategy(short_window=3, long_window=8, interval="15m")
+    expected = sum(
+        int(np.count_nonzero(strategy.generate_signals(rollup_candles(frame, interval).iloc[:-1])["signal"]))
+        for frame in frames.values()
+        for strategy, interval in ((hourly, "1h"), (quarterly, "15m"))
+    )
+
+    with BinanceClient(settings) as client:
+        backend = PaperTradingBackend()
+        engine = TradingEngine(
+            market_data=service, strategies=[hourly, quarterly], execution_backend=backend, client=client
+        )
+        assert engine.replay().signals == expected > 0
+
+        windowed = WindowOnly(hourly)
+        windowed.interval = "1h"
+        engine = TradingEngine(market_data=service, strategies=[windowed], execution_backend=backend, client=client)
+        symbol = settings.symbols[0]
+        data = frames[symbol].iloc[:150].assign(symbol=symbol)
+        frame = engine._interval_frame(symbol, "1h", data)
+        assert frame["open_time"].iloc[-1] == pd.Timestamp("2024-01-01 02:00")
+        assert frame["close"].iloc[-1] == data["close"].iloc[-1]
+    assert binance_stub.requests == []
+
+
+def test_streaming_strategies_see_the_final_close_of_a_revised_bar(settings):
+    service = MarketDataService(settings)
+    open_times = pd.date_range("2024-01-01", periods=30, freq="min")
+    closes = np.linspace(110, 100, 30)
+    frame = pd.DataFrame({"open_time": open_times, "close": closes, "volume": 1.0})
+    frame["open"] = frame["high"] = frame["low"] = frame["close"]
+    frame["close_time"] = open_times + pd.Timedelta(seconds=59)
+    service._persist_candles("BTCUSDT", frame)
+
+    strategy = MovingAverageCrossStrategy(short_window=3, long_window=10)
+    now = {"at": (open_times[-1] + pd.Timedelta(seconds=30)).timestamp()}
+    engine = TradingEngine(
+        market_data=service,
+        strategies=[strategy],
+        execution_backend=PaperTradingBackend(),
+        client=None,
+        clock=lambda: now["at"],
+    )
+    engine.warm_up()
+    # The last bar is still forming; a later fetch revises its close upwards.
+    assert engine.evaluate("BTCUSDT", service.latest_candles("BTCUSDT", limit=500)) == []
+
+    service._persist_candles("BTCUSDT", frame.iloc[-1:].assign(close=150.0, high=150.0))
+    now["at"] += 60
+    data = service.latest_candles("BTCUSDT", limit=500).assign(symbol="BTCUSDT")
+    signals = engine.evaluate("BTCUSDT", data)
+    assert [(signal.side, signal.price) for signal in signals] == [("BUY", 150.0)]
+    assert strategy.generate(data).side == "BUY"
+
+
+def test_catching_up_over_several_bars_trades_a_crossover_before_the_last(settings):
+    service = MarketDataService(settings)
+    open_times = pd.date_range("2024-01-01", periods=35, freq="min")
+    closes = np.r_[np.linspace(110, 100, 30), np.full(5, 150.0)]
+    frame = pd.DataFrame({"open_time": open_times, "close": closes, "volume": 1.0})
+    frame["open"] = frame["high"] = frame["low"] = frame["close"]
+    frame["close_time"] = open_times + pd.Timedelta(seconds=59)
+    service._persist_candles("BTCUSDT", frame.iloc[:30])
+
+    strategy = MovingAverageCrossStrategy(short_window=3, long_window=10)
+    backend = PaperTradingBackend()
+    engine = TradingEngine(market_data=service, strategies=[strategy], execution_backend=backend, client=None)
+    engine.warm_up()
+    assert engine.evaluate("BTCUSDT", service.latest_candles("BTCUSDT", limit=500)) == []
+
+    # Five bars arrive at once; only the first of them crosses.
+    service._persist_candles("BTCUSDT", frame.iloc[30:])
+    signals = engine.evaluate("BTCUSDT", service.latest_candles("BTCUSDT", limit=500).assign(symbol="BTCUSDT"))
+    assert [(signal.side, signal.open_time) for signal in signals] == [("BUY", open_times[30])]
+    assert len(backend.fills) == 1
+
+
+class LastBarRecorder:
+    name = "last_bar_recorder"
+
+    def __init__(self):
+        self.seen = []
+
+    def generate(self, data):
+        self.seen.append(data["open_time"].iloc[-1])
+        return None
+
+
+def test_cycles_evaluate_the_bar_that_just_closed_not_the_forming_one(settings, binance_stub):
+    settings = dataclasses.replace(settings, symbols=("BTCUSDT",))
+    now_ms = int(time.time() * 1000)
+    binance_stub.add_series("BTCUSDT", now_ms // 60_000 * 60_000 - 9 * 60_000, 10)
+    recorder = LastBarRecorder()
+
+    with BinanceClient(settings) as client:
+        engine = TradingEngine(
+            market_data=MarketDataService(settings),
+            strategies=[recorder],
+            execution_backend=PaperTradingBackend(),
+            client=client,
+            clock=lambda: now_ms / 1000,
+        )
+        report = engine.run_cycle(deadline=5)
+
+    assert report.completed == ["BTCUSDT"]
+    assert recorder.seen == [pd.Timestamp(now_ms // 60_000 * 60_000 - 60_000, unit="ms")]